@@ -16,8 +16,10 @@ import 'package:push_up_5050/services/app_settings_service.dart';
 import 'package:push_up_5050/services/audio_service.dart';
 import 'package:push_up_5050/services/haptic_feedback_service.dart';
 import 'package:push_up_5050/services/notification_service.dart';
+import 'package:push_up_5050/services/notification_planner.dart';
 import 'package:push_up_5050/services/notification_scheduler.dart';
 import 'package:push_up_5050/services/proximity_sensor_service.dart';
+import 'package:push_up_5050/services/startup_orchestrator.dart';
 import 'package:push_up_5050/services/widget_update_service.dart';
 import 'package:push_up_5050/services/deep_link_service.dart';
 import 'package:push_up_5050/screens/series_selection/series_selection_screen.dart';
@@ -25,36 +27,54 @@ import 'package:push_up_5050/screens/statistics/statistics_screen.dart';
 import 'package:shared_preferences/shared_preferences.dart';
 
 /// Entry point for Push-Up 5050 app.
+///
+/// Startup runs through a [StartupOrchestrator]: only what the first screen
+/// needs (storage, settings, widget data) is awaited before [runApp],
+/// concurrently where possible; notification setup and permission, widget
+/// registration, audio preload and the proximity sensor run after the first
+/// frame. Services not warmed up yet degrade gracefully (silent audio, lazily
+/// initialized notifications, no sensor rep counting until ready).
 Future<void> main() async {
   WidgetsFlutterBinding.ensureInitialized();
 
-  // Initialize StorageService
-  final storageService = await StorageService.create();
-
-  // Initialize SharedPreferences for settings
-  final sharedPreferences = await SharedPreferences.getInstance();
-
-  // Create and initialize services
-  final appSettingsService = AppSettingsService(prefs: sharedPreferences);
-  await appSettingsService.loadSettings();
-
   final hapticService = HapticFeedbackService();
-
   final audioService = AudioService();
-  await audioService.initialize();
-
   final proximityService = ProximitySensorService();
-  await proximityService.initialize();
-
   final notificationService = NotificationService();
-  await notificationService.initialize();
+  final widgetUpdateService = WidgetUpdateService();
 
-  // Request notification permissions on app startup (Android 13+ requires POST_NOTIFICATIONS)
-  await notificationService.requestPermissions();
+  late final StorageService storageService;
+  late final AppSettingsService appSettingsService;
 
-  // Initialize widget update service
-  final widgetUpdateService = WidgetUpdateService();
-  await widgetUpdateService.initialize();
+  final startup = StartupOrchestrator()
+    // Critical: needed by the first frame
+    ..add('storage', () async {
+      storageService = await StorageService.create();
+    })
+    ..add('settings', () async {
+      final sharedPreferences = await SharedPreferences.getInstance();
+      appSettingsService = AppSettingsService(prefs: sharedPreferences);
+      await appSettingsService.loadSettings();
+    })
+    ..add('widgets', () => widgetUpdateService.initialize(scheduleMidnight: false))
+    // Deferred: after the first frame
+    ..add('audio', audioService.initialize, stage: StartupStage.deferred)
+    ..add('proximity', proximityService.initialize,
+        stage: StartupStage.deferred)
+    ..add('notifications', notificationService.initialize,
+        stage: StartupStage.deferred)
+    // Request notification permissions (Android 13+ requires POST_NOTIFICATIONS)
+    ..add('notificationPermission', notificationService.requestPermissions,
+        dependsOn: ['notifications'], stage: StartupStage.deferred)
+    ..add('widgetRegistration', widgetUpdateService.scheduleMidnightUpdate,
+        dependsOn: ['widgets'], stage: StartupStage.deferred);
+
+  await startup.runCritical();
+
+  WidgetsBinding.instance.addPostFrameCallback((_) {
+    startup.markFirstFrame();
+    startup.runDeferred();
+  });
 
   runApp(
     MultiProvider(
@@ -62,6 +82,9 @@ Future<void> main() async {
         // StorageService as a provider for dependency injection
         Provider<StorageService>.value(value: storageService),
 
+        // Startup timeline (readable in debug builds)
+        Provider<StartupOrchestrator>.value(value: startup),
+
         // Services
         ChangeNotifierProvider<AppSettingsService>.value(
           value: appSettingsService,
@@ -106,6 +129,7 @@ Future<void> main() async {
             notificationService: notificationService,
             preferencesProvider: context.read<NotificationPreferencesProvider>(),
             storage: storageService,
+            settings: appSettingsService,
           ),
         ),
       ],
@@ -162,7 +186,7 @@ class _MyAppState extends State<MyApp> {
     final notificationService = context.read<NotificationService>();
     notificationService.setOnNotificationTapCallback((payload) {
       // Navigate based on notification type
-      switch (payload) {
+      switch (PlannedNotification.typeOfPayload(payload)) {
         case 'streak_at_risk':
         case 'progress':
           _navigatorKey.currentState?.pushNamed('/');
@@ -2,6 +2,22 @@
 /// Takes a map of stats and returns true if achievement should be unlocked
 typedef AchievementCondition = bool Function(Map<String, dynamic> stats);
 
+/// Stat an achievement threshold is checked against
+/// [key] is the name of the stat in the stats map passed to conditions
+enum AchievementStat {
+  totalPushups,
+  totalPushupsAllTime,
+  maxRepsInOneSeries,
+  maxPushupsInOneDay,
+  maxConsecutiveSeries,
+  monthlyPushups,
+  currentStreak,
+  daysCompleted,
+  totalPoints;
+
+  String get key => name;
+}
+
 /// Achievement model
 /// Represents a unlockable achievement in the game
 class Achievement {
@@ -29,7 +45,15 @@ class Achievement {
   /// Function to check unlock condition
   final AchievementCondition? condition;
 
+  /// Stat the achievement depends on, for threshold achievements
+  final AchievementStat? stat;
+
+  /// Value of [stat] that unlocks the achievement
+  final int? threshold;
+
   /// Create a new achievement
+  /// Either pass a custom [condition], or a [stat] and [threshold]; the
+  /// latter unlocks once the stat reaches the threshold
   Achievement({
     required this.id,
     required this.name,
@@ -38,8 +62,19 @@ class Achievement {
     required this.icon,
     this.isUnlocked = false,
     this.unlockedAt,
-    this.condition,
-  });
+    AchievementCondition? condition,
+    this.stat,
+    this.threshold,
+  })  : assert((stat == null) == (threshold == null)),
+        condition = condition ?? _thresholdCondition(stat, threshold);
+
+  static AchievementCondition? _thresholdCondition(
+    AchievementStat? stat,
+    int? threshold,
+  ) {
+    if (stat == null || threshold == null) return null;
+    return (stats) => ((stats[stat.key] as num?) ?? 0) >= threshold;
+  }
 
   /// Mark achievement as unlocked
   /// Sets isUnlocked to true and unlockedAt to current time
@@ -101,7 +136,8 @@ class Achievement {
         description: 'Completa il tuo primo push-up',
         points: 50,
         icon: '🎯',
-        condition: (stats) => (stats['totalPushups'] as int) >= 1,
+        stat: AchievementStat.totalPushups,
+        threshold: 1,
       ),
       Achievement(
         id: 'ten_in_a_row',
@@ -109,7 +145,8 @@ class Achievement {
         description: 'Completa 10 push-up in una singola serie',
         points: 150,
         icon: '💪',
-        condition: (stats) => (stats['maxRepsInOneSeries'] as int) >= 10,
+        stat: AchievementStat.maxRepsInOneSeries,
+        threshold: 10,
       ),
       Achievement(
         id: 'centenary',
@@ -117,7 +154,8 @@ class Achievement {
         description: 'Raggiungi 100 push-up totali',
         points: 200,
         icon: '💯',
-        condition: (stats) => (stats['totalPushupsAllTime'] as int) >= 100,
+        stat: AchievementStat.totalPushupsAllTime,
+        threshold: 100,
       ),
       Achievement(
         id: 'perfect_week',
@@ -125,7 +163,8 @@ class Achievement {
         description: 'Mantieni una striscia di 7 giorni consecutivi',
         points: 500,
         icon: '🔥',
-        condition: (stats) => (stats['currentStreak'] as int) >= 7,
+        stat: AchievementStat.currentStreak,
+        threshold: 7,
       ),
       Achievement(
         id: 'marathon',
@@ -133,7 +172,8 @@ class Achievement {
         description: 'Completa 500 push-up in un singolo giorno',
         points: 1000,
         icon: '🏃',
-        condition: (stats) => (stats['maxPushupsInOneDay'] as int) >= 500,
+        stat: AchievementStat.maxPushupsInOneDay,
+        threshold: 500,
       ),
       Achievement(
         id: 'lion_month',
@@ -141,7 +181,8 @@ class Achievement {
         description: 'Completa 30 giorni di allenamento',
         points: 5000,
         icon: '🦁',
-        condition: (stats) => (stats['daysCompleted'] as int) >= 30,
+        stat: AchievementStat.daysCompleted,
+        threshold: 30,
       ),
       // Nuovi achievement
       Achievement(
@@ -150,7 +191,8 @@ class Achievement {
         description: 'Completa 100 push-up in un singolo giorno',
         points: 300,
         icon: '💯',
-        condition: (stats) => (stats['maxPushupsInOneDay'] as int) >= 100,
+        stat: AchievementStat.maxPushupsInOneDay,
+        threshold: 100,
       ),
       Achievement(
         id: 'two_hundred_in_one_day',
@@ -158,7 +200,8 @@ class Achievement {
         description: 'Completa 200 push-up in un singolo giorno',
         points: 800,
         icon: '🔥',
-        condition: (stats) => (stats['maxPushupsInOneDay'] as int) >= 200,
+        stat: AchievementStat.maxPushupsInOneDay,
+        threshold: 200,
       ),
       Achievement(
         id: 'three_hundred_in_one_day',
@@ -166,7 +209,8 @@ class Achievement {
         description: 'Completa 300 push-up in un singolo giorno',
         points: 1500,
         icon: '⚡',
-        condition: (stats) => (stats['maxPushupsInOneDay'] as int) >= 300,
+        stat: AchievementStat.maxPushupsInOneDay,
+        threshold: 300,
       ),
       Achievement(
         id: 'thousand_month',
@@ -174,7 +218,8 @@ class Achievement {
         description: 'Raggiungi 1000 push-up in un mese',
         points: 700,
         icon: '📅',
-        condition: (stats) => (stats['monthlyPushups'] as int) >= 1000,
+        stat: AchievementStat.monthlyPushups,
+        threshold: 1000,
       ),
       Achievement(
         id: 'five_series_streak',
@@ -182,7 +227,8 @@ class Achievement {
         description: 'Completa 5 serie consecutive senza fermarti',
         points: 250,
         icon: '🏃',
-        condition: (stats) => (stats['maxConsecutiveSeries'] as int) >= 5,
+        stat: AchievementStat.maxConsecutiveSeries,
+        threshold: 5,
       ),
       Achievement(
         id: 'ten_series_streak',
@@ -190,7 +236,8 @@ class Achievement {
         description: 'Completa 10 serie consecutive senza fermarti',
         points: 600,
         icon: '🚀',
-        condition: (stats) => (stats['maxConsecutiveSeries'] as int) >= 10,
+        stat: AchievementStat.maxConsecutiveSeries,
+        threshold: 10,
       ),
       Achievement(
         id: 'fifteen_day_streak',
@@ -198,7 +245,8 @@ class Achievement {
         description: 'Mantieni 15 giorni consecutivi di allenamento',
         points: 1500,
         icon: '💪',
-        condition: (stats) => (stats['currentStreak'] as int) >= 15,
+        stat: AchievementStat.currentStreak,
+        threshold: 15,
       ),
       Achievement(
         id: 'thousand_points',
@@ -206,7 +254,8 @@ class Achievement {
         description: 'Raggiungi 1000 punti totali',
         points: 300,
         icon: '⭐',
-        condition: (stats) => (stats['totalPoints'] as int) >= 1000,
+        stat: AchievementStat.totalPoints,
+        threshold: 1000,
       ),
       Achievement(
         id: 'five_thousand_points',
@@ -214,7 +263,8 @@ class Achievement {
         description: 'Raggiungi 5000 punti totali',
         points: 1000,
         icon: '🌟',
-        condition: (stats) => (stats['totalPoints'] as int) >= 5000,
+        stat: AchievementStat.totalPoints,
+        threshold: 5000,
       ),
       Achievement(
         id: 'ten_thousand_points',
@@ -222,7 +272,8 @@ class Achievement {
         description: 'Raggiungi 10000 punti totali',
         points: 2500,
         icon: '👑',
-        condition: (stats) => (stats['totalPoints'] as int) >= 10000,
+        stat: AchievementStat.totalPoints,
+        threshold: 10000,
       ),
     ];
   }
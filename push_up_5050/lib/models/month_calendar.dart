@@ -0,0 +1,268 @@
+import 'dart:collection';
+
+import 'package:push_up_5050/repositories/history_index.dart';
+
+/// Immutable view model of one month of the statistics calendar.
+///
+/// Day states are stored as bitsets (bit `day - 1`), together with the
+/// per-day push-up totals and the connector lines between consecutive
+/// completed days, so the calendar can be laid out and painted without
+/// touching the records again.
+///
+/// Day states:
+/// - completed: any push-ups (> 0)
+/// - blocked: before the first record of the month
+/// - missed: past days without a record after the month's first record;
+///   in the current month, only those after the most recent workout
+/// - future: after today
+class MonthCalendarModel {
+  final int year;
+  final int month;
+  final int daysInMonth;
+
+  /// Column of day 1 (0 = Monday).
+  final int firstColumn;
+
+  /// Day of month of today, 0 if today is not in this month.
+  final int today;
+
+  final int completedMask;
+  final int missedMask;
+  final int blockedMask;
+  final int futureMask;
+
+  /// Bit set for day d when d and d + 1 are completed on the same row.
+  final int connectRightMask;
+
+  /// Bit set for day d when d and d + 7 are completed.
+  final int connectDownMask;
+
+  /// Push-ups per day, index `day - 1`.
+  final List<int> pushups;
+
+  MonthCalendarModel._({
+    required this.year,
+    required this.month,
+    required this.daysInMonth,
+    required this.firstColumn,
+    required this.today,
+    required this.completedMask,
+    required this.missedMask,
+    required this.blockedMask,
+    required this.futureMask,
+    required this.connectRightMask,
+    required this.connectDownMask,
+    required List<int> pushups,
+  }) : pushups = List.unmodifiable(pushups);
+
+  /// Build the model for the month containing [month].
+  ///
+  /// [lastRecordDate] is the most recent record on or before [today]; in
+  /// the current month, missed days are only counted after it. Past months
+  /// count every gap after their first record.
+  factory MonthCalendarModel.build(
+    HistoryIndex history,
+    DateTime month, {
+    required DateTime today,
+    DateTime? lastRecordDate,
+  }) {
+    final year = month.year;
+    final monthNumber = month.month;
+    final daysInMonth = DateTime(year, monthNumber + 1, 0).day;
+    final todayDate = DateTime(today.year, today.month, today.day);
+
+    final pushups = List<int>.filled(daysInMonth, 0);
+    var recordMask = 0;
+    var completedMask = 0;
+    var futureMask = 0;
+    var firstRecordDay = 0;
+    for (var day = 1; day <= daysInMonth; day++) {
+      final date = DateTime(year, monthNumber, day);
+      final bit = 1 << (day - 1);
+      if (date.isAfter(todayDate)) futureMask |= bit;
+      if (!history.hasRecord(date)) continue;
+
+      recordMask |= bit;
+      if (firstRecordDay == 0) firstRecordDay = day;
+      pushups[day - 1] = history.pushupsOn(date);
+      if (pushups[day - 1] > 0) completedMask |= bit;
+    }
+
+    var blockedMask = 0;
+    var missedMask = 0;
+    if (firstRecordDay > 0) {
+      blockedMask = (1 << (firstRecordDay - 1)) - 1;
+
+      final firstRecord = DateTime(year, monthNumber, firstRecordDay);
+      final isCurrentMonth =
+          todayDate.year == year && todayDate.month == monthNumber;
+      final reference =
+          isCurrentMonth ? lastRecordDate ?? firstRecord : firstRecord;
+      for (var day = firstRecordDay; day <= daysInMonth; day++) {
+        final date = DateTime(year, monthNumber, day);
+        if (!date.isBefore(todayDate)) break;
+        if (!date.isAfter(reference)) continue;
+        if (recordMask & (1 << (day - 1)) == 0) missedMask |= 1 << (day - 1);
+      }
+    }
+
+    final firstColumn = DateTime(year, monthNumber, 1).weekday - 1;
+    var connectRightMask = 0;
+    var connectDownMask = 0;
+    for (var day = 1; day <= daysInMonth; day++) {
+      if (completedMask & (1 << (day - 1)) == 0) continue;
+      final lastColumn = (firstColumn + day - 1) % 7 == 6;
+      if (!lastColumn && completedMask & (1 << day) != 0) {
+        connectRightMask |= 1 << (day - 1);
+      }
+      if (day + 7 <= daysInMonth && completedMask & (1 << (day + 6)) != 0) {
+        connectDownMask |= 1 << (day - 1);
+      }
+    }
+
+    return MonthCalendarModel._(
+      year: year,
+      month: monthNumber,
+      daysInMonth: daysInMonth,
+      firstColumn: firstColumn,
+      today: todayDate.year == year && todayDate.month == monthNumber
+          ? todayDate.day
+          : 0,
+      completedMask: completedMask,
+      missedMask: missedMask,
+      blockedMask: blockedMask,
+      futureMask: futureMask,
+      connectRightMask: connectRightMask,
+      connectDownMask: connectDownMask,
+      pushups: pushups,
+    );
+  }
+
+  /// Number of grid rows (weeks) spanned by the month.
+  int get rowCount => (firstColumn + daysInMonth + 6) ~/ 7;
+
+  int rowOf(int day) => (firstColumn + day - 1) ~/ 7;
+  int columnOf(int day) => (firstColumn + day - 1) % 7;
+
+  /// Day shown at [row], [column], or 0 for an empty cell.
+  int dayAt(int row, int column) {
+    final day = row * 7 + column - firstColumn + 1;
+    return day >= 1 && day <= daysInMonth ? day : 0;
+  }
+
+  bool isCompleted(int day) => _has(completedMask, day);
+  bool isMissed(int day) => _has(missedMask, day);
+  bool isBlocked(int day) => _has(blockedMask, day);
+  bool isFuture(int day) => _has(futureMask, day);
+  bool connectsRight(int day) => _has(connectRightMask, day);
+  bool connectsDown(int day) => _has(connectDownMask, day);
+  bool connectsLeft(int day) => day > 1 && connectsRight(day - 1);
+  bool connectsUp(int day) => day > 7 && connectsDown(day - 7);
+
+  int pushupsOn(int day) => pushups[day - 1];
+
+  late final Set<int> completedDays = _days(completedMask);
+  late final Set<int> missedDays = _days(missedMask);
+  late final Set<int> blockedDays = _days(blockedMask);
+
+  bool _has(int mask, int day) =>
+      day >= 1 && day <= daysInMonth && mask & (1 << (day - 1)) != 0;
+
+  Set<int> _days(int mask) => Set.unmodifiable({
+        for (var day = 1; day <= daysInMonth; day++)
+          if (_has(mask, day)) day,
+      });
+}
+
+/// Small LRU cache of [MonthCalendarModel]s.
+///
+/// An entry is reused as long as it was built from the same [HistoryIndex]
+/// instance, the month's [HistoryIndex.monthRevision] is unchanged, and the
+/// parts of "today" and of the last workout date the month depends on are
+/// unchanged. A new record only invalidates its own month (plus the
+/// current month, whose missed days depend on the last workout).
+///
+/// The cache keeps rebuilds of the months on screen from touching the
+/// records, and makes paging back and forth within the last [capacity]
+/// months free. Paging further back builds each month again; a single
+/// [MonthCalendarModel.build] is one pass over the month's days.
+class MonthCalendarCache {
+  static const int defaultCapacity = 12;
+
+  final int capacity;
+  final LinkedHashMap<int, _MonthCalendarEntry> _entries = LinkedHashMap();
+
+  int hits = 0;
+  int misses = 0;
+
+  MonthCalendarCache({this.capacity = defaultCapacity});
+
+  int get length => _entries.length;
+
+  /// Model for the month containing [month], built if needed.
+  MonthCalendarModel get(
+    HistoryIndex history,
+    DateTime month, {
+    required DateTime today,
+  }) {
+    final key = month.year * 12 + month.month - 1;
+    final lastRecordDate = history.lastRecordOnOrBefore(today);
+    final stamp = _stamp(history, month, today, lastRecordDate);
+
+    final entry = _entries.remove(key);
+    if (entry != null && identical(entry.history, history) && entry.stamp == stamp) {
+      hits++;
+      _entries[key] = entry;
+      return entry.model;
+    }
+
+    misses++;
+    final model = MonthCalendarModel.build(
+      history,
+      month,
+      today: today,
+      lastRecordDate: lastRecordDate,
+    );
+    _entries[key] = _MonthCalendarEntry(history, stamp, model);
+    if (_entries.length > capacity) {
+      _entries.remove(_entries.keys.first);
+    }
+    return model;
+  }
+
+  void clear() => _entries.clear();
+
+  /// Inputs of [MonthCalendarModel.build] for [month] besides its records,
+  /// reduced to what can change the result.
+  static (int, int?, int?) _stamp(
+    HistoryIndex history,
+    DateTime month,
+    DateTime today,
+    DateTime? lastRecordDate,
+  ) {
+    final first = HistoryIndex.dayNumber(DateTime(month.year, month.month, 1));
+    final last = HistoryIndex.dayNumber(DateTime(month.year, month.month + 1, 0));
+    final todayDay = HistoryIndex.dayNumber(today);
+
+    // A month entirely in the past does not depend on today
+    final relevantToday = todayDay > last ? null : todayDay;
+
+    // Only the current month depends on the last workout: whether it is
+    // before or inside the month, and its exact day when inside
+    int? relevantLastRecord;
+    if (lastRecordDate != null && todayDay >= first && todayDay <= last) {
+      relevantLastRecord =
+          HistoryIndex.dayNumber(lastRecordDate).clamp(first - 1, last);
+    }
+
+    return (history.monthRevision(month), relevantToday, relevantLastRecord);
+  }
+}
+
+class _MonthCalendarEntry {
+  final HistoryIndex history;
+  final (int, int?, int?) stamp;
+  final MonthCalendarModel model;
+
+  _MonthCalendarEntry(this.history, this.stamp, this.model);
+}
@@ -144,6 +144,7 @@ class WidgetData {
     required int todayPushups,
     required int totalPushups,
     int goalPushups = 5050,
+    bool? todayGoalReached,
     int streakDays = 0,
     int totalPoints = 0,
     DateTime? lastWorkoutDate,
@@ -155,6 +156,7 @@ class WidgetData {
       todayPushups: todayPushups,
       totalPushups: totalPushups,
       goalPushups: goalPushups,
+      todayGoalReached: todayGoalReached,
       streakDays: streakDays,
       totalPoints: totalPoints,
       lastWorkoutDate: lastWorkoutDate,
@@ -1,23 +1,33 @@
 import 'package:flutter/foundation.dart';
 import 'package:push_up_5050/models/achievement.dart';
 import 'package:push_up_5050/repositories/storage_service.dart';
+import 'package:push_up_5050/services/achievement_engine.dart';
 
 /// Provider for achievements management.
 ///
 /// Manages achievement unlock status and checks unlock conditions.
 /// Uses predefined achievements from [Achievement.getAllAchievements].
+///
+/// Unlocks are evaluated by an [AchievementEngine]: a stat-change event only
+/// checks the next locked threshold of each stat it changes. Everything one
+/// event unlocks is saved with a single write.
 class AchievementsProvider extends ChangeNotifier {
   final StorageService _storage;
 
   List<Achievement> _achievements = [];
+  late final AchievementEngine _engine;
   bool _isLoading = true;
 
+  /// Completes when every unlock so far has been written.
+  Future<void> _saved = Future.value();
+
   /// Create a new AchievementsProvider.
   ///
   /// Requires a [StorageService] instance for persistence.
   AchievementsProvider({required StorageService storage})
       : _storage = storage {
     _achievements = getAllAchievements();
+    _engine = AchievementEngine(_achievements);
   }
 
   /// Whether achievements are currently being loaded.
@@ -59,28 +69,32 @@ class AchievementsProvider extends ChangeNotifier {
     }
   }
 
+  /// Completes once all unlocks reported so far are persisted.
+  Future<void> get saved => _saved;
+
+  /// Apply a stat-change event.
+  ///
+  /// Returns the newly unlocked achievements, saved with a single write.
+  List<Achievement> recordEvent(AchievementEvent event) {
+    return _commit(_engine.apply(event));
+  }
+
   /// Check unlock conditions against current stats.
   ///
   /// Returns list of newly unlocked achievements.
   /// Saves newly unlocked achievements to storage.
   List<Achievement> checkUnlocks(Map<String, dynamic> stats) {
-    final newlyUnlocked = <Achievement>[];
-
-    for (final achievement in _achievements) {
-      if (!achievement.isUnlocked && achievement.condition != null) {
-        if (achievement.condition!(stats)) {
-          achievement.unlock();
-          newlyUnlocked.add(achievement);
+    return _commit(_engine.applyStats(stats));
+  }
 
-          // Save to storage
-          _storage.saveAchievement(achievement);
-        }
-      }
-    }
+  List<Achievement> _commit(List<Achievement> newlyUnlocked) {
+    if (newlyUnlocked.isEmpty) return newlyUnlocked;
 
-    if (newlyUnlocked.isNotEmpty) {
-      notifyListeners();
-    }
+    final write = _storage.saveAchievements(newlyUnlocked).catchError((Object e) {
+      debugPrint('AchievementsProvider: failed to save unlocks: $e');
+    });
+    _saved = Future.wait([_saved, write]);
+    notifyListeners();
 
     return newlyUnlocked;
   }
@@ -1,10 +1,10 @@
 import 'package:flutter/foundation.dart';
 import 'package:push_up_5050/models/achievement.dart';
 import 'package:push_up_5050/models/daily_record.dart';
-import 'package:push_up_5050/models/widget_data.dart';
 import 'package:push_up_5050/models/workout_session.dart';
 import 'package:push_up_5050/repositories/storage_service.dart';
 import 'package:push_up_5050/core/utils/calculator.dart';
+import 'package:push_up_5050/services/session_checkpointer.dart';
 import 'package:push_up_5050/services/widget_update_service.dart';
 
 /// Provider for active workout session.
@@ -13,11 +13,21 @@ import 'package:push_up_5050/services/widget_update_service.dart';
 /// - Active workout session data
 /// - Recovery timer state
 ///
-/// Automatically saves session to storage on every state change.
+/// Counting reps is purely in memory: streak, daily goal and today's prior
+/// total are snapshotted once in [startWorkout], and the session is
+/// checkpointed to storage write-behind (coalesced, at most
+/// [checkpointInterval] late, flushed on recovery start, [endWorkout] and
+/// [flushSession]).
 /// Updates Android home screen widgets when workout completes.
 class ActiveWorkoutProvider extends ChangeNotifier {
   final StorageService _storage;
   final WidgetUpdateService _widgetUpdateService;
+  late final SessionCheckpointer _checkpointer;
+
+  // Session snapshot taken in startWorkout (no storage access per rep)
+  int _snapshotStreak = 0;
+  int _snapshotDailyGoal = 50;
+  int _snapshotPriorTodayReps = 0;
 
   WorkoutSession? _session;
   bool _isRecovery = false;
@@ -33,11 +43,19 @@ class ActiveWorkoutProvider extends ChangeNotifier {
   ///
   /// Requires a [StorageService] instance for data persistence
   /// and [WidgetUpdateService] for updating home screen widgets.
+  ///
+  /// [checkpointInterval] bounds how long a counted rep may stay unsaved.
   ActiveWorkoutProvider({
     required StorageService storage,
     required WidgetUpdateService widgetUpdateService,
+    Duration checkpointInterval = const Duration(seconds: 2),
   })  : _storage = storage,
-        _widgetUpdateService = widgetUpdateService;
+        _widgetUpdateService = widgetUpdateService {
+    _checkpointer = SessionCheckpointer(
+      save: _saveSession,
+      interval: checkpointInterval,
+    );
+  }
 
   /// The current active workout session.
   ///
@@ -106,6 +124,8 @@ class ActiveWorkoutProvider extends ChangeNotifier {
   /// Start a new workout session.
   ///
   /// Creates a new [WorkoutSession] with the given parameters.
+  /// Snapshots streak, daily goal and today's prior push-ups so that
+  /// [countRep] never has to read storage.
   /// Saves to storage automatically.
   /// Resets session achievement and points tracking.
   Future<void> startWorkout({
@@ -123,10 +143,24 @@ class ActiveWorkoutProvider extends ChangeNotifier {
     _sessionAchievements.clear(); // Reset tracking achievement sessione
     _sessionPoints = 0; // Reset tracking punti sessione
 
-    await _saveSession();
+    await _takeSnapshot(_session!.startTime);
+
+    _checkpointer.markDirty();
+    await _checkpointer.flush();
     notifyListeners();
   }
 
+  /// Snapshot the storage-derived values the per-rep path depends on.
+  ///
+  /// Uses the session date, not the current time, so workouts spanning
+  /// midnight keep counting toward the day they started on.
+  Future<void> _takeSnapshot(DateTime sessionDate) async {
+    final index = await _storage.loadHistoryIndex();
+    _snapshotStreak = await _storage.calculateCurrentStreak();
+    _snapshotDailyGoal = _storage.getDailyGoal();
+    _snapshotPriorTodayReps = index.pushupsOn(sessionDate);
+  }
+
   /// Registra un achievement sbloccato durante la sessione.
   ///
   /// Aggiunge l'achievement alla lista sessione e notifica i listener.
@@ -164,6 +198,9 @@ class ActiveWorkoutProvider extends ChangeNotifier {
   /// Use this on app startup to resume an interrupted workout.
   Future<void> loadExistingSession() async {
     _session = await _storage.loadActiveSession();
+    if (_session != null) {
+      await _takeSnapshot(_session!.startTime);
+    }
     notifyListeners();
   }
 
@@ -173,22 +210,22 @@ class ActiveWorkoutProvider extends ChangeNotifier {
   /// - Session is active
   /// - Not in recovery mode
   ///
-  /// Automatically saves to storage.
-  /// Also calculates and adds points for this rep (real-time).
-  /// Checks for goal completion after each rep.
-  void countRep() async {
+  /// Runs entirely in memory: points and goal completion are computed from
+  /// the snapshot taken in [startWorkout], and the save is only scheduled
+  /// (write-behind).
+  void countRep() {
     if (_session == null) return;
     if (_isRecovery) return;
 
     _session!.countRep();
 
     // Calculate points for this rep immediately (real-time feedback)
-    await _calculateRepPoints();
+    _calculateRepPoints();
 
     // Check for goal completion after counting rep
-    await _checkGoalCompletion();
+    _checkGoalCompletion();
 
-    _saveSession();
+    _checkpointer.markDirty();
     notifyListeners();
   }
 
@@ -196,8 +233,10 @@ class ActiveWorkoutProvider extends ChangeNotifier {
   ///
   /// Sets recovery state and initializes timer.
   /// User cannot count reps during recovery.
+  /// Forces a checkpoint so the finished series is on disk; a failed save
+  /// is logged and retried by the next checkpoint.
   /// Note: Points are now calculated per rep, not per series.
-  void startRecovery() async {
+  Future<void> startRecovery() async {
     if (_session == null) return;
 
     _isRecovery = true;
@@ -206,21 +245,29 @@ class ActiveWorkoutProvider extends ChangeNotifier {
     // Points are now calculated per rep in countRep()
     // No additional calculation needed here
 
-    _saveSession();
     notifyListeners();
+    _checkpointer.markDirty();
+    try {
+      await _checkpointer.flush();
+    } catch (e) {
+      debugPrint('ActiveWorkoutProvider: failed to checkpoint session: $e');
+    }
   }
 
+  /// Save any pending session changes immediately.
+  ///
+  /// Call when the app is paused so a killed process loses no reps.
+  Future<void> flushSession() => _checkpointer.flush();
+
   /// Calculate points for a single rep and add to session total.
   ///
   /// Uses a per-rep formula derived from the aggressive series formula.
   /// Formula: (RepMult per rep + SeriesMult portion) × StreakMult
   /// Where RepMult per rep = 0.3, SeriesMult portion = (seriesNumber × 0.8) / seriesNumber
   /// This gives real-time feedback as each rep is completed.
-  Future<void> _calculateRepPoints() async {
+  void _calculateRepPoints() {
     if (_session == null) return;
 
-    final streak = await _storage.calculateCurrentStreak();
-
     // Current series info
     final currentSeriesNumber = _session!.currentSeries;
     final repsInCurrentSeries = _session!.repsInCurrentSeries;
@@ -231,7 +278,7 @@ class ActiveWorkoutProvider extends ChangeNotifier {
     final repPoints = Calculator.calculateRepPoints(
       seriesNumber: currentSeriesNumber,
       repNumber: repsInCurrentSeries,
-      consecutiveDays: streak,
+      consecutiveDays: _snapshotStreak,
     );
 
     _sessionPoints += repPoints;
@@ -240,31 +287,18 @@ class ActiveWorkoutProvider extends ChangeNotifier {
   /// Check if daily goal has been reached during active workout.
   ///
   /// Accounts for cumulative progress across all sessions today, not just
-  /// the current session. Fetches existing daily record, adds current session
-  /// reps, and compares to daily goal. Sets session.goalReached when threshold met.
+  /// the current session: today's prior total (snapshotted at session start)
+  /// plus current session reps, compared to the daily goal. Sets
+  /// session.goalReached when threshold met.
   ///
   /// This should be called after each rep to enable real-time goal detection.
-  Future<void> _checkGoalCompletion() async {
+  void _checkGoalCompletion() {
     if (_session == null) return;
 
-    // Get the daily goal (default 50 if not set)
-    final dailyGoal = _storage.getDailyGoal();
-
-    // No goal configured - skip check
-    if (_session!.goalPushups == null && dailyGoal == 50) {
-      // Use default goal
-    }
-
-    final goal = _session!.goalPushups ?? dailyGoal;
-
-    // CRITICAL: Use session start date, not current time
-    // This handles workouts that span midnight correctly
-    final sessionDate = _session!.startTime;
-    final existingRecord = await _storage.getDailyRecord(sessionDate);
-    final todayReps = existingRecord?.totalPushups ?? 0;
+    final goal = _session!.goalPushups ?? _snapshotDailyGoal;
 
     // Calculate cumulative total: existing today reps + current session reps
-    final cumulativeTotal = todayReps + _session!.totalReps;
+    final cumulativeTotal = _snapshotPriorTodayReps + _session!.totalReps;
 
     // Set goal reached flag when cumulative total meets or exceeds goal
     if (cumulativeTotal >= goal && !_session!.goalReached) {
@@ -284,7 +318,7 @@ class ActiveWorkoutProvider extends ChangeNotifier {
     _isRecovery = false;
     _recoverySecondsRemaining = 0;
 
-    _saveSession();
+    _checkpointer.markDirty();
     notifyListeners();
   }
 
@@ -295,6 +329,9 @@ class ActiveWorkoutProvider extends ChangeNotifier {
   Future<void> endWorkout() async {
     if (_session == null) return;
 
+    // Let any in-flight checkpoint land before the session is cleared
+    await _checkpointer.flush();
+
     _session!.endSession();
 
     // Save the ended session state, then clear from storage
@@ -320,13 +357,8 @@ class ActiveWorkoutProvider extends ChangeNotifier {
 
     // Calculate daily cap based on total points
     // Note: TotalPoints from all records (before this workout)
-    final allRecords = await _storage.loadDailyRecords();
-    int totalPointsBefore = 0;
-    for (final entry in allRecords.entries) {
-      final recordData = entry.value as Map<String, dynamic>;
-      final record = DailyRecord.fromJson(recordData);
-      totalPointsBefore += record.pointsEarned;
-    }
+    final index = await _storage.loadHistoryIndex();
+    final totalPointsBefore = index.totalPoints;
 
     final dailyCap = Calculator.calculateDailyCap(
       dailyGoal: dailyGoal,
@@ -422,47 +454,15 @@ class ActiveWorkoutProvider extends ChangeNotifier {
   /// Update all home screen widgets after workout completion.
   ///
   /// Fetches the latest data from storage and builds WidgetData
-  /// to reflect the completed workout stats.
+  /// to reflect the completed workout stats. Uses the same builder and
+  /// inputs as UserStatsProvider so the follow-up stats refresh is a no-op
+  /// write.
   Future<void> _updateWidgetsAfterWorkout() async {
     try {
-      // Get today's record for widget data
-      final today = DateTime.now();
-      final todayRecord = await _storage.getDailyRecord(today);
-
-      // Get all records for calendar and streak
-      final allRecords = await _storage.loadDailyRecords();
-      int totalPushups = 0;
-      for (final entry in allRecords.entries) {
-        final recordData = entry.value as Map<String, dynamic>;
-        final record = DailyRecord.fromJson(recordData);
-        totalPushups += record.totalPushups;
-      }
-
-      final streak = await _storage.calculateCurrentStreak();
-
-      // Build calendar days (last 30 days)
-      final calendarDays = <CalendarDayData>[];
-      final now = DateTime.now();
-      for (int i = 29; i >= 0; i--) {
-        final date = now.subtract(Duration(days: i));
-        final dateKey =
-            '${date.year}-${date.month.toString().padLeft(2, '0')}-${date.day.toString().padLeft(2, '0')}';
-
-        final hasRecord = allRecords.containsKey(dateKey);
-        calendarDays.add(CalendarDayData(
-          date.day,
-          hasRecord,
-        ));
-      }
-
-      final widgetData = WidgetData(
-        todayPushups: todayRecord?.totalPushups ?? 0,
-        totalPushups: totalPushups,
-        goalPushups: 5050,
-        todayGoalReached: (todayRecord?.totalPushups ?? 0) >= 50,
-        streakDays: streak,
-        lastWorkoutDate: today,
-        calendarDays: calendarDays,
+      final widgetData = await _widgetUpdateService.buildWidgetDataFromHistory(
+        await _storage.loadHistoryIndex(),
+        dailyGoal: _storage.getDailyGoal(),
+        streakDays: await _storage.calculateCurrentStreak(),
       );
 
       await _widgetUpdateService.updateAllWidgets(widgetData);
@@ -519,9 +519,20 @@ class ActiveWorkoutProvider extends ChangeNotifier {
     notifyListeners();
   }
 
+  @override
+  void dispose() {
+    // Only the timer is stopped, dropping changes not yet checkpointed. The
+    // provider lives as long as the app, so it is only disposed when the
+    // widget tree is torn down, after the paused/detached lifecycle events
+    // whose handler already flushed the session. A flush started here could
+    // not be awaited and could outlive the storage it writes to.
+    _checkpointer.cancel();
+    super.dispose();
+  }
+
   /// Save session to storage.
   ///
-  /// Private method called automatically on state changes.
+  /// Called by the checkpointer, never directly on the per-rep path.
   Future<void> _saveSession() async {
     if (_session != null) {
       await _storage.saveActiveSession(_session!);
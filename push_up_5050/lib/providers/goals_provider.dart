@@ -176,62 +176,30 @@ class GoalsProvider extends ChangeNotifier {
   }
 
   /// Update progress from storage stats
+  ///
+  /// Week, month and all-time totals are range queries on the history index,
+  /// so no record is decoded.
   Future<void> _updateProgress() async {
-    final allRecords = await _storage.loadDailyRecords();
+    final index = await _storage.loadHistoryIndex();
     final now = DateTime.now();
 
-    // Calculate totals
-    int total = 0;
-    int maxSession = 0;
-    for (final entry in allRecords.entries) {
-      final recordData = entry.value as Map<String, dynamic>;
-      final reps = recordData['totalPushups'] as int? ?? 0;
-      final sessionReps = recordData['maxSeries'] as int? ?? 0;
-      total += reps;
-      if (sessionReps > maxSession) maxSession = sessionReps;
-    }
-
     // Calculate weekly (Monday to today)
-    int weekly = 0;
-    final todayOfWeek = now.weekday; // 1=Mon, 7=Sun
-    for (int dayOffset = 0; dayOffset < todayOfWeek; dayOffset++) {
-      final date = now.subtract(Duration(days: dayOffset));
-      final key = _formatDate(date);
-      if (allRecords.containsKey(key)) {
-        final recordData = allRecords[key] as Map<String, dynamic>;
-        weekly += recordData['totalPushups'] as int? ?? 0;
-      }
-    }
+    final weekStart = now.subtract(Duration(days: now.weekday - 1));
+    final weekly = index.sumPushups(weekStart, now);
 
     // Calculate monthly
-    int monthly = 0;
-    for (final entry in allRecords.entries) {
-      final dateString = entry.key as String;
-      final parts = dateString.split('-');
-      final year = int.parse(parts[0]);
-      final month = int.parse(parts[1]);
-      if (year == now.year && month == now.month) {
-        final recordData = entry.value as Map<String, dynamic>;
-        monthly += recordData['totalPushups'] as int? ?? 0;
-      }
-    }
+    final monthly = index.sumPushupsInMonth(now);
 
     // Get streak and completed days from provider's calculation
     final streak = await _storage.calculateCurrentStreak();
-    int completed = 0;
-    for (final entry in allRecords.entries) {
-      final recordData = entry.value as Map<String, dynamic>;
-      if (recordData['goalReached'] == true) {
-        completed++;
-      }
-    }
 
     _weeklyProgress = weekly;
     _monthlyProgress = monthly;
-    _totalProgress = total;
-    _maxSessionReps = maxSession;
+    _totalProgress = index.totalPushups;
+    // Daily records do not persist per-series maxima
+    _maxSessionReps = 0;
     _consecutiveDays = streak;
-    _completedDays = completed;
+    _completedDays = index.goalReachedDays;
   }
 
   /// Refresh goals progress
@@ -239,8 +207,4 @@ class GoalsProvider extends ChangeNotifier {
     await _updateProgress();
     notifyListeners();
   }
-
-  String _formatDate(DateTime date) {
-    return '${date.year}-${date.month.toString().padLeft(2, '0')}-${date.day.toString().padLeft(2, '0')}';
-  }
 }
@@ -2,7 +2,9 @@ import 'dart:math' as math;
 
 import 'package:flutter/foundation.dart';
 import 'package:push_up_5050/models/daily_record.dart';
+import 'package:push_up_5050/models/month_calendar.dart';
 import 'package:push_up_5050/models/widget_data.dart';
+import 'package:push_up_5050/repositories/history_index.dart';
 import 'package:push_up_5050/repositories/storage_service.dart';
 import 'package:push_up_5050/services/widget_update_service.dart';
 
@@ -125,10 +127,11 @@ class UserStatsProvider extends ChangeNotifier {
   /// Ordered from oldest (index 0) to today (index 29).
   List<DailyRecord?> _last30DaysRecords = [];
 
-  /// All daily records from storage for monthly calendar.
-  ///
-  /// Map of date strings (YYYY-MM-DD) to record data.
-  Map<String, dynamic> _allDailyRecords = {};
+  /// History aggregates the monthly calendars are built from.
+  HistoryIndex _historyIndex = HistoryIndex.empty();
+
+  /// Month models already built, reused until their month changes.
+  final MonthCalendarCache _monthCalendars = MonthCalendarCache();
 
   /// Get daily records for the last 30 days.
   ///
@@ -136,21 +139,32 @@ class UserStatsProvider extends ChangeNotifier {
   /// `null` indicates a missed day (no record in storage).
   List<DailyRecord?> get last30DaysRecords => _last30DaysRecords;
 
+  /// Calendar model for the month containing [month].
+  ///
+  /// Built lazily on first access and cached; the same instance is returned
+  /// until records of that month (or the current day) change, so widgets can
+  /// compare models by identity.
+  MonthCalendarModel monthCalendar(DateTime month) =>
+      _monthCalendars.get(_historyIndex, month, today: DateTime.now());
+
+  /// Date of the oldest record, null when there are none.
+  DateTime? get firstRecordDate => _historyIndex.firstRecordDate;
+
   /// Get completed days for the current month (1-31).
   ///
-  /// Returns a set of day numbers that have ≥50 pushups in the current month.
-  Set<int> get monthlyCompletedDays => _computeMonthlyCompletedDays();
+  /// Returns a set of day numbers that have any push-ups in the current month.
+  Set<int> get monthlyCompletedDays => monthCalendar(DateTime.now()).completedDays;
 
   /// Get missed days for the current month (1-31).
   ///
   /// Returns a set of day numbers in the current month that have no record.
-  Set<int> get monthlyMissedDays => _computeMonthlyMissedDays();
+  Set<int> get monthlyMissedDays => monthCalendar(DateTime.now()).missedDays;
 
   /// Get blocked days for the current month (1-31).
   ///
   /// Returns a set of day numbers BEFORE the first workout in the current month.
   /// These days should be displayed as locked/gray (not missed, just blocked).
-  Set<int> get monthlyBlockedDays => _computeMonthlyBlockedDays();
+  Set<int> get monthlyBlockedDays => monthCalendar(DateTime.now()).blockedDays;
 
   /// Load stats from storage.
   ///
@@ -167,23 +181,12 @@ class UserStatsProvider extends ChangeNotifier {
       final dailyGoal = _storage.getDailyGoal();
       _todayPushups = math.min(todayRecord?.totalPushups ?? 0, dailyGoal);
 
-      // Get all records and calculate totals
-      final allRecords = await _storage.loadDailyRecords();
-      _allDailyRecords = allRecords; // Store for monthly calendar
-      _totalPushupsAllTime = 0;
-      _daysCompleted = 0;
-      _totalPoints = 0;
-
-      for (final entry in allRecords.entries) {
-        final recordData = entry.value as Map<String, dynamic>;
-        final record = DailyRecord.fromJson(recordData);
-
-        _totalPushupsAllTime += record.totalPushups;
-        _totalPoints += record.pointsEarned;
-        if (record.goalReached) {
-          _daysCompleted++;
-        }
-      }
+      // All-time totals come from the history index (no record decoding)
+      final index = await _storage.loadHistoryIndex();
+      _historyIndex = index;
+      _totalPushupsAllTime = index.totalPushups;
+      _daysCompleted = index.goalReachedDays;
+      _totalPoints = index.totalPoints;
 
       // Get streak from storage
       _currentStreak = await _storage.calculateCurrentStreak();
@@ -197,33 +200,33 @@ class UserStatsProvider extends ChangeNotifier {
       _programStartDate = await _storage.getProgramStartDate();
 
       // If no program start date but we have records, set it to the first record date
-      if (_programStartDate == null && allRecords.isNotEmpty) {
-        // Find the oldest record date
-        DateTime? oldestDate;
-        for (final entry in allRecords.entries) {
-          final dateString = entry.key as String;
-          final parts = dateString.split('-');
-          final date = DateTime(
-            int.parse(parts[0]),
-            int.parse(parts[1]),
-            int.parse(parts[2]),
-          );
-          if (oldestDate == null || date.isBefore(oldestDate)) {
-            oldestDate = date;
-          }
-        }
-        if (oldestDate != null) {
-          _programStartDate = oldestDate;
-          await _storage.saveProgramStartDate(oldestDate);
-        }
+      final oldestDate = index.firstRecordDate;
+      if (_programStartDate == null && oldestDate != null) {
+        _programStartDate = oldestDate;
+        await _storage.saveProgramStartDate(oldestDate);
       }
 
+      // Raw records are only read for the 30-day windows, not the history
+      final now = DateTime.now();
+      final today = DateTime(now.year, now.month, now.day);
+      final recentRecords = await _storage.loadDailyRecordsInRange(
+        today.subtract(const Duration(days: 29)),
+        today,
+      );
+
       // Load last 30 days records for calendar (legacy)
-      _last30DaysRecords = _computeLast30DaysRecords(allRecords);
+      _last30DaysRecords = _computeLast30DaysRecords(recentRecords);
 
       // Load program day records for new calendar
-      _programDayRecords = _computeProgramDayRecords(allRecords);
-      _consecutiveMissedDays = _computeConsecutiveMissedDays(allRecords);
+      final programStart = _programStartDate;
+      final programRecords = programStart == null
+          ? const <String, dynamic>{}
+          : await _storage.loadDailyRecordsInRange(
+              programStart,
+              programStart.add(const Duration(days: 29)),
+            );
+      _programDayRecords = _computeProgramDayRecords(programRecords);
+      _consecutiveMissedDays = _computeConsecutiveMissedDays(recentRecords);
 
       _isLoading = false;
       notifyListeners();
@@ -239,23 +242,17 @@ class UserStatsProvider extends ChangeNotifier {
 
   /// Update all home screen widgets with current stats data.
   ///
-  /// Uses WidgetUpdateService.buildWidgetData() to create widget data
+  /// Uses WidgetUpdateService.buildWidgetDataFromHistory() to create widget data
   /// enriched with calendar information (when calendar service is available).
   /// Triggers widget updates via updateAllWidgets().
   Future<void> _updateWidgets() async {
     try {
-      // Build widget data using WidgetUpdateService.buildWidgetData()
-      // This will include calendar data if calendar service is available
-      final widgetData = await _widgetUpdateService.buildWidgetData(
-        todayPushups: _todayPushups,
-        totalPushups: _totalPushupsAllTime,
-        goalPushups: 5050,
+      // Same builder and inputs as the post-workout update, so this is a
+      // no-op write right after a workout
+      final widgetData = await _widgetUpdateService.buildWidgetDataFromHistory(
+        _historyIndex,
+        dailyGoal: _storage.getDailyGoal(),
         streakDays: _currentStreak,
-        totalPoints: _totalPoints,
-        lastWorkoutDate: _allDailyRecords.isNotEmpty
-            ? _getLastWorkoutDate()
-            : null,
-        allDailyRecords: _allDailyRecords,
       );
 
       await _widgetUpdateService.updateAllWidgets(widgetData);
@@ -264,31 +261,12 @@ class UserStatsProvider extends ChangeNotifier {
     }
   }
 
-  /// Get the date of the most recent workout from all daily records.
-  DateTime? _getLastWorkoutDate() {
-    if (_allDailyRecords.isEmpty) return null;
-    DateTime? latestDate;
-    for (final entry in _allDailyRecords.entries) {
-      final dateString = entry.key as String;
-      final parts = dateString.split('-');
-      final date = DateTime(
-        int.parse(parts[0]),
-        int.parse(parts[1]),
-        int.parse(parts[2]),
-      );
-      if (latestDate == null || date.isAfter(latestDate)) {
-        latestDate = date;
-      }
-    }
-    return latestDate;
-  }
-
-  /// Compute the last 30 days records from all records map.
+  /// Compute the last 30 days records from the recent records map.
   ///
   /// Returns a list of 30 elements ordered from oldest to today.
   /// `null` indicates a missed day (no record in storage).
   List<DailyRecord?> _computeLast30DaysRecords(
-      Map<String, dynamic> allRecords) {
+      Map<String, dynamic> records) {
     final List<DailyRecord?> result = [];
     final now = DateTime.now();
 
@@ -297,8 +275,8 @@ class UserStatsProvider extends ChangeNotifier {
       final dateKey =
           '${date.year}-${date.month.toString().padLeft(2, '0')}-${date.day.toString().padLeft(2, '0')}';
 
-      if (allRecords.containsKey(dateKey)) {
-        final recordData = allRecords[dateKey] as Map<String, dynamic>;
+      if (records.containsKey(dateKey)) {
+        final recordData = records[dateKey] as Map<String, dynamic>;
         result.add(DailyRecord.fromJson(recordData));
       } else {
         result.add(null); // Missed day
@@ -308,13 +286,13 @@ class UserStatsProvider extends ChangeNotifier {
     return result;
   }
 
-  /// Compute the program day records from all records map.
+  /// Compute the program day records from the program window records map.
   ///
   /// Returns a list of 30 elements ordered from program start date.
   /// Each element represents one day in the 30-day program.
   /// `null` indicates a missed day (no record in storage).
   List<DailyRecord?> _computeProgramDayRecords(
-      Map<String, dynamic> allRecords) {
+      Map<String, dynamic> records) {
     final List<DailyRecord?> result = [];
 
     if (_programStartDate == null) {
@@ -336,8 +314,8 @@ class UserStatsProvider extends ChangeNotifier {
         final dateKey =
             '${date.year}-${date.month.toString().padLeft(2, '0')}-${date.day.toString().padLeft(2, '0')}';
 
-        if (allRecords.containsKey(dateKey)) {
-          final recordData = allRecords[dateKey] as Map<String, dynamic>;
+        if (records.containsKey(dateKey)) {
+          final recordData = records[dateKey] as Map<String, dynamic>;
           result.add(DailyRecord.fromJson(recordData));
         } else {
           result.add(null); // Missed day
@@ -352,7 +330,8 @@ class UserStatsProvider extends ChangeNotifier {
   ///
   /// Counts how many days in a row the user has missed (no record).
   /// Returns 0 if today has a record or no records exist.
-  int _computeConsecutiveMissedDays(Map<String, dynamic> allRecords) {
+  /// [recentRecords] covers at least the last 30 days.
+  int _computeConsecutiveMissedDays(Map<String, dynamic> recentRecords) {
     int missedCount = 0;
     final now = DateTime.now();
 
@@ -361,7 +340,7 @@ class UserStatsProvider extends ChangeNotifier {
       final dateKey =
           '${date.year}-${date.month.toString().padLeft(2, '0')}-${date.day.toString().padLeft(2, '0')}';
 
-      if (allRecords.containsKey(dateKey)) {
+      if (recentRecords.containsKey(dateKey)) {
         // Found a record, stop counting
         break;
       } else {
@@ -369,7 +348,7 @@ class UserStatsProvider extends ChangeNotifier {
         // Skip today if it's not over yet (user might still work out)
         if (i == 0) {
           // Check if there are any records at all
-          if (allRecords.isEmpty) {
+          if (_historyIndex.recordCount == 0) {
             return 0;
           }
           continue;
@@ -470,158 +449,4 @@ class UserStatsProvider extends ChangeNotifier {
     }
     return activated;
   }
-
-  /// Compute completed days for the current month.
-  ///
-  /// Returns a set of day numbers (1-31) that have any pushups (> 0).
-  Set<int> _computeMonthlyCompletedDays() {
-    final completed = <int>{};
-    final now = DateTime.now();
-
-    for (final entry in _allDailyRecords.entries) {
-      final dateString = entry.key as String; // "2025-01-16"
-      final parts = dateString.split('-');
-      final year = int.parse(parts[0]);
-      final month = int.parse(parts[1]);
-      final day = int.parse(parts[2]);
-
-      // Only include days from current month
-      if (year == now.year && month == now.month) {
-        final recordData = entry.value as Map<String, dynamic>;
-        final record = DailyRecord.fromJson(recordData);
-        if (record.totalPushups > 0) {
-          completed.add(day);
-        }
-      }
-    }
-    return completed;
-  }
-
-  /// Compute missed days for the current month.
-  ///
-  /// Returns a set of day numbers (1-31) in the current month
-  /// that have no record and are in the past (not today or future).
-  /// Days BEFORE the first workout are NOT marked as missed (they're blocked).
-  /// Only days AFTER the last consecutive workout are marked as missed.
-  Set<int> _computeMonthlyMissedDays() {
-    final missed = <int>{};
-    final now = DateTime.now();
-    final today = DateTime(now.year, now.month, now.day);
-
-    // Find first workout in current month
-    final firstWorkout = _getFirstWorkoutDateInCurrentMonth();
-    if (firstWorkout == null) return missed; // No workouts this month
-
-    // Find last consecutive workout (going backwards from today)
-    final lastConsecutive = _getLastConsecutiveWorkoutDate();
-
-    for (int day = 1; day <= 31; day++) {
-      // Check if this day exists in current month
-      try {
-        final date = DateTime(now.year, now.month, day);
-        // Skip if date is in the future or today
-        if (date.isAfter(today) || date.isAtSameMomentAs(today)) {
-          continue;
-        }
-      } catch (_) {
-        // Invalid day for this month (e.g., Feb 30)
-        continue;
-      }
-
-      // Skip days before first workout (these are blocked, not missed)
-      if (day < firstWorkout.day) {
-        continue;
-      }
-
-      // Determine reference date (last consecutive or first workout)
-      final referenceDate = lastConsecutive ?? firstWorkout;
-
-      // Skip days on or before reference (these days are "ok")
-      if (day <= referenceDate.day) {
-        continue;
-      }
-
-      // Format date key
-      final dateKey = '${now.year}-${now.month.toString().padLeft(2, '0')}-${day.toString().padLeft(2, '0')}';
-
-      // If no record exists for this day AND it's after the reference, it's missed
-      if (!_allDailyRecords.containsKey(dateKey)) {
-        missed.add(day);
-      }
-    }
-    return missed;
-  }
-
-  /// Compute blocked days for the current month.
-  ///
-  /// Returns a set of day numbers (1-31) BEFORE the first workout in current month.
-  /// Days before the first workout should be shown as locked/gray, not missed.
-  Set<int> _computeMonthlyBlockedDays() {
-    final blocked = <int>{};
-    final now = DateTime.now();
-
-    // Find first workout date in current month
-    DateTime? firstWorkoutInMonth = _getFirstWorkoutDateInCurrentMonth();
-
-    if (firstWorkoutInMonth != null) {
-      // Block all days before the first workout
-      for (int day = 1; day < firstWorkoutInMonth.day; day++) {
-        blocked.add(day);
-      }
-    }
-
-    return blocked;
-  }
-
-  /// Get the first workout date in the current month.
-  ///
-  /// Returns null if no workout exists in current month.
-  DateTime? _getFirstWorkoutDateInCurrentMonth() {
-    final now = DateTime.now();
-    DateTime? firstDate;
-
-    for (final entry in _allDailyRecords.entries) {
-      final dateString = entry.key as String;
-      final parts = dateString.split('-');
-      final year = int.parse(parts[0]);
-      final month = int.parse(parts[1]);
-      final day = int.parse(parts[2]);
-
-      // Only consider records from current month
-      if (year == now.year && month == now.month) {
-        final date = DateTime(year, month, day);
-        if (firstDate == null || date.isBefore(firstDate)) {
-          firstDate = date;
-        }
-      }
-    }
-
-    return firstDate;
-  }
-
-  /// Get the last consecutive workout date going backwards from today.
-  /// Returns the date of the most recent day with a workout record,
-  /// searching backwards from today. This is used to determine
-  /// which days should be marked as "missed" vs "blocked".
-  DateTime? _getLastConsecutiveWorkoutDate() {
-    if (_allDailyRecords.isEmpty) return null;
-
-    final now = DateTime.now();
-    DateTime checkDate = now;
-
-    // Go back day by day until we find a record
-    for (int i = 0; i < 365; i++) {
-      final dateKey = '${checkDate.year}-'
-          '${checkDate.month.toString().padLeft(2, '0')}-'
-          '${checkDate.day.toString().padLeft(2, '0')}';
-
-      if (_allDailyRecords.containsKey(dateKey)) {
-        return checkDate; // Found last consecutive workout date
-      }
-
-      checkDate = checkDate.subtract(const Duration(days: 1));
-    }
-
-    return null;
-  }
 }
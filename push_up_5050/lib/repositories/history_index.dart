@@ -0,0 +1,474 @@
+import 'dart:math' as math;
+
+import 'package:push_up_5050/models/daily_record.dart';
+
+/// Day-indexed aggregate view of the daily records history.
+///
+/// Keeps one compact slot per calendar day (push-ups, points, flags) between
+/// the first and the last recorded day, plus all-time totals. Range sums are
+/// answered from lazily maintained prefix sums, so totals for a week, a month
+/// or the whole history never require decoding the raw records.
+///
+/// Updates through [put] are O(1) for the common case (today's record):
+/// prefix sums are only recomputed from the first changed slot onward.
+class HistoryIndex {
+  /// Serialization format version. Bump to force a rebuild on upgrade.
+  static const int formatVersion = 2;
+
+  static const int _flagHasRecord = 1;
+  static const int _flagGoalReached = 2;
+
+  /// Day number of slot 0 (days since 1970-01-01), null when empty.
+  int? _originDay;
+
+  final List<int> _pushups;
+  final List<int> _points;
+  final List<int> _flags;
+
+  // Prefix sums: entry i holds the sum of slots [0, i).
+  final List<int> _pushupsPrefix = [0];
+  final List<int> _pointsPrefix = [0];
+  final List<int> _activePrefix = [0];
+  final List<int> _recordPrefix = [0];
+
+  int _totalPushups;
+  int _totalPoints;
+  int _goalReachedDays;
+  int _recordCount;
+  int _maxPushupsInOneDay;
+
+  // Number of [put] calls per month since this instance was created, keyed
+  // by year * 12 + month - 1. Not serialized.
+  final Map<int, int> _monthRevisions = {};
+
+  /// Revision of the records store this index reflects.
+  ///
+  /// Used by [StorageService] to detect an index left stale by an
+  /// interrupted write.
+  int sourceRevision;
+
+  HistoryIndex._({
+    int? originDay,
+    List<int>? pushups,
+    List<int>? points,
+    List<int>? flags,
+    int totalPushups = 0,
+    int totalPoints = 0,
+    int goalReachedDays = 0,
+    int recordCount = 0,
+    int maxPushupsInOneDay = 0,
+    this.sourceRevision = 0,
+  })  : _originDay = originDay,
+        _pushups = pushups ?? [],
+        _points = points ?? [],
+        _flags = flags ?? [],
+        _totalPushups = totalPushups,
+        _totalPoints = totalPoints,
+        _goalReachedDays = goalReachedDays,
+        _recordCount = recordCount,
+        _maxPushupsInOneDay = maxPushupsInOneDay;
+
+  /// Create an empty index.
+  factory HistoryIndex.empty() => HistoryIndex._();
+
+  /// Build an index from the raw records map (keys in YYYY-MM-DD format).
+  ///
+  /// This is the migration path for installs that predate the index.
+  /// Corrupted entries are skipped.
+  factory HistoryIndex.fromRecords(
+    Map<String, dynamic> records, {
+    int sourceRevision = 0,
+  }) {
+    final index = HistoryIndex._(sourceRevision: sourceRevision);
+    for (final entry in records.values) {
+      try {
+        index.put(DailyRecord.fromJson(entry as Map<String, dynamic>));
+      } catch (e) {
+        // Corrupted entry, skip it
+      }
+    }
+    return index;
+  }
+
+  /// Serialize to JSON.
+  Map<String, dynamic> toJson() {
+    return {
+      'version': formatVersion,
+      'originDay': _originDay,
+      'pushups': _pushups,
+      'points': _points,
+      'flags': _flags,
+      'totalPushups': _totalPushups,
+      'totalPoints': _totalPoints,
+      'goalReachedDays': _goalReachedDays,
+      'recordCount': _recordCount,
+      'maxPushupsInOneDay': _maxPushupsInOneDay,
+      'sourceRevision': sourceRevision,
+    };
+  }
+
+  /// Deserialize from JSON.
+  ///
+  /// Returns null if the payload was written by a different format version.
+  static HistoryIndex? fromJson(Map<String, dynamic> json) {
+    if (json['version'] != formatVersion) return null;
+
+    return HistoryIndex._(
+      originDay: json['originDay'] as int?,
+      pushups: (json['pushups'] as List<dynamic>).cast<int>().toList(),
+      points: (json['points'] as List<dynamic>).cast<int>().toList(),
+      flags: (json['flags'] as List<dynamic>).cast<int>().toList(),
+      totalPushups: json['totalPushups'] as int,
+      totalPoints: json['totalPoints'] as int,
+      goalReachedDays: json['goalReachedDays'] as int,
+      recordCount: json['recordCount'] as int,
+      maxPushupsInOneDay: json['maxPushupsInOneDay'] as int,
+      sourceRevision: json['sourceRevision'] as int? ?? 0,
+    );
+  }
+
+  /// Serialize the slots of the calendar month containing [month].
+  ///
+  /// One entry per day of the month, so a single day's update can be
+  /// persisted without writing the whole history (see [applyMonthJson]).
+  Map<String, dynamic> monthToJson(DateTime month) {
+    final days = DateTime(month.year, month.month + 1, 0).day;
+    final pushups = List.filled(days, 0);
+    final points = List.filled(days, 0);
+    final flags = List.filled(days, 0);
+    for (var d = 1; d <= days; d++) {
+      final slot = _slotOf(DateTime(month.year, month.month, d));
+      if (slot == null) continue;
+      pushups[d - 1] = _pushups[slot];
+      points[d - 1] = _points[slot];
+      flags[d - 1] = _flags[slot];
+    }
+    return {'pushups': pushups, 'points': points, 'flags': flags};
+  }
+
+  /// Replace the month containing [month] with a [monthToJson] payload.
+  void applyMonthJson(DateTime month, Map<String, dynamic> json) {
+    final pushups = (json['pushups'] as List<dynamic>).cast<int>();
+    final points = (json['points'] as List<dynamic>).cast<int>();
+    final flags = (json['flags'] as List<dynamic>).cast<int>();
+    for (var d = 1; d <= flags.length; d++) {
+      final date = DateTime(month.year, month.month, d);
+      // Don't grow the arrays for days that have nothing to store
+      if (flags[d - 1] == 0 && !hasRecord(date)) continue;
+      _setDay(date, pushups[d - 1], points[d - 1], flags[d - 1]);
+    }
+  }
+
+  // ==================== Day Numbers ====================
+
+  /// Number of days between 1970-01-01 and [date] (time of day ignored).
+  ///
+  /// Computed in UTC so daylight saving changes never skew the result.
+  static int dayNumber(DateTime date) {
+    return DateTime.utc(date.year, date.month, date.day)
+            .millisecondsSinceEpoch ~/
+        Duration.millisecondsPerDay;
+  }
+
+  /// Local calendar date for a [dayNumber].
+  static DateTime dateOfDay(int day) {
+    final utc = DateTime.fromMillisecondsSinceEpoch(
+      day * Duration.millisecondsPerDay,
+      isUtc: true,
+    );
+    return DateTime(utc.year, utc.month, utc.day);
+  }
+
+  // ==================== Totals ====================
+
+  /// Whether no record has been indexed.
+  bool get isEmpty => _recordCount == 0;
+
+  /// Total push-ups across all records.
+  int get totalPushups => _totalPushups;
+
+  /// Total points across all records.
+  int get totalPoints => _totalPoints;
+
+  /// Number of days with goalReached set.
+  int get goalReachedDays => _goalReachedDays;
+
+  /// Number of days with a stored record.
+  int get recordCount => _recordCount;
+
+  /// Highest push-up count stored for a single day.
+  int get maxPushupsInOneDay => _maxPushupsInOneDay;
+
+  /// Date of the oldest stored record, null when empty.
+  ///
+  /// Slots are only created by [put], so the first and last slots always
+  /// hold a record.
+  DateTime? get firstRecordDate =>
+      _originDay == null ? null : dateOfDay(_originDay!);
+
+  /// Date of the most recent stored record, null when empty.
+  DateTime? get lastRecordDate =>
+      _originDay == null ? null : dateOfDay(_originDay! + _pushups.length - 1);
+
+  /// Date of the oldest day with push-ups (> 0), null if none.
+  DateTime? get firstActiveDate {
+    for (var slot = 0; slot < _pushups.length; slot++) {
+      if (_pushups[slot] > 0) return dateOfDay(_originDay! + slot);
+    }
+    return null;
+  }
+
+  // ==================== Single Day ====================
+
+  /// Whether a record exists for [date].
+  bool hasRecord(DateTime date) {
+    final slot = _slotOf(date);
+    return slot != null && _flags[slot] & _flagHasRecord != 0;
+  }
+
+  /// Push-ups recorded on [date] (0 if none).
+  int pushupsOn(DateTime date) {
+    final slot = _slotOf(date);
+    return slot == null ? 0 : _pushups[slot];
+  }
+
+  /// Points recorded on [date] (0 if none).
+  int pointsOn(DateTime date) {
+    final slot = _slotOf(date);
+    return slot == null ? 0 : _points[slot];
+  }
+
+  /// Whether the goal was reached on [date].
+  bool goalReachedOn(DateTime date) {
+    final slot = _slotOf(date);
+    return slot != null && _flags[slot] & _flagGoalReached != 0;
+  }
+
+  /// Most recent day with a record on or before [date], null if none.
+  DateTime? lastRecordOnOrBefore(DateTime date) {
+    final origin = _originDay;
+    if (origin == null) return null;
+
+    var slot = math.min(dayNumber(date) - origin, _pushups.length - 1);
+    while (slot >= 0 && _flags[slot] & _flagHasRecord == 0) {
+      slot--;
+    }
+    return slot < 0 ? null : dateOfDay(origin + slot);
+  }
+
+  /// Change counter for the month containing [date].
+  ///
+  /// Increases whenever a record of that month is [put] into this instance,
+  /// so caches keyed by the index instance and this value only need to
+  /// rebuild the months that actually changed.
+  int monthRevision(DateTime date) =>
+      _monthRevisions[date.year * 12 + date.month - 1] ?? 0;
+
+  // ==================== Ranges ====================
+
+  /// Total push-ups between [from] and [to], both inclusive.
+  int sumPushups(DateTime from, DateTime to) =>
+      _rangeSum(_pushupsPrefix, from, to);
+
+  /// Total points between [from] and [to], both inclusive.
+  int sumPoints(DateTime from, DateTime to) =>
+      _rangeSum(_pointsPrefix, from, to);
+
+  /// Days with any push-ups (> 0) between [from] and [to], both inclusive.
+  int activeDays(DateTime from, DateTime to) =>
+      _rangeSum(_activePrefix, from, to);
+
+  /// Days with a stored record between [from] and [to], both inclusive.
+  int recordDays(DateTime from, DateTime to) =>
+      _rangeSum(_recordPrefix, from, to);
+
+  /// Total push-ups in the calendar month containing [date].
+  int sumPushupsInMonth(DateTime date) {
+    return sumPushups(
+      DateTime(date.year, date.month, 1),
+      DateTime(date.year, date.month + 1, 0),
+    );
+  }
+
+  // ==================== Streaks ====================
+
+  /// Consecutive days with push-ups (> 0) ending on [today].
+  ///
+  /// Today is skipped when it has no push-ups yet, so an unfinished day does
+  /// not break the streak. At most [lookBackDays] days are inspected,
+  /// today included, mirroring the historical storage behaviour.
+  int currentStreak(DateTime today, {int lookBackDays = 30}) {
+    int end = dayNumber(today);
+    int limit = lookBackDays;
+    if (pushupsOn(today) <= 0) {
+      end -= 1;
+      limit -= 1;
+    }
+    return math.min(_runLengthEndingAt(end), math.max(limit, 0));
+  }
+
+  /// Consecutive weeks (Monday-Sunday) with any push-ups, ending this week.
+  ///
+  /// The current week is skipped while it has no records at all. At most
+  /// [maxWeeks] weeks are inspected.
+  int weeklyStreak(DateTime today, {int maxWeeks = 52}) {
+    final todayDay = dayNumber(today);
+    int weekStart = todayDay - (today.weekday - 1);
+    int streak = 0;
+
+    for (int i = 0; i < maxWeeks; i++) {
+      final weekEnd = math.min(weekStart + 6, todayDay);
+
+      if (i == 0 && _rangeSumDays(_recordPrefix, weekStart, weekEnd) == 0) {
+        weekStart -= 7;
+        continue;
+      }
+
+      if (_rangeSumDays(_activePrefix, weekStart, weekEnd) > 0) {
+        streak++;
+        weekStart -= 7;
+      } else {
+        break;
+      }
+    }
+
+    return streak;
+  }
+
+  // ==================== Updates ====================
+
+  /// Insert or replace the aggregates for [record]'s day.
+  void put(DailyRecord record) {
+    _setDay(
+      record.date,
+      record.totalPushups,
+      record.pointsEarned,
+      _flagHasRecord | (record.goalReached ? _flagGoalReached : 0),
+    );
+  }
+
+  void _setDay(DateTime date, int pushups, int points, int flags) {
+    final slot = _ensureSlot(dayNumber(date));
+    _monthRevisions.update(
+      date.year * 12 + date.month - 1,
+      (revision) => revision + 1,
+      ifAbsent: () => 1,
+    );
+
+    final hadRecord = _flags[slot] & _flagHasRecord != 0;
+    final willHaveRecord = flags & _flagHasRecord != 0;
+    final oldPushups = _pushups[slot];
+    final oldFlags = _flags[slot];
+
+    _totalPushups += pushups - oldPushups;
+    _totalPoints += points - _points[slot];
+    if (willHaveRecord != hadRecord) _recordCount += willHaveRecord ? 1 : -1;
+    if (oldFlags & _flagGoalReached != 0) _goalReachedDays--;
+    if (flags & _flagGoalReached != 0) _goalReachedDays++;
+
+    _pushups[slot] = pushups;
+    _points[slot] = points;
+    _flags[slot] = flags;
+
+    if (pushups >= _maxPushupsInOneDay) {
+      _maxPushupsInOneDay = pushups;
+    } else if (oldPushups == _maxPushupsInOneDay) {
+      // The previous maximum was lowered, rescan (records rarely shrink)
+      _maxPushupsInOneDay = _pushups.fold<int>(0, math.max);
+    }
+
+    _invalidatePrefixFrom(slot);
+  }
+
+  // ==================== Internals ====================
+
+  int? _slotOf(DateTime date) {
+    if (_originDay == null) return null;
+    final slot = dayNumber(date) - _originDay!;
+    if (slot < 0 || slot >= _pushups.length) return null;
+    return slot;
+  }
+
+  /// Grow the dense arrays so that [day] has a slot and return it.
+  int _ensureSlot(int day) {
+    if (_originDay == null) {
+      _originDay = day;
+    } else if (day < _originDay!) {
+      final gap = _originDay! - day;
+      _pushups.insertAll(0, List.filled(gap, 0));
+      _points.insertAll(0, List.filled(gap, 0));
+      _flags.insertAll(0, List.filled(gap, 0));
+      _originDay = day;
+      _invalidatePrefixFrom(0);
+    }
+
+    final slot = day - _originDay!;
+    if (slot >= _pushups.length) {
+      final gap = slot - _pushups.length + 1;
+      _pushups.addAll(List.filled(gap, 0));
+      _points.addAll(List.filled(gap, 0));
+      _flags.addAll(List.filled(gap, 0));
+    }
+    return slot;
+  }
+
+  void _invalidatePrefixFrom(int slot) {
+    final keep = slot + 1;
+    if (_pushupsPrefix.length > keep) {
+      _pushupsPrefix.length = keep;
+      _pointsPrefix.length = keep;
+      _activePrefix.length = keep;
+      _recordPrefix.length = keep;
+    }
+  }
+
+  /// Extend the prefix sums so that they cover every slot.
+  void _ensurePrefix() {
+    for (int i = _pushupsPrefix.length - 1; i < _pushups.length; i++) {
+      _pushupsPrefix.add(_pushupsPrefix[i] + _pushups[i]);
+      _pointsPrefix.add(_pointsPrefix[i] + _points[i]);
+      _activePrefix.add(_activePrefix[i] + (_pushups[i] > 0 ? 1 : 0));
+      _recordPrefix.add(
+        _recordPrefix[i] + (_flags[i] & _flagHasRecord != 0 ? 1 : 0),
+      );
+    }
+  }
+
+  int _rangeSum(List<int> prefix, DateTime from, DateTime to) {
+    return _rangeSumDays(prefix, dayNumber(from), dayNumber(to));
+  }
+
+  /// Sum of [prefix]'s underlying slots for days [fromDay, toDay] inclusive.
+  int _rangeSumDays(List<int> prefix, int fromDay, int toDay) {
+    if (_originDay == null || toDay < fromDay) return 0;
+    final start = math.max(fromDay - _originDay!, 0);
+    final end = math.min(toDay - _originDay!, _pushups.length - 1);
+    if (end < start) return 0;
+    _ensurePrefix();
+    return prefix[end + 1] - prefix[start];
+  }
+
+  /// Length of the run of active days ending on [day].
+  ///
+  /// Binary search over the active-day prefix sums: a window of k days is
+  /// fully active exactly when it holds k active days.
+  int _runLengthEndingAt(int day) {
+    if (_originDay == null) return 0;
+    final end = day - _originDay!;
+    if (end < 0 || end >= _pushups.length) return 0;
+    _ensurePrefix();
+
+    int low = 0;
+    int high = end + 1;
+    while (low < high) {
+      final mid = (low + high + 1) ~/ 2;
+      final active = _activePrefix[end + 1] - _activePrefix[end + 1 - mid];
+      if (active == mid) {
+        low = mid;
+      } else {
+        high = mid - 1;
+      }
+    }
+    return low;
+  }
+}
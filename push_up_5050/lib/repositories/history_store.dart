@@ -0,0 +1,368 @@
+import 'dart:convert';
+import 'dart:io';
+
+import 'package:flutter/foundation.dart';
+import 'package:path_provider/path_provider.dart';
+
+/// Raw file operations used by [HistoryStore].
+///
+/// Implementations only need plain read/write/rename semantics; crash safety
+/// (checksums, write-then-rename, recovery) is handled by [HistoryStore].
+abstract class HistoryStoreBackend {
+  /// Read a file, or null if it does not exist or cannot be decoded.
+  Future<String?> read(String name);
+
+  /// Create or overwrite a file.
+  Future<void> write(String name, String contents);
+
+  /// Rename [from] to [to], replacing [to]. No-op if [from] does not exist.
+  Future<void> rename(String from, String to);
+
+  /// Delete a file. No-op if it does not exist.
+  Future<void> delete(String name);
+
+  /// Names of all files in the store.
+  Future<List<String>> list();
+}
+
+/// [HistoryStoreBackend] backed by a directory on disk.
+class FileHistoryStoreBackend implements HistoryStoreBackend {
+  final Directory directory;
+
+  FileHistoryStoreBackend(this.directory);
+
+  File _file(String name) => File('${directory.path}/$name');
+
+  @override
+  Future<String?> read(String name) async {
+    final file = _file(name);
+    if (!await file.exists()) return null;
+    try {
+      return await file.readAsString();
+    } catch (e) {
+      // Torn multi-byte sequence or I/O error, treat as unreadable
+      return null;
+    }
+  }
+
+  @override
+  Future<void> write(String name, String contents) async {
+    await _file(name).writeAsString(contents, flush: true);
+  }
+
+  @override
+  Future<void> rename(String from, String to) async {
+    final file = _file(from);
+    if (await file.exists()) {
+      await file.rename(_file(to).path);
+    }
+  }
+
+  @override
+  Future<void> delete(String name) async {
+    final file = _file(name);
+    if (await file.exists()) {
+      await file.delete();
+    }
+  }
+
+  @override
+  Future<List<String>> list() async {
+    if (!await directory.exists()) return [];
+    return directory
+        .list()
+        .where((entity) => entity is File)
+        .map((entity) => entity.uri.pathSegments.last)
+        .toList();
+  }
+}
+
+/// In-memory [HistoryStoreBackend] for tests.
+class MemoryHistoryStoreBackend implements HistoryStoreBackend {
+  /// File contents by name.
+  final Map<String, String> files = {};
+
+  @override
+  Future<String?> read(String name) async => files[name];
+
+  @override
+  Future<void> write(String name, String contents) async {
+    files[name] = contents;
+  }
+
+  @override
+  Future<void> rename(String from, String to) async {
+    final contents = files.remove(from);
+    if (contents != null) {
+      files[to] = contents;
+    }
+  }
+
+  @override
+  Future<void> delete(String name) async {
+    files.remove(name);
+  }
+
+  @override
+  Future<List<String>> list() async => files.keys.toList();
+}
+
+/// Crash-safe, month-partitioned store for the daily records history.
+///
+/// Records live in one segment per month (`records-YYYY-MM.json`), so saving
+/// a day only rewrites that month and reading a day or a range only loads
+/// the months it touches. Loaded segments are cached in memory.
+///
+/// Every file is framed with its length and an FNV-1a checksum and written
+/// with write-to-temp, keep-backup, rename. On read, the committed file is
+/// used when valid, otherwise the completed temp file, otherwise the
+/// backup, so an interrupted write loses at most that write.
+class HistoryStore {
+  static const String _segmentPrefix = 'records-';
+  static const String _extension = '.json';
+  static const String _tempSuffix = '.tmp';
+  static const String _backupSuffix = '.bak';
+  static const String _frameMagic = 'PU5050';
+  static const int _frameVersion = 1;
+
+  final HistoryStoreBackend _backend;
+
+  /// Cached segments by month key (YYYY-MM).
+  final Map<String, Map<String, dynamic>> _segments = {};
+
+  /// Whether every segment on disk is in [_segments].
+  bool _allLoaded = false;
+
+  /// Tail of the write queue; writes are serialized to keep segments whole.
+  Future<void> _writeQueue = Future.value();
+
+  HistoryStore(this._backend);
+
+  /// Open the store in the app support directory.
+  static Future<HistoryStore> open() async {
+    final support = await getApplicationSupportDirectory();
+    final directory = Directory('${support.path}/history');
+    await directory.create(recursive: true);
+    return HistoryStore(FileHistoryStoreBackend(directory));
+  }
+
+  // ==================== Records ====================
+
+  /// Read the record stored for [date], or null.
+  Future<Map<String, dynamic>?> readDay(DateTime date) async {
+    final segment = await _loadSegment(_monthKey(date.year, date.month));
+    return segment[_dateKey(date)] as Map<String, dynamic>?;
+  }
+
+  /// Read the records between [from] and [to], both inclusive.
+  ///
+  /// Only the months overlapping the range are loaded.
+  Future<Map<String, dynamic>> readRange(DateTime from, DateTime to) async {
+    final fromKey = _dateKey(from);
+    final toKey = _dateKey(to);
+    final result = <String, dynamic>{};
+
+    var month = DateTime(from.year, from.month);
+    final lastMonth = DateTime(to.year, to.month);
+    while (!month.isAfter(lastMonth)) {
+      final segment = await _loadSegment(_monthKey(month.year, month.month));
+      for (final entry in segment.entries) {
+        // YYYY-MM-DD keys compare chronologically as strings
+        if (entry.key.compareTo(fromKey) >= 0 &&
+            entry.key.compareTo(toKey) <= 0) {
+          result[entry.key] = entry.value;
+        }
+      }
+      month = DateTime(month.year, month.month + 1);
+    }
+
+    return result;
+  }
+
+  /// Read every stored record, keyed by YYYY-MM-DD.
+  Future<Map<String, dynamic>> readAll() async {
+    if (!_allLoaded) {
+      for (final month in await _segmentMonths()) {
+        await _loadSegment(month);
+      }
+      _allLoaded = true;
+    }
+
+    final result = <String, dynamic>{};
+    for (final segment in _segments.values) {
+      result.addAll(segment);
+    }
+    return result;
+  }
+
+  /// Store [record] for [date], rewriting only that month's segment.
+  Future<void> writeDay(DateTime date, Map<String, dynamic> record) {
+    return _serialized(() async {
+      final month = _monthKey(date.year, date.month);
+      final segment = await _loadSegment(month);
+      segment[_dateKey(date)] = record;
+      await _commitSegment(month, segment);
+    });
+  }
+
+  /// Store many records at once (YYYY-MM-DD keys), one write per month.
+  ///
+  /// Existing records for the same days are replaced.
+  Future<void> writeAll(Map<String, dynamic> records) {
+    return _serialized(() async {
+      final byMonth = <String, Map<String, dynamic>>{};
+      for (final entry in records.entries) {
+        byMonth.putIfAbsent(entry.key.substring(0, 7), () => {})[entry.key] =
+            entry.value;
+      }
+
+      for (final entry in byMonth.entries) {
+        final segment = await _loadSegment(entry.key);
+        segment.addAll(entry.value);
+        await _commitSegment(entry.key, segment);
+      }
+    });
+  }
+
+  // ==================== Documents ====================
+
+  /// Read a named auxiliary document (e.g. the history index).
+  Future<String?> readDocument(String name) {
+    return _readFramed('$name$_extension');
+  }
+
+  /// Write a named auxiliary document with the same crash safety as records.
+  Future<void> writeDocument(String name, String contents) {
+    return _serialized(() => _commit('$name$_extension', contents));
+  }
+
+  /// Delete every record and document.
+  Future<void> clear() {
+    return _serialized(() async {
+      for (final name in await _backend.list()) {
+        await _backend.delete(name);
+      }
+      _segments.clear();
+      _allLoaded = true;
+    });
+  }
+
+  // ==================== Framing & Recovery ====================
+
+  /// Persist a cached segment; on failure the cache entry is dropped so the
+  /// next read reflects what actually reached the disk.
+  Future<void> _commitSegment(String month, Map<String, dynamic> segment) async {
+    try {
+      await _commit(_segmentName(month), jsonEncode(segment));
+    } catch (e) {
+      _segments.remove(month);
+      _allLoaded = false;
+      rethrow;
+    }
+  }
+
+  /// Write [payload] to [name] so that a crash at any point leaves either
+  /// the previous or the new contents recoverable.
+  Future<void> _commit(String name, String payload) async {
+    await _backend.write('$name$_tempSuffix', _frame(payload));
+    await _backend.rename(name, '$name$_backupSuffix');
+    await _backend.rename('$name$_tempSuffix', name);
+  }
+
+  /// Read [name], falling back to the temp and backup generations.
+  Future<String?> _readFramed(String name) async {
+    for (final candidate in [name, '$name$_tempSuffix', '$name$_backupSuffix']) {
+      final contents = await _backend.read(candidate);
+      if (contents == null) continue;
+
+      final payload = _unframe(contents);
+      if (payload != null) {
+        if (candidate != name) {
+          debugPrint('HistoryStore: recovered $name from $candidate');
+        }
+        return payload;
+      }
+      debugPrint('HistoryStore: discarding corrupted $candidate');
+    }
+    return null;
+  }
+
+  static String _frame(String payload) {
+    return '$_frameMagic $_frameVersion ${payload.length} '
+        '${checksum(payload)}\n$payload';
+  }
+
+  /// Extract the payload, or null if the frame is torn or corrupted.
+  static String? _unframe(String contents) {
+    final newline = contents.indexOf('\n');
+    if (newline < 0) return null;
+
+    final header = contents.substring(0, newline).split(' ');
+    if (header.length != 4 ||
+        header[0] != _frameMagic ||
+        header[1] != '$_frameVersion') {
+      return null;
+    }
+
+    final payload = contents.substring(newline + 1);
+    if (int.tryParse(header[2]) != payload.length) return null;
+    if (int.tryParse(header[3]) != checksum(payload)) return null;
+    return payload;
+  }
+
+  /// 32-bit FNV-1a checksum of [data]'s UTF-16 code units.
+  static int checksum(String data) {
+    var hash = 0x811c9dc5;
+    for (final unit in data.codeUnits) {
+      hash ^= unit;
+      hash = (hash * 0x01000193) & 0xffffffff;
+    }
+    return hash;
+  }
+
+  // ==================== Internals ====================
+
+  Future<Map<String, dynamic>> _loadSegment(String month) async {
+    final cached = _segments[month];
+    if (cached != null) return cached;
+
+    Map<String, dynamic> segment = {};
+    final payload = await _readFramed(_segmentName(month));
+    if (payload != null) {
+      try {
+        segment = jsonDecode(payload) as Map<String, dynamic>;
+      } catch (e) {
+        // Checksum matched but content is not a record map, start over
+        debugPrint('HistoryStore: invalid segment $month');
+      }
+    }
+
+    // Another caller may have loaded it while we were reading
+    return _segments.putIfAbsent(month, () => segment);
+  }
+
+  /// Months with a segment on disk, including ones only left as temp/backup.
+  Future<Set<String>> _segmentMonths() async {
+    final months = <String>{};
+    for (final name in await _backend.list()) {
+      if (!name.startsWith(_segmentPrefix)) continue;
+      final month = name.substring(_segmentPrefix.length).split('.').first;
+      if (month.length == 7) months.add(month);
+    }
+    return months;
+  }
+
+  Future<T> _serialized<T>(Future<T> Function() action) {
+    final result = _writeQueue.then((_) => action());
+    _writeQueue = result.then((_) {}, onError: (_) {});
+    return result;
+  }
+
+  static String _segmentName(String month) => '$_segmentPrefix$month$_extension';
+
+  static String _monthKey(int year, int month) =>
+      '$year-${month.toString().padLeft(2, '0')}';
+
+  static String _dateKey(DateTime date) =>
+      '${_monthKey(date.year, date.month)}-${date.day.toString().padLeft(2, '0')}';
+}
@@ -1,35 +1,71 @@
 import 'dart:convert';
 
+import 'package:flutter/foundation.dart';
 import 'package:shared_preferences/shared_preferences.dart';
 import 'package:push_up_5050/models/workout_session.dart';
 import 'package:push_up_5050/models/daily_record.dart';
 import 'package:push_up_5050/models/achievement.dart';
 import 'package:push_up_5050/models/notification_time_slot.dart';
+import 'package:push_up_5050/repositories/history_index.dart';
+import 'package:push_up_5050/repositories/history_store.dart';
 import 'package:push_up_5050/utils/workout_time_analyzer.dart';
 
 /// Storage service for persisting app data using SharedPreferences.
 ///
+/// Daily records live in a month-partitioned [HistoryStore]; everything else
+/// stays in SharedPreferences.
+///
 /// Use [create] for production, or inject a mock [SharedPreferences] for testing.
 class StorageService {
   final SharedPreferences _prefs;
+  final HistoryStore _history;
+
+  /// In-memory copy of the persisted [HistoryIndex], loaded on first use.
+  HistoryIndex? _historyIndex;
+
+  /// Revision of the persisted index snapshot, null until one is known.
+  int? _historyIndexSnapshotRevision;
+
+  /// Months changed since that snapshot, as [HistoryIndex.monthToJson]
+  /// payloads keyed by YYYY-MM.
+  final Map<String, dynamic> _historyIndexTail = {};
+
+  /// Tail of the queued achievement writes.
+  Future<void> _achievementWrites = Future.value();
 
   /// Private constructor - use [create] factory or [forTesting] for injection.
-  StorageService._(this._prefs);
+  StorageService._(this._prefs, this._history);
 
   /// Constructor for testing with dependency injection.
-  factory StorageService.forTesting(SharedPreferences prefs) {
-    return StorageService._(prefs);
+  ///
+  /// Records go to an in-memory [HistoryStore] unless [historyStore] is given.
+  factory StorageService.forTesting(
+    SharedPreferences prefs, {
+    HistoryStore? historyStore,
+  }) {
+    return StorageService._(
+      prefs,
+      historyStore ?? HistoryStore(MemoryHistoryStoreBackend()),
+    );
   }
 
   /// Factory for production use - initializes SharedPreferences.
   static Future<StorageService> create() async {
     final prefs = await SharedPreferences.getInstance();
-    return StorageService._(prefs);
+    final history = await HistoryStore.open();
+    return StorageService._(prefs, history);
   }
 
   // Storage keys
   static const String _keyActiveSession = 'active_session';
-  static const String _keyDailyRecords = 'daily_records';
+  static const String _keyDailyRecords = 'daily_records'; // Legacy, migrated
+  static const String _keyHistoryIndex = 'history_index'; // Legacy, dropped
+  static const String _keyHistoryRevision = 'history_revision';
+  static const String _historyIndexDocument = 'index';
+  static const String _historyIndexTailDocument = 'index-tail';
+
+  /// Months kept in the index tail before it is folded into the snapshot.
+  static const int _maxHistoryIndexTailMonths = 3;
   static const String _keyAchievements = 'achievements';
   static const String _keyWorkoutPreferences = 'workout_preferences';
   static const String _keyProgramStartDate = 'program_start_date';
@@ -86,39 +122,80 @@ class StorageService {
   // ==================== Daily Records ====================
 
   /// Save or merge a daily record to storage.
+  ///
+  /// Only the record's month segment is rewritten. Also updates the
+  /// [HistoryIndex] aggregates for the record's day, persisting only the
+  /// record's month of the index.
   Future<void> saveDailyRecord(DailyRecord record) async {
-    final records = await loadDailyRecords();
-    records[_formatDate(record.date)] = record.toJson();
+    final index = await loadHistoryIndex();
 
-    final json = jsonEncode(records);
-    await _prefs.setString(_keyDailyRecords, json);
+    // Bump the revision before writing so a crash mid-write leaves the
+    // index detectably stale rather than silently wrong.
+    final revision = _historyRevision + 1;
+    await _prefs.setInt(_keyHistoryRevision, revision);
+    await _history.writeDay(record.date, record.toJson());
+
+    index.put(record);
+    index.sourceRevision = revision;
+    await _saveHistoryIndexMonth(index, record.date);
   }
 
   /// Load all daily records from storage.
-  /// Returns empty map if no records exist or data is corrupted.
+  /// Returns empty map if no records exist.
   Future<Map<String, dynamic>> loadDailyRecords() async {
-    final json = _prefs.getString(_keyDailyRecords);
-    if (json == null) return {};
+    await _migrateLegacyRecords();
+    return _history.readAll();
+  }
 
-    try {
-      final decoded = jsonDecode(json) as Map<String, dynamic>;
-      return decoded;
-    } catch (e) {
-      // Corrupted data, return empty
-      return {};
-    }
+  /// Load the daily records between [from] and [to], both inclusive.
+  ///
+  /// Only the months covering the range are read.
+  Future<Map<String, dynamic>> loadDailyRecordsInRange(
+    DateTime from,
+    DateTime to,
+  ) async {
+    await _migrateLegacyRecords();
+    return _history.readRange(from, to);
   }
 
   /// Get a specific daily record by date.
   /// Returns null if record doesn't exist.
   Future<DailyRecord?> getDailyRecord(DateTime date) async {
-    final records = await loadDailyRecords();
-    final key = _formatDate(date);
-    final json = records[key];
+    final index = await loadHistoryIndex();
+    if (!index.hasRecord(date)) return null;
 
+    final json = await _history.readDay(date);
     if (json == null) return null;
 
-    return DailyRecord.fromJson(json as Map<String, dynamic>);
+    return DailyRecord.fromJson(json);
+  }
+
+  int get _historyRevision => _prefs.getInt(_keyHistoryRevision) ?? 0;
+
+  /// Move records from the legacy single `daily_records` JSON blob into the
+  /// [HistoryStore].
+  ///
+  /// Cheap no-op once migrated. Safe to re-run if interrupted: the legacy key
+  /// is only removed after every month has been written. A blob that cannot
+  /// be decoded is kept as a store document instead of being dropped.
+  Future<void> _migrateLegacyRecords() async {
+    final legacy = _prefs.getString(_keyDailyRecords);
+    if (legacy == null) return;
+
+    Map<String, dynamic>? records;
+    try {
+      records = jsonDecode(legacy) as Map<String, dynamic>;
+    } catch (e) {
+      debugPrint('StorageService: legacy daily records unreadable, preserved');
+      await _history.writeDocument('legacy_daily_records', legacy);
+    }
+
+    await _prefs.setInt(_keyHistoryRevision, _historyRevision + 1);
+    if (records != null) {
+      await _history.writeAll(records);
+    }
+    await _prefs.remove(_keyDailyRecords);
+    await _prefs.remove(_keyHistoryIndex);
   }
 
   /// Check if today's daily goal has already been completed.
@@ -131,60 +208,161 @@ class StorageService {
     return record?.goalReached ?? false;
   }
 
-  // ==================== Streak Calculation ====================
+  // ==================== History Index ====================
 
-  /// Calculate current streak of consecutive days with any push-ups (> 0).
-  /// Counts backwards from today, breaks on days with no push-ups (missed).
-  /// Today is skipped if no record exists yet (workout not done).
-  Future<int> calculateCurrentStreak() async {
-    final records = await loadDailyRecords();
-    int streak = 0;
-    DateTime date = DateTime.now();
-
-    // Check backwards from today
-    for (int i = 0; i < 30; i++) {
-      final key = _formatDate(date);
-      final json = records[key];
-
-      if (json == null) {
-        // No record for this day
-        // Check if it's today (we shouldn't break streak if today not done yet)
-        if (i == 0) {
-          date = date.subtract(const Duration(days: 1));
-          continue;
-        }
-        break; // Missed day, streak broken
-      }
+  /// Load the day-indexed aggregates of the daily records history.
+  ///
+  /// Served from memory after the first call. The persisted index is a
+  /// snapshot plus a tail of the months changed since. It is rebuilt from
+  /// the records when it is missing (installs that predate it), written by
+  /// another format version, corrupted, or behind the records store
+  /// revision.
+  Future<HistoryIndex> loadHistoryIndex() async {
+    await _migrateLegacyRecords();
+    final revision = _historyRevision;
+
+    final cached = _historyIndex;
+    if (cached != null && cached.sourceRevision == revision) {
+      return cached;
+    }
 
-      final recordData = json as Map<String, dynamic>;
-      final totalPushups = recordData['totalPushups'] as int;
-
-      if (totalPushups > 0) {
-        // Any day with push-ups counts for the streak
-        streak++;
-        date = date.subtract(const Duration(days: 1));
-      } else {
-        // Day with 0 push-ups - break unless it's today
-        if (i == 0) {
-          date = date.subtract(const Duration(days: 1));
-          continue;
+    final json = await _history.readDocument(_historyIndexDocument);
+    if (json != null) {
+      try {
+        final decoded = jsonDecode(json) as Map<String, dynamic>;
+        final stored = HistoryIndex.fromJson(decoded);
+        if (stored != null) {
+          final snapshotRevision = stored.sourceRevision;
+          final tail = await _loadHistoryIndexTail(snapshotRevision);
+          if (tail != null) {
+            tail.months.forEach((month, slice) {
+              stored.applyMonthJson(_parseMonth(month), slice as Map<String, dynamic>);
+            });
+            stored.sourceRevision = tail.revision;
+          }
+
+          if (stored.sourceRevision == revision) {
+            _historyIndex = stored;
+            _historyIndexSnapshotRevision = snapshotRevision;
+            _historyIndexTail
+              ..clear()
+              ..addAll(tail?.months ?? const {});
+            return stored;
+          }
         }
-        break;
+      } catch (e) {
+        // Corrupted index, rebuild below
       }
     }
 
-    return streak;
+    return rebuildHistoryIndex();
+  }
+
+  /// Rebuild the history index from the stored daily records and persist it.
+  Future<HistoryIndex> rebuildHistoryIndex() async {
+    final records = await loadDailyRecords();
+    final index = HistoryIndex.fromRecords(
+      records,
+      sourceRevision: _historyRevision,
+    );
+    await _saveHistoryIndex(index);
+    return index;
+  }
+
+  /// Write a full snapshot of [index] and empty the tail.
+  Future<void> _saveHistoryIndex(HistoryIndex index) async {
+    _historyIndex = index;
+    await _history.writeDocument(
+      _historyIndexDocument,
+      jsonEncode(index.toJson()),
+    );
+    _historyIndexSnapshotRevision = index.sourceRevision;
+    _historyIndexTail.clear();
+    await _writeHistoryIndexTail(index.sourceRevision);
+  }
+
+  /// Persist [month] of [index] to the tail, or write a new snapshot once
+  /// the tail holds too many months.
+  Future<void> _saveHistoryIndexMonth(HistoryIndex index, DateTime month) async {
+    _historyIndex = index;
+    final key = '${month.year}-${month.month.toString().padLeft(2, '0')}';
+    _historyIndexTail[key] = index.monthToJson(month);
+    if (_historyIndexSnapshotRevision == null ||
+        _historyIndexTail.length > _maxHistoryIndexTailMonths) {
+      await _saveHistoryIndex(index);
+      return;
+    }
+    await _writeHistoryIndexTail(index.sourceRevision);
+  }
+
+  Future<void> _writeHistoryIndexTail(int revision) {
+    return _history.writeDocument(
+      _historyIndexTailDocument,
+      jsonEncode({
+        'version': HistoryIndex.formatVersion,
+        'snapshotRevision': _historyIndexSnapshotRevision,
+        'sourceRevision': revision,
+        'months': _historyIndexTail,
+      }),
+    );
+  }
+
+  /// The tail written on top of the snapshot at [snapshotRevision], or null
+  /// if there is none or it belongs to another snapshot.
+  Future<({int revision, Map<String, dynamic> months})?> _loadHistoryIndexTail(
+    int snapshotRevision,
+  ) async {
+    final json = await _history.readDocument(_historyIndexTailDocument);
+    if (json == null) return null;
+
+    final decoded = jsonDecode(json) as Map<String, dynamic>;
+    if (decoded['version'] != HistoryIndex.formatVersion ||
+        decoded['snapshotRevision'] != snapshotRevision) {
+      return null;
+    }
+    return (
+      revision: decoded['sourceRevision'] as int,
+      months: decoded['months'] as Map<String, dynamic>,
+    );
+  }
+
+  static DateTime _parseMonth(String month) {
+    final parts = month.split('-');
+    return DateTime(int.parse(parts[0]), int.parse(parts[1]));
+  }
+
+  // ==================== Streak Calculation ====================
+
+  /// Calculate current streak of consecutive days with any push-ups (> 0).
+  /// Counts backwards from today, breaks on days with no push-ups (missed).
+  /// Today is skipped if no record exists yet (workout not done).
+  Future<int> calculateCurrentStreak() async {
+    final index = await loadHistoryIndex();
+    return index.currentStreak(DateTime.now());
   }
 
   // ==================== Achievements ====================
 
   /// Save achievement unlock status to storage.
-  Future<void> saveAchievement(Achievement achievement) async {
-    final achievements = await loadAchievements();
-    achievements[achievement.id] = achievement.toJson();
-
-    final json = jsonEncode(achievements);
-    await _prefs.setString(_keyAchievements, json);
+  Future<void> saveAchievement(Achievement achievement) =>
+      saveAchievements([achievement]);
+
+  /// Save several achievements with a single write.
+  ///
+  /// Writes are serialized, so concurrent saves each merge into the map left
+  /// by the previous one instead of overwriting each other's achievements.
+  Future<void> saveAchievements(Iterable<Achievement> achievements) {
+    // Snapshot now, the achievements may change before the write runs
+    final updates = {for (final a in achievements) a.id: a.toJson()};
+    if (updates.isEmpty) return Future.value();
+
+    final result = _achievementWrites.then((_) async {
+      final stored = await loadAchievements();
+      stored.addAll(updates);
+      await _prefs.setString(_keyAchievements, jsonEncode(stored));
+    });
+    _achievementWrites = result.then((_) {}, onError: (_) {});
+    return result;
   }
 
   /// Load all achievements from storage.
@@ -205,31 +383,16 @@ class StorageService {
   // ==================== User Stats ====================
 
   /// Get aggregate user statistics from all daily records.
+  ///
+  /// Served from the [HistoryIndex] totals, without decoding the records.
   Future<Map<String, dynamic>> getUserStats() async {
-    final records = await loadDailyRecords();
-
-    int totalPushupsAllTime = 0;
-    int maxPushupsInOneDay = 0;
-    int daysCompleted = 0;
-
-    for (final entry in records.entries) {
-      final recordData = entry.value as Map<String, dynamic>;
-      final record = DailyRecord.fromJson(recordData);
-
-      totalPushupsAllTime += record.totalPushups;
-      if (record.totalPushups > maxPushupsInOneDay) {
-        maxPushupsInOneDay = record.totalPushups;
-      }
-      if (record.goalReached) {
-        daysCompleted++;
-      }
-    }
+    final index = await loadHistoryIndex();
 
     return {
-      'totalPushupsAllTime': totalPushupsAllTime,
-      'maxPushupsInOneDay': maxPushupsInOneDay,
-      'daysCompleted': daysCompleted,
-      'currentStreak': await calculateCurrentStreak(),
+      'totalPushupsAllTime': index.totalPushups,
+      'maxPushupsInOneDay': index.maxPushupsInOneDay,
+      'daysCompleted': index.goalReachedDays,
+      'currentStreak': index.currentStreak(DateTime.now()),
       'maxRepsInOneSeries': 0, // TODO: Track this separately
     };
   }
@@ -244,10 +407,21 @@ class StorageService {
   /// Clear all data from storage (for testing or reset).
   Future<void> clearAllData() async {
     await _prefs.remove(_keyActiveSession);
-    await _prefs.remove(_keyDailyRecords);
+    await _clearHistory();
     await _prefs.remove(_keyAchievements);
   }
 
+  /// Remove every daily record, legacy or segmented, and the index.
+  Future<void> _clearHistory() async {
+    await _prefs.remove(_keyDailyRecords);
+    await _prefs.remove(_keyHistoryIndex);
+    await _prefs.setInt(_keyHistoryRevision, _historyRevision + 1);
+    await _history.clear();
+    _historyIndex = null;
+    _historyIndexSnapshotRevision = null;
+    _historyIndexTail.clear();
+  }
+
   /// Reset all user data from storage.
   ///
   /// Removes ALL user data including:
@@ -260,7 +434,7 @@ class StorageService {
   /// Use with caution - this cannot be undone!
   Future<void> resetAllUserData() async {
     await _prefs.remove(_keyActiveSession);
-    await _prefs.remove(_keyDailyRecords);
+    await _clearHistory();
     await _prefs.remove(_keyAchievements);
     await _prefs.remove(_keyWorkoutPreferences);
     await _prefs.remove(_keyProgramStartDate);
@@ -561,54 +735,8 @@ class StorageService {
   /// Any push-ups (> 0) in the week preserves the streak.
   /// A full week with 0 push-ups breaks the streak.
   Future<int> calculateWeeklyStreak() async {
-    final records = await loadDailyRecords();
-    int streak = 0;
-
-    // Start with current week
-    DateTime weekStart = getWeekStart(DateTime.now());
-    final today = DateTime.now();
-
-    // Check up to 52 weeks back
-    for (int i = 0; i < 52; i++) {
-      bool weekHasActivity = false;
-      bool weekHasAnyRecord = false;
-
-      // Check all 7 days of the week (Mon-Sun)
-      for (int dayOffset = 0; dayOffset < 7; dayOffset++) {
-        final dayDate = weekStart.add(Duration(days: dayOffset));
-        final dateKey = _formatDate(dayDate);
-
-        // Skip checking future days in current week
-        if (dayDate.isAfter(DateTime(today.year, today.month, today.day))) {
-          continue;
-        }
-
-        if (records.containsKey(dateKey)) {
-          weekHasAnyRecord = true;
-          final recordData = records[dateKey] as Map<String, dynamic>;
-          final totalPushups = recordData['totalPushups'] as int;
-          if (totalPushups > 0) {
-            weekHasActivity = true;
-          }
-        }
-      }
-
-      // If current week has no records yet, don't break streak (week not complete)
-      if (i == 0 && !weekHasAnyRecord) {
-        weekStart = weekStart.subtract(const Duration(days: 7));
-        continue;
-      }
-
-      if (weekHasActivity) {
-        streak++;
-        weekStart = weekStart.subtract(const Duration(days: 7));
-      } else {
-        // Week with no activity breaks the streak
-        break;
-      }
-    }
-
-    return streak;
+    final index = await loadHistoryIndex();
+    return index.weeklyStreak(DateTime.now());
   }
 
   // ==================== Streak Freeze ====================
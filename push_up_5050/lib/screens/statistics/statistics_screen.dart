@@ -51,6 +51,9 @@ class _StatisticsScreenState extends State<StatisticsScreen> {
   /// Timer to clear the popup after auto-dismiss animation.
   Timer? _popupClearTimer;
 
+  /// First day of the month shown by the calendar.
+  DateTime _calendarMonth = DateTime(DateTime.now().year, DateTime.now().month);
+
   @override
   void initState() {
     super.initState();
@@ -228,18 +231,37 @@ class _StatisticsScreenState extends State<StatisticsScreen> {
         const SizedBox(height: 24),
 
         // Monthly Calendar
-        MonthlyCalendar(
-          month: DateTime.now(),
-          completedDays: stats.monthlyCompletedDays,
-          missedDays: stats.monthlyMissedDays,
-          blockedDays: stats.monthlyBlockedDays,
-        ),
+        _buildMonthlyCalendar(stats),
 
         const SizedBox(height: 32),
       ],
     );
   }
 
+  /// Monthly calendar paged between the first record's month and today's.
+  ///
+  /// Month models are built on demand and cached by the provider.
+  Widget _buildMonthlyCalendar(UserStatsProvider stats) {
+    final now = DateTime.now();
+    final firstRecord = stats.firstRecordDate;
+    final canGoBack = firstRecord != null &&
+        _calendarMonth.isAfter(DateTime(firstRecord.year, firstRecord.month));
+    final canGoForward = _calendarMonth.isBefore(DateTime(now.year, now.month));
+
+    return MonthlyCalendar(
+      model: stats.monthCalendar(_calendarMonth),
+      onPreviousMonth: canGoBack ? () => _pageCalendar(-1) : null,
+      onNextMonth: canGoForward ? () => _pageCalendar(1) : null,
+    );
+  }
+
+  void _pageCalendar(int months) {
+    setState(() {
+      _calendarMonth =
+          DateTime(_calendarMonth.year, _calendarMonth.month + months);
+    });
+  }
+
   /// Calculate daily average from total and days completed.
   /// TODO: Implement proper daily average calculation.
   int _calculateDailyAvg(UserStatsProvider stats) {
@@ -8,11 +8,13 @@ import 'package:push_up_5050/core/constants/app_sizes.dart';
 import 'package:push_up_5050/core/theme/app_theme.dart';
 import 'package:push_up_5050/core/utils/calculator.dart';
 import 'package:push_up_5050/l10n/app_localizations.dart';
+import 'package:push_up_5050/models/achievement.dart';
 import 'package:push_up_5050/models/haptic_intensity.dart';
 import 'package:push_up_5050/providers/achievements_provider.dart';
 import 'package:push_up_5050/providers/active_workout_provider.dart';
 import 'package:push_up_5050/providers/user_stats_provider.dart';
 import 'package:push_up_5050/screens/workout_summary/workout_summary_screen.dart';
+import 'package:push_up_5050/services/achievement_engine.dart';
 import 'package:push_up_5050/services/app_settings_service.dart';
 import 'package:push_up_5050/services/audio_service.dart';
 import 'package:push_up_5050/services/haptic_feedback_service.dart';
@@ -42,19 +44,38 @@ class WorkoutExecutionScreen extends StatefulWidget {
   State<WorkoutExecutionScreen> createState() => _WorkoutExecutionScreenState();
 }
 
-class _WorkoutExecutionScreenState extends State<WorkoutExecutionScreen> {
+class _WorkoutExecutionScreenState extends State<WorkoutExecutionScreen>
+    with WidgetsBindingObserver {
   Timer? _recoveryTimer;
   bool _showCelebration = false;
   bool _isCompleting = false;
 
   AppLocalizations get _l10n => AppLocalizations.of(context)!;
 
+  @override
+  void initState() {
+    super.initState();
+    WidgetsBinding.instance.addObserver(this);
+  }
+
   @override
   void dispose() {
+    WidgetsBinding.instance.removeObserver(this);
     _recoveryTimer?.cancel();
     super.dispose();
   }
 
+  @override
+  void didChangeAppLifecycleState(AppLifecycleState state) {
+    if (state == AppLifecycleState.paused ||
+        state == AppLifecycleState.detached) {
+      // Persist pending reps before the process may be killed
+      context.read<ActiveWorkoutProvider>().flushSession().catchError((Object e) {
+        debugPrint('WorkoutExecutionScreen: failed to flush session: $e');
+      });
+    }
+  }
+
   void _startRecoveryTimer(ActiveWorkoutProvider provider, BuildContext context) {
     _recoveryTimer?.cancel();
     _recoveryTimer = Timer.periodic(const Duration(seconds: 1), (timer) {
@@ -205,19 +226,27 @@ class _WorkoutExecutionScreenState extends State<WorkoutExecutionScreen> {
     // Estimate total points from history (simplified: ~2 points per pushup on average)
     final estimatedTotalPoints = ((userStats.totalPushupsAllTime + totalReps) * 2).floor();
 
-    final statsMap = {
-      'totalPushups': userStats.todayPushups + totalReps,
-      'totalPushupsAllTime': userStats.totalPushupsAllTime + totalReps,
-      'currentStreak': updatedStreak,
-      'maxRepsInOneSeries': seriesCompleted > 0 ? seriesCompleted : 0,
-      'maxPushupsInOneDay': userStats.todayPushups + totalReps,
-      'daysCompleted': userStats.daysCompleted,
+    final newlyUnlocked = achievementsProvider.recordEvent(AchievementEvent([
+      StatChange(AchievementStat.totalPushups, userStats.todayPushups + totalReps),
+      StatChange(
+        AchievementStat.totalPushupsAllTime,
+        userStats.totalPushupsAllTime + totalReps,
+      ),
+      StatChange(AchievementStat.currentStreak, updatedStreak),
+      StatChange(
+        AchievementStat.maxRepsInOneSeries,
+        seriesCompleted > 0 ? seriesCompleted : 0,
+      ),
+      StatChange(
+        AchievementStat.maxPushupsInOneDay,
+        userStats.todayPushups + totalReps,
+      ),
+      StatChange(AchievementStat.daysCompleted, userStats.daysCompleted),
       // New data for new achievements
-      'monthlyPushups': monthlyPushups,
-      'maxConsecutiveSeries': seriesCompleted,
-      'totalPoints': estimatedTotalPoints + pointsEarned,
-    };
-    final newlyUnlocked = achievementsProvider.checkUnlocks(statsMap);
+      StatChange(AchievementStat.monthlyPushups, monthlyPushups),
+      StatChange(AchievementStat.maxConsecutiveSeries, seriesCompleted),
+      StatChange(AchievementStat.totalPoints, estimatedTotalPoints + pointsEarned),
+    ]));
 
     // Calculate achievement points from newly unlocked achievements
     final achievementPoints = newlyUnlocked.fold<int>(
@@ -0,0 +1,118 @@
+import 'package:push_up_5050/models/achievement.dart';
+
+/// New value of one achievement stat.
+class StatChange {
+  final AchievementStat stat;
+  final int value;
+
+  const StatChange(this.stat, this.value);
+
+  @override
+  String toString() => 'StatChange(${stat.key}: $value)';
+}
+
+/// Stats that changed together.
+///
+/// Everything one event unlocks is reported, and persisted, together.
+class AchievementEvent {
+  final List<StatChange> changes;
+
+  const AchievementEvent(this.changes);
+
+  /// Event from a legacy stats map; unknown and missing keys are ignored.
+  factory AchievementEvent.fromStats(Map<String, dynamic> stats) {
+    return AchievementEvent([
+      for (final stat in AchievementStat.values)
+        if (stats[stat.key] case final num value) StatChange(stat, value.toInt()),
+    ]);
+  }
+}
+
+/// Evaluates achievements against stat-change events.
+///
+/// Threshold achievements are indexed by [Achievement.stat] into ladders
+/// sorted by threshold, each with a cursor on its next locked rung. An
+/// event only compares each changed stat against that rung and moves the
+/// cursor past what it unlocks, so evaluating a rep costs a handful of
+/// comparisons no matter how large the catalog is.
+///
+/// Achievements with a custom condition are only evaluated by [applyStats].
+/// Achievements unlocked elsewhere (loaded from storage, unlocked by ID) are
+/// skipped when their ladder reaches them.
+class AchievementEngine {
+  final Map<AchievementStat, _ThresholdLadder> _ladders = {};
+  final List<Achievement> _conditional = [];
+  final Map<Achievement, int> _catalogOrder = Map.identity();
+
+  AchievementEngine(Iterable<Achievement> achievements) {
+    final byStat = <AchievementStat, List<Achievement>>{};
+    for (final achievement in achievements) {
+      _catalogOrder[achievement] = _catalogOrder.length;
+      final stat = achievement.stat;
+      if (stat == null) {
+        if (achievement.condition != null) _conditional.add(achievement);
+      } else {
+        (byStat[stat] ??= []).add(achievement);
+      }
+    }
+
+    for (final entry in byStat.entries) {
+      // Catalog order between equal thresholds
+      final sorted = entry.value
+        ..sort((a, b) {
+          final byThreshold = a.threshold!.compareTo(b.threshold!);
+          return byThreshold != 0
+              ? byThreshold
+              : _catalogOrder[a]!.compareTo(_catalogOrder[b]!);
+        });
+      _ladders[entry.key] = _ThresholdLadder(sorted);
+    }
+  }
+
+  /// Unlock what [event] reaches; returns the new unlocks in catalog order.
+  List<Achievement> apply(AchievementEvent event) {
+    final unlocked = <Achievement>[];
+    for (final change in event.changes) {
+      _ladders[change.stat]?.advance(change.value, unlocked);
+    }
+    return _sorted(unlocked);
+  }
+
+  /// [apply] for a legacy stats map, also evaluating custom conditions.
+  List<Achievement> applyStats(Map<String, dynamic> stats) {
+    final unlocked = apply(AchievementEvent.fromStats(stats));
+    for (final achievement in _conditional) {
+      if (achievement.checkUnlock(stats)) unlocked.add(achievement);
+    }
+    return _sorted(unlocked);
+  }
+
+  List<Achievement> _sorted(List<Achievement> unlocked) {
+    if (unlocked.length > 1) {
+      unlocked.sort((a, b) => _catalogOrder[a]!.compareTo(_catalogOrder[b]!));
+    }
+    return unlocked;
+  }
+}
+
+/// Achievements of one stat, sorted by threshold.
+class _ThresholdLadder {
+  final List<Achievement> _rungs;
+
+  /// Every rung before the cursor is unlocked.
+  int _cursor = 0;
+
+  _ThresholdLadder(this._rungs);
+
+  void advance(int value, List<Achievement> unlocked) {
+    while (_cursor < _rungs.length) {
+      final rung = _rungs[_cursor];
+      if (!rung.isUnlocked) {
+        if (value < rung.threshold!) return;
+        rung.unlock();
+        unlocked.add(rung);
+      }
+      _cursor++;
+    }
+  }
+}
@@ -0,0 +1,364 @@
+import 'package:flutter_local_notifications/flutter_local_notifications.dart';
+import 'package:push_up_5050/l10n/app_localizations.dart';
+import 'package:push_up_5050/repositories/history_index.dart';
+import 'package:push_up_5050/services/notification_service.dart';
+
+/// How a planned notification repeats once delivered.
+enum NotificationRepeat {
+  /// Fires once at [PlannedNotification.scheduledAt].
+  none,
+
+  /// Fires every day at the time of [PlannedNotification.scheduledAt].
+  daily,
+
+  /// Like [daily], but the first delivery is on the date of
+  /// [PlannedNotification.scheduledAt], so moving that date reschedules it.
+  dailyFromDate,
+
+  /// Fires every week on the weekday and time of [PlannedNotification.scheduledAt].
+  weekly,
+}
+
+/// One notification the app wants to have scheduled.
+///
+/// The payload carries the notification type (used for deep links) plus a
+/// key describing when it fires, so a pending request can be compared with
+/// the plan without the plugin having to report schedule times.
+class PlannedNotification {
+  final int id;
+
+  /// Notification type, e.g. `streak_at_risk`.
+  final String type;
+
+  /// Local wall-clock time of the (first) delivery.
+  final DateTime scheduledAt;
+  final NotificationRepeat repeat;
+
+  final String title;
+  final String body;
+  final String channelId;
+  final String channelName;
+  final String channelDescription;
+  final bool highImportance;
+
+  const PlannedNotification({
+    required this.id,
+    required this.type,
+    required this.scheduledAt,
+    this.repeat = NotificationRepeat.none,
+    required this.title,
+    required this.body,
+    required this.channelId,
+    required this.channelName,
+    required this.channelDescription,
+    this.highImportance = true,
+  });
+
+  /// Daily reminder at [hour]:[minute] chosen by the user in settings.
+  factory PlannedNotification.dailyReminder({
+    required int hour,
+    required int minute,
+    required DateTime now,
+  }) {
+    var at = DateTime(now.year, now.month, now.day, hour, minute);
+    if (!at.isAfter(now)) at = DateTime(now.year, now.month, now.day + 1, hour, minute);
+    return PlannedNotification(
+      id: NotificationIds.dailyReminder,
+      type: 'daily_reminder',
+      scheduledAt: at,
+      repeat: NotificationRepeat.daily,
+      title: 'Non perdere la tua serie!',
+      body: 'Completa i tuoi push-up oggi per mantenere il moltiplicatore.',
+      channelId: 'daily_reminder_channel',
+      channelName: 'Promemoria Giornaliero',
+      channelDescription: 'Promemoria per completare i push-up giornalieri',
+    );
+  }
+
+  /// Payload stored with the notification: `type@schedule`.
+  String get payload => '$type@$scheduleKey';
+
+  /// When the notification fires, at the granularity [repeat] cares about.
+  String get scheduleKey {
+    final time = '${_two(scheduledAt.hour)}:${_two(scheduledAt.minute)}';
+    switch (repeat) {
+      case NotificationRepeat.none:
+        return '${scheduledAt.year}-${_two(scheduledAt.month)}-${_two(scheduledAt.day)}T$time';
+      case NotificationRepeat.daily:
+        return time;
+      case NotificationRepeat.dailyFromDate:
+        return '${scheduledAt.year}-${_two(scheduledAt.month)}-${_two(scheduledAt.day)}T$time/daily';
+      case NotificationRepeat.weekly:
+        return 'w${scheduledAt.weekday}-$time';
+    }
+  }
+
+  /// Whether [pending] is already this notification.
+  bool matches(PendingNotificationRequest pending) =>
+      pending.id == id &&
+      pending.payload == payload &&
+      pending.title == title &&
+      pending.body == body;
+
+  /// Notification type of a payload written by [payload], or the payload
+  /// itself for notifications scheduled before the planner existed.
+  static String? typeOfPayload(String? payload) => payload?.split('@').first;
+
+  static String _two(int value) => value.toString().padLeft(2, '0');
+
+  @override
+  String toString() => 'PlannedNotification($id, $payload)';
+}
+
+/// Minimal operations turning the pending notifications into the plan.
+class NotificationPlanDiff {
+  /// Pending planner-managed IDs that are no longer wanted.
+  final List<int> toCancel;
+
+  /// Missing or outdated notifications; scheduling an existing ID replaces it.
+  final List<PlannedNotification> toSchedule;
+
+  /// Planned notifications already pending as planned.
+  final int unchanged;
+
+  const NotificationPlanDiff({
+    required this.toCancel,
+    required this.toSchedule,
+    required this.unchanged,
+  });
+
+  bool get isEmpty => toCancel.isEmpty && toSchedule.isEmpty;
+
+  /// Diff [desired] against [pending].
+  ///
+  /// Pending requests with IDs the planner does not manage (e.g. debug test
+  /// notifications) are left alone.
+  factory NotificationPlanDiff.between(
+    List<PlannedNotification> desired,
+    List<PendingNotificationRequest> pending,
+  ) {
+    final pendingById = {
+      for (final request in pending)
+        if (NotificationIds.isPlanned(request.id)) request.id: request,
+    };
+
+    final toSchedule = <PlannedNotification>[];
+    var unchanged = 0;
+    for (final notification in desired) {
+      final current = pendingById.remove(notification.id);
+      if (current != null && notification.matches(current)) {
+        unchanged++;
+      } else {
+        toSchedule.add(notification);
+      }
+    }
+
+    return NotificationPlanDiff(
+      toCancel: pendingById.keys.toList(),
+      toSchedule: toSchedule,
+      unchanged: unchanged,
+    );
+  }
+
+  @override
+  String toString() => 'NotificationPlanDiff(cancel: $toCancel, '
+      'schedule: ${toSchedule.map((n) => n.id).toList()}, unchanged: $unchanged)';
+}
+
+/// Localized strings used by [NotificationPlanner].
+class NotificationPlanTexts {
+  final String streakTitle;
+  final String streakBodyDay3;
+  final String Function(int missedDays) streakBody;
+  final String streakChannel;
+  final String streakChannelDescription;
+  final String progressTitle;
+  final String progressBody;
+  final String progressChannel;
+  final String progressChannelDescription;
+  final String challengeTitle;
+  final String challengeBody;
+  final String challengeChannel;
+  final String challengeChannelDescription;
+
+  const NotificationPlanTexts({
+    required this.streakTitle,
+    required this.streakBodyDay3,
+    required this.streakBody,
+    required this.streakChannel,
+    required this.streakChannelDescription,
+    required this.progressTitle,
+    required this.progressBody,
+    required this.progressChannel,
+    required this.progressChannelDescription,
+    required this.challengeTitle,
+    required this.challengeBody,
+    required this.challengeChannel,
+    required this.challengeChannelDescription,
+  });
+
+  factory NotificationPlanTexts.fromLocalizations(AppLocalizations loc) {
+    return NotificationPlanTexts(
+      streakTitle: loc.notificationStreakAtRiskTitle,
+      streakBodyDay3: loc.notificationStreakAtRiskBodyDay3,
+      streakBody: loc.notificationStreakAtRiskBodyDay4,
+      streakChannel: loc.notificationStreakChannel,
+      streakChannelDescription: loc.notificationStreakChannelDesc,
+      progressTitle: loc.notificationProgressTitle,
+      progressBody: loc.notificationProgressBody,
+      progressChannel: loc.notificationProgressChannel,
+      progressChannelDescription: loc.notificationProgressChannelDesc,
+      challengeTitle: loc.notificationChallengeTitle,
+      challengeBody: loc.notificationChallengeBody,
+      challengeChannel: loc.notificationChallengeChannel,
+      challengeChannelDescription: loc.notificationChallengeChannelDesc,
+    );
+  }
+}
+
+/// Computes the notifications that should be pending for the next days.
+///
+/// Pure function of its inputs, evaluated in one pass over the history
+/// index; [NotificationService.reconcile] applies the result.
+///
+/// - Daily reminder: repeating, at the time set by the user (if enabled).
+/// - Streak at risk: one per day in the horizon on which, assuming no
+///   workout happens before then, 2+ consecutive days will have been
+///   missed; the message reflects that day's count. Past the horizon, a
+///   daily repeating warning keeps reaching users who stop opening the app
+///   (and so stop replanning).
+/// - Progress: today only, when today's push-ups are in the progress zone
+///   (at least half the goal, at most goal - 5).
+/// - Weekly challenge: repeating, Sunday at 8:00.
+///
+/// Streak and progress fire at the personalized time from
+/// [WorkoutTimeAnalyzer]. Planning again after a workout drops the warnings
+/// that no longer apply.
+class NotificationPlanner {
+  /// Days ahead covered by one-shot notifications.
+  static const int defaultHorizonDays = 7;
+
+  /// Consecutive missed days before the streak warning is sent.
+  static const int streakAtRiskMissedDays = 2;
+
+  /// How far back to look for the last workout.
+  static const int _missedDaysLookBack = 30;
+
+  static const int _challengeHour = 8;
+
+  final NotificationPlanTexts texts;
+  final int horizonDays;
+
+  const NotificationPlanner({
+    required this.texts,
+    this.horizonDays = defaultHorizonDays,
+  });
+
+  /// Notifications that should be pending at [now].
+  ///
+  /// [dailyReminderTime] is null when the daily reminder is disabled.
+  List<PlannedNotification> plan({
+    required DateTime now,
+    required HistoryIndex history,
+    required int dailyGoal,
+    required (int hour, int minute) personalizedTime,
+    (int hour, int minute)? dailyReminderTime,
+  }) {
+    final today = DateTime(now.year, now.month, now.day);
+    final (hour, minute) = personalizedTime;
+    final todayPushups = history.pushupsOn(today);
+    final planned = <PlannedNotification>[];
+
+    if (dailyReminderTime != null) {
+      planned.add(PlannedNotification.dailyReminder(
+        hour: dailyReminderTime.$1,
+        minute: dailyReminderTime.$2,
+        now: now,
+      ));
+    }
+
+    // Days missed before today, counting back from yesterday
+    var missedBeforeToday = 0;
+    while (missedBeforeToday < _missedDaysLookBack &&
+        history.pushupsOn(DateTime(today.year, today.month,
+                today.day - missedBeforeToday - 1)) <=
+            0) {
+      missedBeforeToday++;
+    }
+
+    for (var offset = 0; offset < horizonDays; offset++) {
+      final at = DateTime(today.year, today.month, today.day + offset, hour, minute);
+      if (!at.isAfter(now)) continue;
+
+      final missedDays = todayPushups > 0
+          ? offset - 1
+          : missedBeforeToday + offset;
+      if (missedDays < streakAtRiskMissedDays) continue;
+
+      planned.add(PlannedNotification(
+        id: NotificationIds.forDay(NotificationIds.streakAtRisk, at),
+        type: 'streak_at_risk',
+        scheduledAt: at,
+        title: texts.streakTitle,
+        body: missedDays == 3 ? texts.streakBodyDay3 : texts.streakBody(missedDays),
+        channelId: NotificationChannels.streak,
+        channelName: texts.streakChannel,
+        channelDescription: texts.streakChannelDescription,
+      ));
+    }
+
+    // Any plan is at risk by the end of the horizon unless the app is opened
+    // again, which replans and moves this further out. The day count would
+    // go stale on a repeat, so the generic message is used.
+    planned.add(PlannedNotification(
+      id: NotificationIds.streakAtRisk,
+      type: 'streak_at_risk',
+      scheduledAt: DateTime(today.year, today.month, today.day + horizonDays, hour, minute),
+      repeat: NotificationRepeat.dailyFromDate,
+      title: texts.streakTitle,
+      body: texts.streakBodyDay3,
+      channelId: NotificationChannels.streak,
+      channelName: texts.streakChannel,
+      channelDescription: texts.streakChannelDescription,
+    ));
+
+    final progressAt = DateTime(today.year, today.month, today.day, hour, minute);
+    final halfGoal = (dailyGoal * 0.5).floor();
+    final nearGoal = dailyGoal - 5;
+    if (progressAt.isAfter(now) &&
+        todayPushups >= halfGoal &&
+        todayPushups <= nearGoal) {
+      planned.add(PlannedNotification(
+        id: NotificationIds.forDay(NotificationIds.progressEncouragement, progressAt),
+        type: 'progress',
+        scheduledAt: progressAt,
+        title: texts.progressTitle,
+        body: texts.progressBody,
+        channelId: NotificationChannels.progress,
+        channelName: texts.progressChannel,
+        channelDescription: texts.progressChannelDescription,
+        highImportance: false,
+      ));
+    }
+
+    var challengeAt = DateTime(today.year, today.month,
+        today.day + (DateTime.sunday - today.weekday), _challengeHour);
+    if (!challengeAt.isAfter(now)) {
+      challengeAt = DateTime(challengeAt.year, challengeAt.month,
+          challengeAt.day + 7, _challengeHour);
+    }
+    planned.add(PlannedNotification(
+      id: NotificationIds.weeklyChallenge,
+      type: 'weekly_challenge',
+      scheduledAt: challengeAt,
+      repeat: NotificationRepeat.weekly,
+      title: texts.challengeTitle,
+      body: texts.challengeBody,
+      channelId: NotificationChannels.challenge,
+      channelName: texts.challengeChannel,
+      channelDescription: texts.challengeChannelDescription,
+    ));
+
+    return planned;
+  }
+}
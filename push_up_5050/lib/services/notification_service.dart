@@ -7,6 +7,7 @@ import 'package:timezone/timezone.dart' as tz;
 import 'package:timezone/data/latest.dart' as tz_data;
 import 'package:android_intent_plus/android_intent.dart';
 import 'package:push_up_5050/l10n/app_localizations.dart';
+import 'package:push_up_5050/services/notification_planner.dart';
 
 /// Callback type for notification tap events.
 ///
@@ -19,6 +20,22 @@ class NotificationIds {
   static const int streakAtRisk = 1;         // NEW - Streak at risk warning
   static const int progressEncouragement = 2; // NEW - Progress encouragement
   static const int weeklyChallenge = 3;      // NEW - Sunday challenge announcement
+
+  /// ID of a one-shot notification of [type] for the day of [date].
+  ///
+  /// Stable for a given day, distinct for the days of any planning horizon
+  /// shorter than 1000 days.
+  static int forDay(int type, DateTime date) {
+    final day = DateTime.utc(date.year, date.month, date.day)
+            .millisecondsSinceEpoch ~/
+        Duration.millisecondsPerDay;
+    return type * 1000 + day % 1000;
+  }
+
+  /// Whether [id] belongs to a notification managed by [NotificationPlanner].
+  static bool isPlanned(int id) =>
+      (id >= dailyReminder && id <= weeklyChallenge) ||
+      (id >= streakAtRisk * 1000 && id < (progressEncouragement + 1) * 1000);
 }
 
 /// Notification channel IDs for Android system settings.
@@ -41,6 +58,7 @@ class NotificationChannels {
 class NotificationService {
   final FlutterLocalNotificationsPlugin _plugin;
   bool _initialized = false;
+  Future<bool>? _initializing;
   NotificationTapCallback? _onNotificationTapCallback;
   bool? _cachedPermissionStatus;
   bool? _cachedExactAlarmPermission;
@@ -48,7 +66,9 @@ class NotificationService {
   // Method channel for checking exact alarm permission on Android
   static const _alarmChannel = MethodChannel('com.pushup5050.push_up_5050/alarm');
 
-  NotificationService() : _plugin = FlutterLocalNotificationsPlugin();
+  /// [plugin] can be injected for tests.
+  NotificationService({FlutterLocalNotificationsPlugin? plugin})
+      : _plugin = plugin ?? FlutterLocalNotificationsPlugin();
 
   /// Whether the service has been initialized.
   bool get isInitialized => _initialized;
@@ -56,9 +76,15 @@ class NotificationService {
   /// Initialize the notification service.
   ///
   /// Returns true if initialization successful.
+  /// Safe to call concurrently (deferred startup and lazy use by callers
+  /// share one initialization).
   Future<bool> initialize() async {
     if (_initialized) return true;
+    return _initializing ??=
+        _initializePlugin().whenComplete(() => _initializing = null);
+  }
 
+  Future<bool> _initializePlugin() async {
     // Initialize timezone database
     tz_data.initializeTimeZones();
 
@@ -259,55 +285,24 @@ class NotificationService {
       debugPrint('NotificationService: SCHEDULE_EXACT_ALARM permission confirmed');
     }
 
-    // Cancel any existing daily reminder
-    await cancelDailyReminder();
-
-    final scheduledTime = _nextInstanceOfTime(hour, minute);
-    final now = tz.TZDateTime.now(tz.local);
+    // Scheduling with the same ID replaces any existing daily reminder
+    final reminder = PlannedNotification.dailyReminder(
+      hour: hour,
+      minute: minute,
+      now: DateTime.now(),
+    );
 
     debugPrint('NotificationService: Scheduling daily reminder at $hour:$minute');
-    debugPrint('NotificationService: Current time: ${now.toLocal()}');
-    debugPrint('NotificationService: Scheduled time: ${scheduledTime.toLocal()}');
+    debugPrint('NotificationService: Scheduled time: ${reminder.scheduledAt}');
     debugPrint('NotificationService: Timezone: ${tz.local.name}');
 
-    const androidDetails = AndroidNotificationDetails(
-      'daily_reminder_channel',
-      'Promemoria Giornaliero',
-      channelDescription: 'Promemoria per completare i push-up giornalieri',
-      importance: Importance.high,
-      priority: Priority.high,
-    );
-
-    const iosDetails = DarwinNotificationDetails(
-      presentAlert: true,
-      presentBadge: true,
-      presentSound: true,
-    );
-
-    const platformDetails = NotificationDetails(
-      android: androidDetails,
-      iOS: iosDetails,
-    );
-
-    try {
-      await _plugin.zonedSchedule(
-        scheduledDate: scheduledTime,
-        notificationDetails: platformDetails,
-        androidScheduleMode: AndroidScheduleMode.exactAllowWhileIdle,
-        id: NotificationIds.dailyReminder,
-        title: 'Non perdere la tua serie!',
-        body: 'Completa i tuoi push-up oggi per mantenere il moltiplicatore.',
-        matchDateTimeComponents: DateTimeComponents.time,
-      );
+    final scheduled = await _schedule(reminder, exact: true);
+    if (scheduled) {
       debugPrint('NotificationService: Reminder scheduled successfully');
       // Verify by checking pending notifications
       await getPendingNotifications();
-      return true;
-    } catch (e) {
-      debugPrint('NotificationService: Failed to schedule notification: $e');
-      debugPrint('NotificationService: Error type: ${e.runtimeType}');
-      return false;
     }
+    return scheduled;
   }
 
   /// Schedule daily reminder with permission guidance.
@@ -492,197 +487,103 @@ class NotificationService {
     _onNotificationTapCallback = callback;
   }
 
-  /// Schedule streak at risk notification.
+  /// Bring the pending notifications in line with [desired].
   ///
-  /// Sends daily reminder if user hasn't worked out in 2+ days.
-  /// Uses [hour] and [minute] for personalized scheduling time.
-  /// Message varies by day count (motivational on day 3, urgent on day 4+).
-  /// All strings are localized by caller via AppLocalizations.
+  /// Queries the pending requests once, then issues only the cancels and
+  /// schedules needed (see [NotificationPlanDiff]), concurrently. Nothing
+  /// already pending as planned is touched, so calling this on every resume
+  /// causes no alarm churn.
   ///
-  /// Returns true if scheduled successfully.
-  Future<bool> scheduleStreakAtRiskNotification({
-    required String title,
-    required String body,
-    required String channelName,
-    required String channelDescription,
-    required int hour,
-    required int minute,
-  }) async {
+  /// Returns the applied diff, or null if the pending requests could not be
+  /// read.
+  Future<NotificationPlanDiff?> reconcile(List<PlannedNotification> desired) async {
     if (!_initialized) {
       await initialize();
     }
 
-    final hasPermission = await requestPermissions();
-    if (!hasPermission) {
-      debugPrint('NotificationService: POST_NOTIFICATIONS permission not granted');
-      return false;
-    }
-
-    // Cancel existing streak notification
-    await cancel(NotificationIds.streakAtRisk);
-
-    final scheduledTime = _nextInstanceOfTime(hour, minute);
-
-    final androidDetails = AndroidNotificationDetails(
-      NotificationChannels.streak,
-      channelName,
-      channelDescription: channelDescription,
-      importance: Importance.high,
-      priority: Priority.high,
-    );
-
-    final platformDetails = NotificationDetails(
-      android: androidDetails,
-    );
-
+    final List<PendingNotificationRequest> pending;
     try {
-      await _plugin.zonedSchedule(
-        scheduledDate: scheduledTime,
-        notificationDetails: platformDetails,
-        androidScheduleMode: AndroidScheduleMode.exactAllowWhileIdle,
-        id: NotificationIds.streakAtRisk,
-        title: title,
-        body: body,
-        payload: 'streak_at_risk',
-        matchDateTimeComponents: DateTimeComponents.time,
-      );
-      debugPrint('NotificationService: Streak at risk notification scheduled for $hour:$minute');
-      return true;
+      pending = await _plugin.pendingNotificationRequests();
     } catch (e) {
-      debugPrint('NotificationService: Failed to schedule streak at risk: $e');
-      return false;
-    }
-  }
-
-  /// Schedule progress encouragement notification.
-  ///
-  /// Sends notification when user is within 5 push-ups of daily goal
-  /// AND has completed at least 50% of goal.
-  /// Only fires once per day at the scheduled time.
-  /// All strings are localized by caller via AppLocalizations.
-  ///
-  /// Returns true if scheduled successfully.
-  Future<bool> scheduleProgressNotification({
-    required String title,
-    required String body,
-    required String channelName,
-    required String channelDescription,
-    required int hour,
-    required int minute,
-  }) async {
-    if (!_initialized) {
-      await initialize();
-    }
-
-    final hasPermission = await requestPermissions();
-    if (!hasPermission) {
-      debugPrint('NotificationService: POST_NOTIFICATIONS permission not granted');
-      return false;
+      debugPrint('NotificationService: Error reading pending notifications: $e');
+      return null;
+    }
+
+    final diff = NotificationPlanDiff.between(desired, pending);
+    if (diff.isEmpty) return diff;
+
+    var toSchedule = diff.toSchedule;
+    var exact = true;
+    if (toSchedule.isNotEmpty) {
+      if (!await requestPermissions()) {
+        debugPrint('NotificationService: POST_NOTIFICATIONS permission not granted');
+        toSchedule = const [];
+      } else {
+        // Fall back to inexact alarms rather than failing (Android 12+)
+        exact = await checkExactAlarmPermission();
+      }
     }
 
-    // Cancel existing progress notification
-    await cancel(NotificationIds.progressEncouragement);
+    await Future.wait([
+      for (final id in diff.toCancel) cancel(id),
+      for (final notification in toSchedule) _schedule(notification, exact: exact),
+    ]);
+    debugPrint('NotificationService: Reconciled notifications: $diff');
+    return diff;
+  }
 
-    final scheduledTime = _nextInstanceOfTime(hour, minute);
+  /// Schedule [notification], replacing any pending one with the same ID.
+  Future<bool> _schedule(PlannedNotification notification, {required bool exact}) async {
+    final at = notification.scheduledAt;
+    final scheduledDate = tz.TZDateTime(
+        tz.local, at.year, at.month, at.day, at.hour, at.minute);
 
     final androidDetails = AndroidNotificationDetails(
-      NotificationChannels.progress,
-      channelName,
-      channelDescription: channelDescription,
-      importance: Importance.defaultImportance,
-      priority: Priority.defaultPriority,
-    );
-
-    final platformDetails = NotificationDetails(
-      android: androidDetails,
+      notification.channelId,
+      notification.channelName,
+      channelDescription: notification.channelDescription,
+      importance: notification.highImportance
+          ? Importance.high
+          : Importance.defaultImportance,
+      priority: notification.highImportance
+          ? Priority.high
+          : Priority.defaultPriority,
     );
 
-    try {
-      await _plugin.zonedSchedule(
-        scheduledDate: scheduledTime,
-        notificationDetails: platformDetails,
-        androidScheduleMode: AndroidScheduleMode.exactAllowWhileIdle,
-        id: NotificationIds.progressEncouragement,
-        title: title,
-        body: body,
-        payload: 'progress',
-        matchDateTimeComponents: DateTimeComponents.time,
-      );
-      debugPrint('NotificationService: Progress notification scheduled for $hour:$minute');
-      return true;
-    } catch (e) {
-      debugPrint('NotificationService: Failed to schedule progress: $e');
-      return false;
-    }
-  }
-
-  /// Schedule weekly challenge announcement notification.
-  ///
-  /// Sends notification on Sunday at 8:00 AM announcing new weekly challenge.
-  /// Not personalized - always fires at 8:00 AM Sunday.
-  /// All strings are localized by caller via AppLocalizations.
-  ///
-  /// Returns true if scheduled successfully.
-  Future<bool> scheduleWeeklyChallengeNotification({
-    required String title,
-    required String body,
-    required String channelName,
-    required String channelDescription,
-  }) async {
-    if (!_initialized) {
-      await initialize();
-    }
-
-    final hasPermission = await requestPermissions();
-    if (!hasPermission) {
-      debugPrint('NotificationService: POST_NOTIFICATIONS permission not granted');
-      return false;
-    }
-
-    // Cancel existing challenge notification
-    await cancel(NotificationIds.weeklyChallenge);
-
-    // Calculate next Sunday 8:00 AM
-    final now = tz.TZDateTime.now(tz.local);
-    var scheduled = tz.TZDateTime(tz.local, now.year, now.month, now.day, 8, 0);
-
-    // Find next Sunday (weekday 7)
-    while (scheduled.weekday != 7) {
-      scheduled = scheduled.add(const Duration(days: 1));
-    }
-
-    // If Sunday 8AM has passed today, schedule for next Sunday
-    if (scheduled.isBefore(now)) {
-      scheduled = scheduled.add(const Duration(days: 7));
-    }
-
-    final androidDetails = AndroidNotificationDetails(
-      NotificationChannels.challenge,
-      channelName,
-      channelDescription: channelDescription,
-      importance: Importance.high,
-      priority: Priority.high,
+    const iosDetails = DarwinNotificationDetails(
+      presentAlert: true,
+      presentBadge: true,
+      presentSound: true,
     );
 
     final platformDetails = NotificationDetails(
       android: androidDetails,
+      iOS: iosDetails,
     );
 
     try {
       await _plugin.zonedSchedule(
-        scheduledDate: scheduled,
+        scheduledDate: scheduledDate,
         notificationDetails: platformDetails,
-        androidScheduleMode: AndroidScheduleMode.exactAllowWhileIdle,
-        id: NotificationIds.weeklyChallenge,
-        title: title,
-        body: body,
-        payload: 'weekly_challenge',
-        matchDateTimeComponents: DateTimeComponents.dayOfWeekAndTime,
+        androidScheduleMode: exact
+            ? AndroidScheduleMode.exactAllowWhileIdle
+            : AndroidScheduleMode.inexactAllowWhileIdle,
+        id: notification.id,
+        title: notification.title,
+        body: notification.body,
+        payload: notification.payload,
+        matchDateTimeComponents: switch (notification.repeat) {
+          NotificationRepeat.none => null,
+          NotificationRepeat.daily ||
+          NotificationRepeat.dailyFromDate =>
+            DateTimeComponents.time,
+          NotificationRepeat.weekly => DateTimeComponents.dayOfWeekAndTime,
+        },
       );
-      debugPrint('NotificationService: Weekly challenge notification scheduled for Sunday 8:00 AM');
       return true;
     } catch (e) {
-      debugPrint('NotificationService: Failed to schedule weekly challenge: $e');
+      debugPrint('NotificationService: Failed to schedule ${notification.payload}: $e');
+      debugPrint('NotificationService: Error type: ${e.runtimeType}');
       return false;
     }
   }
@@ -805,18 +706,6 @@ class NotificationService {
     _onNotificationTapCallback?.call(response.payload);
   }
 
-  /// Calculate next occurrence of given time.
-  tz.TZDateTime _nextInstanceOfTime(int hour, int minute) {
-    final now = tz.TZDateTime.now(tz.local);
-    var scheduled = tz.TZDateTime(tz.local, now.year, now.month, now.day, hour, minute);
-
-    if (scheduled.isBefore(now)) {
-      scheduled = scheduled.add(const Duration(days: 1));
-    }
-
-    return scheduled;
-  }
-
   /// Dispose resources.
   void dispose() {
     // Nothing to dispose for notifications
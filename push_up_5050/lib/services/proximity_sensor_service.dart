@@ -1,6 +1,9 @@
 import 'dart:async';
+import 'dart:io';
 import 'package:flutter/foundation.dart';
 import 'package:proximity_sensor/proximity_sensor.dart';
+import 'package:push_up_5050/services/rep_detector.dart';
+import 'package:push_up_5050/services/sensor_trace.dart';
 
 /// Callback type for proximity sensor events.
 typedef ProximityCallback = void Function();
@@ -13,13 +16,15 @@ typedef ProximityCallback = void Function();
 /// Uses the `proximity_sensor` package for Android hardware integration.
 ///
 /// Features:
-/// - Debounce logic (300ms) to prevent multiple rapid triggers
+/// - Near/far state machine with hysteresis and a cadence-adaptive debounce
+///   (see [RepDetector]) to reject sensor jitter and bounces
 /// - Graceful degradation when sensor unavailable (Windows/desktop)
 /// - Stream of proximity events for reactive UI
+/// - Debug-only capture of the raw events into a [SensorTrace]
 ///
 /// Sensor behavior (proximity_sensor package):
 /// - event > 0: object is near (trigger count)
-/// - event <= 0: object is far (ignore)
+/// - event <= 0: object is far (re-arms the detector)
 class ProximitySensorService {
   StreamSubscription<dynamic>? _subscription;
   final StreamController<bool> _controller = StreamController<bool>.broadcast();
@@ -28,24 +33,40 @@ class ProximitySensorService {
   bool _isInitialized = false;
   ProximityCallback? _callback;
 
-  // Debounce to prevent multiple triggers from single motion
-  static const int _debounceMs = 300;
-  DateTime? _lastTrigger;
+  // Turns raw near/far events into reps
+  final ProximityRepCounter _repCounter;
+  StreamSubscription<RepEvent>? _repSubscription;
 
   // Proximity threshold in cm (default 5cm)
   final int _proximityThreshold;
 
+  // Debug builds only: records the raw near/far events
+  SensorTraceRecorder? _traceRecorder;
+
   /// Create ProximitySensorService.
   ///
   /// Optionally set [proximityThreshold] in cm (default 5).
-  ProximitySensorService({int proximityThreshold = 5})
-      : _proximityThreshold = proximityThreshold;
+  /// [detectorConfig] tunes rep detection.
+  ProximitySensorService({
+    int proximityThreshold = 5,
+    RepDetectorConfig detectorConfig = const RepDetectorConfig(),
+  })  : _proximityThreshold = proximityThreshold,
+        _repCounter = ProximityRepCounter(config: detectorConfig) {
+    _repCounter.attach(_controller.stream);
+    _repSubscription = _repCounter.reps.listen((_) => _callback?.call());
+  }
 
   /// Stream of proximity events.
   ///
   /// Emits `true` when object is near, `false` when far.
   Stream<bool> get proximityEvents => _controller.stream;
 
+  /// Stream of detected reps, with their detection latency.
+  Stream<RepEvent> get repEvents => _repCounter.reps;
+
+  /// Rep detection counters (reps, rejected triggers, latency, debounce).
+  RepDetectorStats get detectionStats => _repCounter.detector.stats;
+
   /// Whether proximity sensor is available on this device.
   bool get isAvailable => _isAvailable;
 
@@ -96,10 +117,47 @@ class ProximitySensorService {
     }
   }
 
+  /// Whether a debug sensor trace is being recorded.
+  bool get isRecordingTrace => _traceRecorder?.isRecording ?? false;
+
+  /// Start recording the raw near/far events into a [SensorTrace].
+  ///
+  /// Debug builds only: returns `false` and records nothing in release.
+  /// Any previous recording is discarded.
+  bool startTraceRecording() {
+    if (!kDebugMode) return false;
+
+    _traceRecorder?.stop();
+    _traceRecorder = SensorTraceRecorder()..start(_controller.stream);
+    return true;
+  }
+
+  /// Label a rep that really happened (e.g. counted by hand) in the trace.
+  void markTraceRep() => _traceRecorder?.markRep();
+
+  /// Stop recording and return the trace, or null if none was started.
+  ///
+  /// Pass [saveTo] to also write it in the compact text format, ready to
+  /// replay in the rep detection tests.
+  Future<SensorTrace?> stopTraceRecording({File? saveTo}) async {
+    final recorder = _traceRecorder;
+    if (recorder == null) return null;
+    _traceRecorder = null;
+
+    await recorder.stop();
+    final trace = recorder.trace;
+    if (saveTo != null) {
+      await trace.save(saveTo);
+      debugPrint('ProximitySensorService: saved ${trace.samples.length} samples, '
+          '${trace.expectedReps.length} reps to ${saveTo.path}');
+    }
+    return trace;
+  }
+
   /// Set callback to be triggered when proximity is detected.
   ///
-  /// The callback is triggered when an object comes within
-  /// [proximityThreshold] cm of the device.
+  /// The callback is triggered once per rep detected from the sensor's
+  /// near/far events.
   ///
   /// Pass `null` to remove the callback.
   void setProximityCallback(ProximityCallback? callback) {
@@ -109,36 +167,25 @@ class ProximitySensorService {
   /// Handle proximity sensor event.
   ///
   /// [distance] value from proximity_sensor package:
-  /// - > 0: object is near (trigger event)
-  /// - <= 0: object is far (ignore)
+  /// - > 0: object is near
+  /// - <= 0: object is far
   void _handleProximityEvent(dynamic distance) {
-    // Convert distance to double if possible
-    final double dist = distance is double ? distance : 0.0;
-
-    // proximity_sensor: event > 0 means near (trigger), <= 0 means far (ignore)
-    if (dist <= 0) return;
-
-    // Apply debounce - prevent multiple triggers within debounce window
-    final now = DateTime.now();
-    if (_lastTrigger != null &&
-        now.difference(_lastTrigger!).inMilliseconds < _debounceMs) {
-      return; // Too soon since last trigger
-    }
-
-    _lastTrigger = now;
-
-    // Emit event
-    _controller.add(true);
+    final bool near = distance is num && distance > 0;
 
-    // Trigger callback
-    _callback?.call();
+    // Rep detection listens to the same stream
+    if (!_controller.isClosed) _controller.add(near);
   }
 
   /// Dispose resources and stop monitoring.
   void dispose() {
     _subscription?.cancel();
     _subscription = null;
+    _repSubscription?.cancel();
+    _repSubscription = null;
     _callback = null;
+    _traceRecorder?.stop();
+    _traceRecorder = null;
+    _repCounter.dispose();
     _controller.close();
   }
 }
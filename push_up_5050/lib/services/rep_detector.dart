@@ -0,0 +1,403 @@
+import 'dart:async';
+import 'dart:math' as math;
+
+/// One raw proximity reading with a monotonic timestamp.
+class ProximitySample {
+  /// Microseconds on a monotonic clock (not wall time).
+  final int timestampMicros;
+
+  /// Whether the sensor reported an object near.
+  final bool near;
+
+  const ProximitySample(this.timestampMicros, this.near);
+
+  @override
+  bool operator ==(Object other) =>
+      other is ProximitySample &&
+      other.timestampMicros == timestampMicros &&
+      other.near == near;
+
+  @override
+  int get hashCode => Object.hash(timestampMicros, near);
+
+  @override
+  String toString() => 'ProximitySample($timestampMicros, ${near ? 'near' : 'far'})';
+}
+
+/// Fixed-size ring buffer of recent samples.
+///
+/// Never grows: once full, each new sample replaces the oldest one.
+/// Timestamps are clamped so they never go backwards.
+class SampleRingBuffer {
+  final int capacity;
+  final List<int> _timestamps;
+  final List<bool> _near;
+  int _start = 0;
+  int _length = 0;
+
+  SampleRingBuffer(this.capacity)
+      : assert(capacity > 0),
+        _timestamps = List<int>.filled(capacity, 0),
+        _near = List<bool>.filled(capacity, false);
+
+  int get length => _length;
+  bool get isEmpty => _length == 0;
+
+  /// Timestamp of the newest sample, or null when empty.
+  int? get lastTimestamp =>
+      _length == 0 ? null : _timestamps[(_start + _length - 1) % capacity];
+
+  /// Append a sample, dropping the oldest one when full.
+  void add(int timestampMicros, bool near) {
+    final last = lastTimestamp;
+    final timestamp = last != null && timestampMicros < last ? last : timestampMicros;
+
+    final slot = (_start + _length) % capacity;
+    _timestamps[slot] = timestamp;
+    _near[slot] = near;
+    if (_length < capacity) {
+      _length++;
+    } else {
+      _start = (_start + 1) % capacity;
+    }
+  }
+
+  /// The [index]-th oldest sample.
+  ProximitySample operator [](int index) {
+    RangeError.checkValidIndex(index, this, 'index', _length);
+    final slot = (_start + index) % capacity;
+    return ProximitySample(_timestamps[slot], _near[slot]);
+  }
+
+  /// Samples from oldest to newest.
+  List<ProximitySample> toList() => [for (var i = 0; i < _length; i++) this[i]];
+
+  void clear() {
+    _start = 0;
+    _length = 0;
+  }
+}
+
+/// Tuning parameters for [RepDetector].
+class RepDetectorConfig {
+  /// How long the sensor must stay near before a rep is confirmed.
+  final Duration nearDwell;
+
+  /// How long the sensor must stay far before the detector re-arms.
+  final Duration farDwell;
+
+  /// Debounce window used until the cadence is known.
+  final Duration initialDebounce;
+
+  /// Bounds for the adaptive debounce window.
+  final Duration minDebounce;
+  final Duration maxDebounce;
+
+  /// Debounce window as a fraction of the median rep interval.
+  final double cadenceFraction;
+
+  /// Rep intervals longer than this (rest between series) are not used to
+  /// estimate the cadence.
+  final Duration maxCadenceInterval;
+
+  /// Number of rep intervals used to estimate the cadence.
+  final int cadenceWindow;
+
+  /// Number of recent samples kept in the ring buffer.
+  final int bufferCapacity;
+
+  const RepDetectorConfig({
+    this.nearDwell = const Duration(milliseconds: 40),
+    this.farDwell = const Duration(milliseconds: 60),
+    this.initialDebounce = const Duration(milliseconds: 300),
+    this.minDebounce = const Duration(milliseconds: 150),
+    this.maxDebounce = const Duration(milliseconds: 500),
+    this.cadenceFraction = 0.4,
+    this.maxCadenceInterval = const Duration(seconds: 4),
+    this.cadenceWindow = 5,
+    this.bufferCapacity = 256,
+  });
+}
+
+/// A detected rep.
+class RepEvent {
+  /// When the sensor first reported near for this rep.
+  final int onsetMicros;
+
+  /// When the detector confirmed the rep.
+  final int detectedMicros;
+
+  /// Time since the previous rep's onset, or null for the first rep.
+  final int? intervalMicros;
+
+  const RepEvent({
+    required this.onsetMicros,
+    required this.detectedMicros,
+    this.intervalMicros,
+  });
+
+  /// Detection latency: from the sensor going near to the rep being counted.
+  int get latencyMicros => detectedMicros - onsetMicros;
+
+  @override
+  String toString() =>
+      'RepEvent(onset: $onsetMicros, latency: ${latencyMicros}us)';
+}
+
+/// Counters describing how a [RepDetector] has behaved so far.
+class RepDetectorStats {
+  /// Reps counted.
+  final int reps;
+
+  /// Near pulses shorter than the near dwell (sensor jitter).
+  final int glitches;
+
+  /// Confirmed near phases rejected by the debounce window.
+  final int debounced;
+
+  /// Current adaptive debounce window.
+  final Duration debounceWindow;
+
+  /// Latencies of recent reps, in microseconds, oldest first.
+  final List<int> recentLatenciesMicros;
+
+  const RepDetectorStats({
+    required this.reps,
+    required this.glitches,
+    required this.debounced,
+    required this.debounceWindow,
+    required this.recentLatenciesMicros,
+  });
+
+  /// Near triggers seen by the sensor (counted or rejected).
+  int get triggers => reps + glitches + debounced;
+
+  /// Fraction of near triggers rejected as jitter or bounces; each of these
+  /// would have been a false rep without the state machine.
+  double get rejectedTriggerRate => triggers == 0 ? 0 : (glitches + debounced) / triggers;
+
+  /// Latency percentile ([p] in 0-100) over recent reps, or null if none.
+  int? latencyPercentile(int p) {
+    if (recentLatenciesMicros.isEmpty) return null;
+    final sorted = [...recentLatenciesMicros]..sort();
+    return sorted[((sorted.length - 1) * p / 100).round()];
+  }
+}
+
+/// Deterministic near/far state machine that turns proximity samples into reps.
+///
+/// Works on explicit monotonic timestamps so it can be driven live (see
+/// [ProximityRepCounter]) or by replaying a recorded trace ([replay]).
+///
+/// - Hysteresis: the confirmed state only changes after the raw reading has
+///   stayed in the new state for the dwell time (near and far dwell differ),
+///   and a rep is only counted on a far-to-near transition, so the sensor
+///   has to be confirmed far again before the next rep.
+/// - Adaptive debounce: a confirmed near phase starting within the debounce
+///   window of the previous rep is rejected; the window follows the user's
+///   cadence (a fraction of the median recent rep interval, clamped).
+class RepDetector {
+  final RepDetectorConfig config;
+
+  /// Most recent raw samples.
+  final SampleRingBuffer samples;
+
+  bool _rawNear = false;
+  int _rawChangedAt = 0;
+  bool _confirmedNear = false;
+  int? _lastRepOnset;
+
+  final List<int> _intervals = [];
+  int _debounceMicros;
+
+  int _reps = 0;
+  int _glitches = 0;
+  int _debounced = 0;
+  final List<int> _latencies = [];
+  static const int _latencyWindow = 64;
+
+  RepDetector({this.config = const RepDetectorConfig()})
+      : samples = SampleRingBuffer(config.bufferCapacity),
+        _debounceMicros = config.initialDebounce.inMicroseconds;
+
+  /// Current adaptive debounce window.
+  Duration get debounceWindow => Duration(microseconds: _debounceMicros);
+
+  /// Whether the confirmed state is near.
+  bool get isNear => _confirmedNear;
+
+  /// Time at which a pending state change becomes confirmed, if any.
+  ///
+  /// Live drivers must call [advanceTo] at this time, since sensors only
+  /// report changes and no further sample may arrive.
+  int? get nextDeadline =>
+      _rawNear == _confirmedNear ? null : _rawChangedAt + _dwellMicros(_rawNear);
+
+  RepDetectorStats get stats => RepDetectorStats(
+        reps: _reps,
+        glitches: _glitches,
+        debounced: _debounced,
+        debounceWindow: debounceWindow,
+        recentLatenciesMicros: List.unmodifiable(_latencies),
+      );
+
+  /// Feed a raw sample taken at [timestampMicros].
+  ///
+  /// Returns the rep confirmed up to this point, if any.
+  RepEvent? addSample(int timestampMicros, bool near) {
+    final rep = advanceTo(timestampMicros);
+    samples.add(timestampMicros, near);
+    final timestamp = samples.lastTimestamp!;
+
+    if (near == _rawNear) return rep;
+
+    // Raw reading flips back before its dwell elapsed
+    if (_rawNear && !_confirmedNear) _glitches++;
+
+    _rawNear = near;
+    _rawChangedAt = timestamp;
+    return rep;
+  }
+
+  /// Confirm any state change whose dwell has elapsed by [nowMicros].
+  ///
+  /// Returns the rep counted by the confirmation, if any.
+  RepEvent? advanceTo(int nowMicros) {
+    final deadline = nextDeadline;
+    if (deadline == null || nowMicros < deadline) return null;
+
+    _confirmedNear = _rawNear;
+    if (!_confirmedNear) return null;
+
+    return _onConfirmedNear(_rawChangedAt, nowMicros);
+  }
+
+  /// Run [trace] through a fresh detector, confirming state changes exactly
+  /// at their deadlines. Deterministic for a given trace and config.
+  static List<RepEvent> replay(
+    Iterable<ProximitySample> trace, {
+    RepDetectorConfig config = const RepDetectorConfig(),
+    RepDetector? into,
+  }) {
+    final detector = into ?? RepDetector(config: config);
+    final reps = <RepEvent>[];
+
+    void drainUntil(int? limit) {
+      while (true) {
+        final deadline = detector.nextDeadline;
+        if (deadline == null || (limit != null && deadline > limit)) return;
+        final rep = detector.advanceTo(deadline);
+        if (rep != null) reps.add(rep);
+      }
+    }
+
+    for (final sample in trace) {
+      drainUntil(sample.timestampMicros);
+      final rep = detector.addSample(sample.timestampMicros, sample.near);
+      if (rep != null) reps.add(rep);
+    }
+    drainUntil(null);
+
+    return reps;
+  }
+
+  RepEvent? _onConfirmedNear(int onset, int now) {
+    final last = _lastRepOnset;
+    if (last != null && onset - last < _debounceMicros) {
+      _debounced++;
+      return null;
+    }
+
+    final interval = last == null ? null : onset - last;
+    _lastRepOnset = onset;
+    _reps++;
+    if (interval != null) _updateCadence(interval);
+
+    final rep = RepEvent(
+      onsetMicros: onset,
+      detectedMicros: now,
+      intervalMicros: interval,
+    );
+    _latencies.add(rep.latencyMicros);
+    if (_latencies.length > _latencyWindow) _latencies.removeAt(0);
+    return rep;
+  }
+
+  void _updateCadence(int interval) {
+    if (interval > config.maxCadenceInterval.inMicroseconds) return;
+
+    _intervals.add(interval);
+    if (_intervals.length > config.cadenceWindow) _intervals.removeAt(0);
+
+    final sorted = [..._intervals]..sort();
+    final median = sorted[sorted.length ~/ 2];
+    _debounceMicros = (median * config.cadenceFraction).round().clamp(
+          config.minDebounce.inMicroseconds,
+          config.maxDebounce.inMicroseconds,
+        );
+  }
+
+  int _dwellMicros(bool near) =>
+      (near ? config.nearDwell : config.farDwell).inMicroseconds;
+}
+
+/// Drives a [RepDetector] from a live near/far stream.
+///
+/// Timestamps come from a monotonic [Stopwatch], and a timer fires at each
+/// dwell deadline so reps are confirmed without waiting for the next
+/// sensor change.
+class ProximityRepCounter {
+  final RepDetector detector;
+  final Stopwatch _clock = Stopwatch()..start();
+  final StreamController<RepEvent> _reps = StreamController<RepEvent>.broadcast();
+  StreamSubscription<bool>? _subscription;
+  Timer? _deadlineTimer;
+
+  ProximityRepCounter({RepDetectorConfig config = const RepDetectorConfig()})
+      : detector = RepDetector(config: config);
+
+  /// Detected reps.
+  Stream<RepEvent> get reps => _reps.stream;
+
+  /// Microseconds on the counter's monotonic clock.
+  int get nowMicros => _clock.elapsedMicroseconds;
+
+  /// Feed samples from [events] (true = near) until [dispose].
+  void attach(Stream<bool> events) {
+    _subscription?.cancel();
+    _subscription = events.listen(addSample);
+  }
+
+  /// Feed one sample taken now.
+  void addSample(bool near) {
+    _emit(detector.addSample(nowMicros, near));
+    _scheduleDeadline();
+  }
+
+  void _scheduleDeadline() {
+    _deadlineTimer?.cancel();
+    _deadlineTimer = null;
+
+    final deadline = detector.nextDeadline;
+    if (deadline == null) return;
+
+    _deadlineTimer = Timer(
+      Duration(microseconds: math.max(0, deadline - nowMicros)),
+      () {
+        _emit(detector.advanceTo(math.max(nowMicros, deadline)));
+        _scheduleDeadline();
+      },
+    );
+  }
+
+  void _emit(RepEvent? rep) {
+    if (rep != null && !_reps.isClosed) _reps.add(rep);
+  }
+
+  void dispose() {
+    _deadlineTimer?.cancel();
+    _subscription?.cancel();
+    _subscription = null;
+    _reps.close();
+  }
+}
@@ -0,0 +1,213 @@
+import 'dart:async';
+import 'dart:io';
+
+import 'package:push_up_5050/services/rep_detector.dart';
+
+/// A recorded sequence of proximity samples, optionally labelled with the
+/// reps that really happened, for replaying through [RepDetector].
+///
+/// Stored as compact text: a header line, then one line per event with
+/// times in microseconds relative to the previous line:
+///
+/// ```
+/// PU5050-TRACE 1
+/// +0        near sample
+/// -412000   far sample
+/// r3000     labelled rep (ground truth)
+/// ```
+class SensorTrace {
+  static const String header = 'PU5050-TRACE 1';
+
+  /// Raw samples, in time order.
+  final List<ProximitySample> samples;
+
+  /// Times of the reps that really happened, in time order.
+  final List<int> expectedReps;
+
+  const SensorTrace({required this.samples, this.expectedReps = const []});
+
+  /// Encode to the compact text format.
+  String encode() {
+    final buffer = StringBuffer()..writeln(header);
+    var previous = 0;
+    var s = 0;
+    var r = 0;
+    // Merge samples and labels by time; labels go first on ties
+    while (s < samples.length || r < expectedReps.length) {
+      final takeLabel = r < expectedReps.length &&
+          (s >= samples.length || expectedReps[r] <= samples[s].timestampMicros);
+      if (takeLabel) {
+        buffer.writeln('r${expectedReps[r] - previous}');
+        previous = expectedReps[r++];
+      } else {
+        final sample = samples[s++];
+        buffer.writeln('${sample.near ? '+' : '-'}${sample.timestampMicros - previous}');
+        previous = sample.timestampMicros;
+      }
+    }
+    return buffer.toString();
+  }
+
+  /// Decode the compact text format.
+  ///
+  /// Throws [FormatException] on a missing header or malformed line.
+  factory SensorTrace.decode(String source) {
+    final lines = source.split('\n');
+    if (lines.isEmpty || lines.first.trim() != header) {
+      throw const FormatException('Not a proximity sensor trace');
+    }
+
+    final samples = <ProximitySample>[];
+    final expectedReps = <int>[];
+    var time = 0;
+    for (var i = 1; i < lines.length; i++) {
+      final line = lines[i].trim();
+      if (line.isEmpty || line.startsWith('#')) continue;
+
+      final delta = int.tryParse(line.substring(1));
+      if (delta == null || delta < 0) {
+        throw FormatException('Invalid trace line ${i + 1}', line);
+      }
+      time += delta;
+
+      switch (line[0]) {
+        case '+':
+          samples.add(ProximitySample(time, true));
+        case '-':
+          samples.add(ProximitySample(time, false));
+        case 'r':
+          expectedReps.add(time);
+        default:
+          throw FormatException('Invalid trace line ${i + 1}', line);
+      }
+    }
+    return SensorTrace(samples: samples, expectedReps: expectedReps);
+  }
+
+  Future<void> save(File file) => file.writeAsString(encode(), flush: true);
+
+  static Future<SensorTrace> load(File file) async =>
+      SensorTrace.decode(await file.readAsString());
+
+  /// Replay through a fresh [RepDetector] and compare with [expectedReps].
+  ///
+  /// A detected rep matches a labelled rep when its onset is within
+  /// [tolerance] of the label; unmatched detections are false triggers.
+  RepDetectionReport evaluate({
+    RepDetectorConfig config = const RepDetectorConfig(),
+    Duration tolerance = const Duration(milliseconds: 250),
+  }) {
+    final detector = RepDetector(config: config);
+    final detected = RepDetector.replay(samples, into: detector);
+
+    final toleranceMicros = tolerance.inMicroseconds;
+    final latencies = <int>[];
+    var matched = 0;
+    var falseTriggers = 0;
+    var next = 0;
+    for (final rep in detected) {
+      // Labels too old to match this or any later rep are missed
+      while (next < expectedReps.length &&
+          expectedReps[next] < rep.onsetMicros - toleranceMicros) {
+        next++;
+      }
+      if (next < expectedReps.length &&
+          (expectedReps[next] - rep.onsetMicros).abs() <= toleranceMicros) {
+        latencies.add(rep.detectedMicros - expectedReps[next]);
+        matched++;
+        next++;
+      } else {
+        falseTriggers++;
+      }
+    }
+
+    return RepDetectionReport(
+      detected: detected,
+      expected: expectedReps.length,
+      matched: matched,
+      falseTriggers: falseTriggers,
+      latenciesMicros: latencies,
+      stats: detector.stats,
+    );
+  }
+}
+
+/// How a [RepDetector] performed on a labelled [SensorTrace].
+class RepDetectionReport {
+  final List<RepEvent> detected;
+  final int expected;
+  final int matched;
+  final int falseTriggers;
+
+  /// Detection latency of each matched rep, measured from its label.
+  final List<int> latenciesMicros;
+
+  /// Detector counters at the end of the replay.
+  final RepDetectorStats stats;
+
+  const RepDetectionReport({
+    required this.detected,
+    required this.expected,
+    required this.matched,
+    required this.falseTriggers,
+    required this.latenciesMicros,
+    required this.stats,
+  });
+
+  int get missed => expected - matched;
+
+  /// Fraction of detected reps that did not really happen.
+  double get falseTriggerRate =>
+      detected.isEmpty ? 0 : falseTriggers / detected.length;
+
+  /// Fraction of real reps that were not detected.
+  double get missRate => expected == 0 ? 0 : missed / expected;
+
+  /// Latency percentile ([p] in 0-100) over matched reps, or null if none.
+  int? latencyPercentile(int p) {
+    if (latenciesMicros.isEmpty) return null;
+    final sorted = [...latenciesMicros]..sort();
+    return sorted[((sorted.length - 1) * p / 100).round()];
+  }
+
+  @override
+  String toString() => 'RepDetectionReport(expected: $expected, '
+      'detected: ${detected.length}, matched: $matched, missed: $missed, '
+      'false triggers: $falseTriggers, '
+      'latency p50: ${latencyPercentile(50)}us, p99: ${latencyPercentile(99)}us)';
+}
+
+/// Records a live near/far stream into a [SensorTrace].
+///
+/// Timestamps come from a monotonic [Stopwatch] started by [start]; call
+/// [markRep] to label a rep that really happened (e.g. from a manual count).
+class SensorTraceRecorder {
+  final Stopwatch _clock = Stopwatch();
+  final List<ProximitySample> _samples = [];
+  final List<int> _expectedReps = [];
+  StreamSubscription<bool>? _subscription;
+
+  bool get isRecording => _subscription != null;
+
+  void start(Stream<bool> events) {
+    _subscription?.cancel();
+    _clock.start();
+    _subscription = events.listen(
+      (near) => _samples.add(ProximitySample(_clock.elapsedMicroseconds, near)),
+    );
+  }
+
+  void markRep() => _expectedReps.add(_clock.elapsedMicroseconds);
+
+  Future<void> stop() async {
+    await _subscription?.cancel();
+    _subscription = null;
+    _clock.stop();
+  }
+
+  /// Snapshot of what has been recorded so far.
+  SensorTrace get trace => SensorTrace(
+        samples: List.unmodifiable(_samples),
+        expectedReps: List.unmodifiable(_expectedReps),
+      );
+}
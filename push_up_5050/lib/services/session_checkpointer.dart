@@ -0,0 +1,89 @@
+import 'dart:async';
+
+import 'package:flutter/foundation.dart';
+
+/// Coalescing write-behind scheduler for the active workout session.
+///
+/// [markDirty] is cheap and never touches storage: the first call after a
+/// save arms a timer, and every change made before it fires is persisted by
+/// a single [save]. The unsaved window is therefore bounded by [interval].
+/// [flush] forces the pending save immediately (recovery start, end of
+/// workout, app pause).
+class SessionCheckpointer {
+  /// Persists the current state. Called at most once at a time.
+  final Future<void> Function() save;
+
+  /// Maximum time a change stays unsaved.
+  final Duration interval;
+
+  Timer? _timer;
+  bool _dirty = false;
+  Future<void>? _inFlight;
+  int _saveCount = 0;
+
+  SessionCheckpointer({
+    required this.save,
+    this.interval = const Duration(seconds: 2),
+  });
+
+  /// Whether there are changes not yet handed to [save].
+  bool get isDirty => _dirty;
+
+  /// Number of saves issued so far.
+  int get saveCount => _saveCount;
+
+  /// Record that the session changed; schedules a save if none is pending.
+  void markDirty() {
+    _dirty = true;
+    _timer ??= Timer(interval, () {
+      _timer = null;
+      // Failures keep the state dirty; the next mark or flush retries
+      _drain().catchError((Object e) {
+        debugPrint('SessionCheckpointer: checkpoint failed, will retry: $e');
+      });
+    });
+  }
+
+  /// Save pending changes now and wait until storage is up to date.
+  Future<void> flush() async {
+    _timer?.cancel();
+    _timer = null;
+    await _drain();
+  }
+
+  /// Drop pending changes without saving (session discarded).
+  void cancel() {
+    _timer?.cancel();
+    _timer = null;
+    _dirty = false;
+  }
+
+  /// Run saves until nothing is dirty, never more than one at a time.
+  Future<void> _drain() async {
+    while (true) {
+      final inFlight = _inFlight;
+      if (inFlight != null) {
+        try {
+          await inFlight;
+        } catch (e) {
+          // Reported to the caller that issued it
+        }
+        continue;
+      }
+      if (!_dirty) return;
+
+      _dirty = false;
+      _saveCount++;
+      final pending = _inFlight = save();
+      try {
+        await pending;
+      } catch (e) {
+        // Keep the changes for the next attempt
+        _dirty = true;
+        rethrow;
+      } finally {
+        _inFlight = null;
+      }
+    }
+  }
+}
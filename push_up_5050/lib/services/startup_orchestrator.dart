@@ -0,0 +1,282 @@
+import 'dart:async';
+
+import 'package:flutter/foundation.dart';
+
+/// When a startup task runs.
+enum StartupStage {
+  /// Needed before the first frame; [StartupOrchestrator.runCritical]
+  /// completes only when every critical task has finished.
+  critical,
+
+  /// Not needed to show the first screen; run after the first frame by
+  /// [StartupOrchestrator.runDeferred].
+  deferred,
+}
+
+/// Timing of one startup task, relative to the start of startup.
+class StartupPhase {
+  final String name;
+  final StartupStage stage;
+  final Duration start;
+  final Duration end;
+
+  /// Error thrown by the task, if it failed.
+  final Object? error;
+
+  const StartupPhase({
+    required this.name,
+    required this.stage,
+    required this.start,
+    required this.end,
+    this.error,
+  });
+
+  Duration get duration => end - start;
+
+  @override
+  String toString() =>
+      '$name (${stage.name}): ${start.inMilliseconds}-${end.inMilliseconds}ms'
+      '${error != null ? ' FAILED: $error' : ''}';
+}
+
+/// Per-phase record of an app startup.
+class StartupTimeline {
+  /// Finished tasks, in completion order.
+  final List<StartupPhase> phases;
+
+  /// When the critical stage finished (app can be shown).
+  final Duration? criticalDone;
+
+  /// When the first frame was rendered.
+  final Duration? firstFrame;
+
+  /// When the deferred stage finished.
+  final Duration? deferredDone;
+
+  const StartupTimeline({
+    required this.phases,
+    this.criticalDone,
+    this.firstFrame,
+    this.deferredDone,
+  });
+
+  /// The phase recorded for task [name], or null if it has not finished.
+  StartupPhase? operator [](String name) {
+    for (final phase in phases) {
+      if (phase.name == name) return phase;
+    }
+    return null;
+  }
+
+  @override
+  String toString() {
+    final buffer = StringBuffer('Startup timeline:\n');
+    for (final phase in phases) {
+      buffer.writeln('  $phase');
+    }
+    buffer
+      ..writeln('  critical done: ${criticalDone?.inMilliseconds}ms')
+      ..writeln('  first frame: ${firstFrame?.inMilliseconds}ms')
+      ..write('  deferred done: ${deferredDone?.inMilliseconds}ms');
+    return buffer.toString();
+  }
+}
+
+class _StartupTask {
+  final String name;
+  final StartupStage stage;
+  final List<String> dependsOn;
+  final Future<void> Function() run;
+  final Completer<void> done = Completer<void>();
+  bool started = false;
+
+  _StartupTask(this.name, this.stage, this.dependsOn, this.run);
+}
+
+/// Runs app initialization as a dependency graph instead of a sequence.
+///
+/// Each task declares the tasks it depends on; a task starts as soon as all
+/// of them have finished, so independent initializations run concurrently
+/// and startup takes as long as the longest dependency chain rather than the
+/// sum of all steps. Deferred tasks wait for [runDeferred], which is meant to
+/// be called after the first frame. Every task's start and end time is
+/// recorded in [timeline].
+///
+/// A failing task fails its dependents. Critical failures are rethrown by
+/// [runCritical]; deferred failures are only logged, since deferred
+/// services must degrade gracefully anyway.
+class StartupOrchestrator {
+  final Stopwatch _clock;
+  final Map<String, _StartupTask> _tasks = {};
+  final List<StartupPhase> _phases = [];
+  Duration? _criticalDone;
+  Duration? _firstFrame;
+  Duration? _deferredDone;
+
+  /// Create an orchestrator; [clock] can be injected for tests.
+  StartupOrchestrator({Stopwatch? clock}) : _clock = clock ?? Stopwatch();
+
+  /// Register a task named [name].
+  ///
+  /// Throws [ArgumentError] if the name is already taken.
+  void add(
+    String name,
+    Future<void> Function() run, {
+    List<String> dependsOn = const [],
+    StartupStage stage = StartupStage.critical,
+  }) {
+    if (_tasks.containsKey(name)) {
+      throw ArgumentError.value(name, 'name', 'Duplicate startup task');
+    }
+    _tasks[name] = _StartupTask(name, stage, dependsOn, run);
+  }
+
+  /// Completes when task [name] has finished (with its error if it failed).
+  Future<void> whenDone(String name) {
+    final task = _tasks[name];
+    if (task == null) {
+      throw ArgumentError.value(name, 'name', 'Unknown startup task');
+    }
+    return task.done.future;
+  }
+
+  /// Snapshot of the startup timeline so far.
+  StartupTimeline get timeline => StartupTimeline(
+        phases: List.unmodifiable(_phases),
+        criticalDone: _criticalDone,
+        firstFrame: _firstFrame,
+        deferredDone: _deferredDone,
+      );
+
+  /// Run every critical task, concurrently where dependencies allow.
+  ///
+  /// Throws [StateError] on unknown dependencies, cycles, or critical tasks
+  /// depending on deferred ones; rethrows the first critical task failure.
+  Future<void> runCritical() async {
+    _validate();
+    _clock.start();
+    await _runStage(StartupStage.critical, rethrowErrors: true);
+    _criticalDone = _clock.elapsed;
+  }
+
+  /// Record that the first frame has been rendered.
+  void markFirstFrame() {
+    _firstFrame ??= _clock.elapsed;
+  }
+
+  /// Run every deferred task; failures are logged, not thrown.
+  Future<void> runDeferred() async {
+    await _runStage(StartupStage.deferred, rethrowErrors: false);
+    _deferredDone = _clock.elapsed;
+    if (kDebugMode) {
+      debugPrint(timeline.toString());
+    }
+  }
+
+  Future<void> _runStage(StartupStage stage, {required bool rethrowErrors}) async {
+    final tasks = _tasks.values.where((task) => task.stage == stage).toList();
+    final results = tasks.map(_start).toList();
+
+    Object? firstError;
+    StackTrace? firstStackTrace;
+    for (final result in results) {
+      try {
+        await result;
+      } catch (e, stackTrace) {
+        firstError ??= e;
+        firstStackTrace ??= stackTrace;
+      }
+    }
+
+    if (firstError != null) {
+      if (rethrowErrors) {
+        Error.throwWithStackTrace(firstError, firstStackTrace!);
+      }
+      debugPrint('StartupOrchestrator: deferred startup failed: $firstError');
+    }
+  }
+
+  /// Start [task] once its dependencies are done; idempotent.
+  Future<void> _start(_StartupTask task) {
+    if (!task.started) {
+      task.started = true;
+      _execute(task);
+    }
+    return task.done.future;
+  }
+
+  Future<void> _execute(_StartupTask task) async {
+    try {
+      // Dependencies of the same stage are started here; earlier-stage ones
+      // have already run
+      await Future.wait(task.dependsOn.map((name) => _start(_tasks[name]!)));
+    } catch (e, stackTrace) {
+      _finish(task, _clock.elapsed, e, stackTrace);
+      return;
+    }
+
+    final start = _clock.elapsed;
+    try {
+      await task.run();
+      _finish(task, start, null, null);
+    } catch (e, stackTrace) {
+      _finish(task, start, e, stackTrace);
+    }
+  }
+
+  void _finish(
+    _StartupTask task,
+    Duration start,
+    Object? error,
+    StackTrace? stackTrace,
+  ) {
+    _phases.add(StartupPhase(
+      name: task.name,
+      stage: task.stage,
+      start: start,
+      end: _clock.elapsed,
+      error: error,
+    ));
+    if (error != null) {
+      task.done.completeError(error, stackTrace);
+      // Observed by dependents and the stage runner; avoid unhandled errors
+      // when nothing else is waiting on it
+      task.done.future.ignore();
+    } else {
+      task.done.complete();
+    }
+  }
+
+  void _validate() {
+    for (final task in _tasks.values) {
+      for (final name in task.dependsOn) {
+        final dependency = _tasks[name];
+        if (dependency == null) {
+          throw StateError('Startup task ${task.name} depends on unknown $name');
+        }
+        if (task.stage == StartupStage.critical &&
+            dependency.stage == StartupStage.deferred) {
+          throw StateError(
+              'Critical startup task ${task.name} depends on deferred $name');
+        }
+      }
+    }
+
+    // Depth-first search for cycles
+    final visiting = <String>{};
+    final visited = <String>{};
+    void visit(String name) {
+      if (visited.contains(name)) return;
+      if (!visiting.add(name)) {
+        throw StateError('Startup dependency cycle through $name');
+      }
+      for (final dependency in _tasks[name]!.dependsOn) {
+        visit(dependency);
+      }
+      visiting.remove(name);
+      visited.add(name);
+    }
+
+    _tasks.keys.forEach(visit);
+  }
+}
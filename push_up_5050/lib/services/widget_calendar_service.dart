@@ -4,6 +4,7 @@
 /// and 3-day view data for small widgets.
 library;
 
+import 'package:push_up_5050/repositories/history_index.dart';
 import 'package:push_up_5050/repositories/storage_service.dart';
 
 /// Status of a calendar day for widget display
@@ -195,11 +196,11 @@ class WidgetCalendarService {
     final now = testDate ?? DateTime.now();
     final monday = getCurrentWeekMonday(now);
 
-    // Load all daily records
-    final records = await storage.loadDailyRecords();
+    // Day lookups from the in-memory history index
+    final history = await storage.loadHistoryIndex();
 
     // Find first workout date to determine when to start showing missed days
-    final firstWorkoutDate = _findFirstWorkoutDate(records);
+    final firstWorkoutDate = history.firstActiveDate;
 
     // Generate 7 days of data
     final days = <WeekDayData>[];
@@ -207,12 +208,9 @@ class WidgetCalendarService {
 
     for (int i = 0; i < 7; i++) {
       final dayDate = monday.add(Duration(days: i));
-      final dateKey = _formatDate(dayDate);
-      final record = records[dateKey] as Map<String, dynamic>?;
-
       final isToday = _isSameDay(dayDate, now);
-      final hasRecord = record != null;
-      final pushups = hasRecord ? (record!['totalPushups'] as int? ?? 0) : 0;
+      final hasRecord = history.hasRecord(dayDate);
+      final pushups = history.pushupsOn(dayDate);
 
       // Determine status
       CalendarDayStatus status;
@@ -220,7 +218,7 @@ class WidgetCalendarService {
         status = CalendarDayStatus.today;
       } else if (hasRecord && pushups > 0) {
         status = CalendarDayStatus.completed;
-      } else if (await isDayMissed(dayDate, now, records: records, firstWorkoutDate: firstWorkoutDate)) {
+      } else if (await isDayMissed(dayDate, now, history: history, firstWorkoutDate: firstWorkoutDate)) {
         status = CalendarDayStatus.missed;
       } else {
         status = CalendarDayStatus.pending;
@@ -259,8 +257,8 @@ class WidgetCalendarService {
     final yesterday = now.subtract(const Duration(days: 1));
     final tomorrow = now.add(const Duration(days: 1));
 
-    final records = await storage.loadDailyRecords();
-    final firstWorkoutDate = _findFirstWorkoutDate(records);
+    final history = await storage.loadHistoryIndex();
+    final firstWorkoutDate = history.firstActiveDate;
 
     final result = <WeekDayData>[];
 
@@ -269,7 +267,7 @@ class WidgetCalendarService {
       yesterday,
       now,
       _labelYesterday,
-      records,
+      history,
       firstWorkoutDate,
     ));
 
@@ -278,7 +276,7 @@ class WidgetCalendarService {
       now,
       now,
       _labelToday,
-      records,
+      history,
       firstWorkoutDate,
     ));
 
@@ -287,7 +285,7 @@ class WidgetCalendarService {
       tomorrow,
       now,
       _labelTomorrow,
-      records,
+      history,
       firstWorkoutDate,
     ));
 
@@ -305,14 +303,11 @@ class WidgetCalendarService {
   Future<bool> isDayMissed(
     DateTime day,
     DateTime now, {
-    Map<String, dynamic>? records,
+    HistoryIndex? history,
     DateTime? firstWorkoutDate,
   }) async {
-    records ??= await storage.loadDailyRecords();
-
-    if (firstWorkoutDate == null) {
-      firstWorkoutDate = _findFirstWorkoutDate(records);
-    }
+    history ??= await storage.loadHistoryIndex();
+    firstWorkoutDate ??= history.firstActiveDate;
 
     // Day must be in the past (not today or future)
     if (!_isInPast(day, now)) {
@@ -320,8 +315,7 @@ class WidgetCalendarService {
     }
 
     // Day must have no record
-    final dateKey = _formatDate(day);
-    if (records.containsKey(dateKey)) {
+    if (history.hasRecord(day)) {
       return false;
     }
 
@@ -338,15 +332,12 @@ class WidgetCalendarService {
     DateTime dayDate,
     DateTime now,
     String label,
-    Map<String, dynamic> records,
+    HistoryIndex history,
     DateTime? firstWorkoutDate,
   ) async {
-    final dateKey = _formatDate(dayDate);
-    final record = records[dateKey] as Map<String, dynamic>?;
-
     final isToday = _isSameDay(dayDate, now);
-    final hasRecord = record != null;
-    final pushups = hasRecord ? (record!['totalPushups'] as int? ?? 0) : 0;
+    final hasRecord = history.hasRecord(dayDate);
+    final pushups = history.pushupsOn(dayDate);
 
     // Determine status
     CalendarDayStatus status;
@@ -354,7 +345,7 @@ class WidgetCalendarService {
       status = CalendarDayStatus.today;
     } else if (hasRecord && pushups > 0) {
       status = CalendarDayStatus.completed;
-    } else if (await isDayMissed(dayDate, now, records: records, firstWorkoutDate: firstWorkoutDate)) {
+    } else if (await isDayMissed(dayDate, now, history: history, firstWorkoutDate: firstWorkoutDate)) {
       status = CalendarDayStatus.missed;
     } else {
       status = CalendarDayStatus.pending;
@@ -369,34 +360,6 @@ class WidgetCalendarService {
     );
   }
 
-  /// Find the first workout date from records
-  DateTime? _findFirstWorkoutDate(Map<String, dynamic> records) {
-    if (records.isEmpty) return null;
-
-    DateTime? firstDate;
-    for (final entry in records.entries) {
-      final record = entry.value as Map<String, dynamic>;
-      final pushups = record['totalPushups'] as int? ?? 0;
-      if (pushups > 0) {
-        final dateParts = entry.key.split('-');
-        try {
-          final date = DateTime(
-            int.parse(dateParts[0]),
-            int.parse(dateParts[1]),
-            int.parse(dateParts[2]),
-          );
-          if (firstDate == null || date.isBefore(firstDate)) {
-            firstDate = date;
-          }
-        } catch (_) {
-          // Skip invalid dates
-        }
-      }
-    }
-
-    return firstDate;
-  }
-
   /// Check if two dates are the same day (ignoring time)
   bool _isSameDay(DateTime date1, DateTime date2) {
     return date1.year == date2.year &&
@@ -416,9 +379,4 @@ class WidgetCalendarService {
     final diff = day2.difference(day1);
     return diff.inDays == 1;
   }
-
-  /// Format date as YYYY-MM-DD for storage keys
-  String _formatDate(DateTime date) {
-    return '${date.year}-${date.month.toString().padLeft(2, '0')}-${date.day.toString().padLeft(2, '0')}';
-  }
 }
@@ -1,8 +1,12 @@
+import 'dart:async';
+import 'dart:convert';
 import 'dart:developer' as developer;
+import 'dart:math' as math;
 import 'package:flutter/foundation.dart';
 import 'package:flutter/services.dart';
 import 'package:home_widget/home_widget.dart';
 import '../models/widget_data.dart';
+import '../repositories/history_index.dart';
 import 'widget_calendar_service.dart';
 
 /// Service for updating Android home screen widgets.
@@ -21,6 +25,11 @@ import 'widget_calendar_service.dart';
 ///
 /// Calendar integration: When [WidgetCalendarService] is provided,
 /// widget data includes week calendar data and 3-day view data.
+///
+/// Updates are diff-based: calls to [updateAllWidgets] within the coalesce
+/// window are merged into one batch (latest data wins), only data IDs whose
+/// value changed are written, and only widgets whose inputs changed are
+/// redrawn. See [writesIssued]/[writesSkipped].
 class WidgetUpdateService {
   // Platform channel for widget operations (Android only)
   static const MethodChannel _widgetChannel = MethodChannel('com.pushup5050/widget');
@@ -46,19 +55,59 @@ class WidgetUpdateService {
   /// Optional calendar service for providing week and 3-day calendar data
   final WidgetCalendarService? _calendarService;
 
+  /// How long [updateAllWidgets] waits to merge a burst of calls.
+  final Duration _coalesceWindow;
+
   bool _isAvailable = false;
 
+  // Last value handed to the platform, by data ID
+  final Map<String, String> _writtenValues = {};
+
+  // Input fingerprint of the last successful redraw, by widget ID
+  final Map<String, String> _widgetFingerprints = {};
+
+  // Pending coalesced update (latest data wins)
+  WidgetData? _pendingData;
+  Completer<bool>? _pendingResult;
+  Timer? _coalesceTimer;
+
+  // Batches are applied one at a time so diffs see committed state
+  Future<void> _updateQueue = Future.value();
+
+  int _writesIssued = 0;
+  int _writesSkipped = 0;
+  int _widgetUpdatesIssued = 0;
+  int _widgetUpdatesSkipped = 0;
+
   /// Create a new WidgetUpdateService.
   ///
   /// The [calendarService] is optional - when provided, widgets will
   /// receive enriched calendar data (week view, 3-day view, streak lines).
   /// When null, widgets will use basic fallback data.
-  WidgetUpdateService({WidgetCalendarService? calendarService})
-      : _calendarService = calendarService;
+  ///
+  /// [coalesceWindow] bounds how long an update may wait for later calls
+  /// in the same burst.
+  WidgetUpdateService({
+    WidgetCalendarService? calendarService,
+    Duration coalesceWindow = const Duration(milliseconds: 250),
+  })  : _calendarService = calendarService,
+        _coalesceWindow = coalesceWindow;
 
   /// Whether widget service is available.
   bool get isAvailable => _isAvailable;
 
+  /// Number of widget data values written to the platform.
+  int get writesIssued => _writesIssued;
+
+  /// Number of widget data writes skipped because the value was unchanged.
+  int get writesSkipped => _writesSkipped;
+
+  /// Number of widget redraws requested.
+  int get widgetUpdatesIssued => _widgetUpdatesIssued;
+
+  /// Number of widget redraws skipped because their inputs were unchanged.
+  int get widgetUpdatesSkipped => _widgetUpdatesSkipped;
+
   /// Build widget data with calendar information.
   ///
   /// Creates [WidgetData] populated with stats and calendar information.
@@ -73,17 +122,19 @@ class WidgetUpdateService {
   /// - [todayPushups]: Push-ups completed today
   /// - [totalPushups]: Total push-ups all time
   /// - [goalPushups]: Daily goal (default 5050)
+  /// - [todayGoalReached]: Whether today's goal was reached (default: 50+ push-ups)
   /// - [streakDays]: Current consecutive days with goal reached
   /// - [totalPoints]: Total points earned all time (default 0)
-  /// - [allDailyRecords]: All daily records for calendar processing (optional, for backward compatibility)
+  /// - [calendarDays]: Days of the legacy 30-day calendar (optional)
   Future<WidgetData> buildWidgetData({
     required int todayPushups,
     required int totalPushups,
     int goalPushups = 5050,
+    bool? todayGoalReached,
     int streakDays = 0,
     int totalPoints = 0,
     DateTime? lastWorkoutDate,
-    Map<String, dynamic>? allDailyRecords,
+    List<CalendarDayData> calendarDays = const [],
   }) async {
     // If calendar service is available, get calendar data
     if (_calendarService != null) {
@@ -95,9 +146,11 @@ class WidgetUpdateService {
           todayPushups: todayPushups,
           totalPushups: totalPushups,
           goalPushups: goalPushups,
+          todayGoalReached: todayGoalReached,
           streakDays: streakDays,
           totalPoints: totalPoints,
           lastWorkoutDate: lastWorkoutDate,
+          calendarDays: calendarDays,
           weekData: weekData,
           threeDayData: threeDayData,
         );
@@ -113,26 +166,64 @@ class WidgetUpdateService {
       todayPushups: todayPushups,
       totalPushups: totalPushups,
       goalPushups: goalPushups,
+      todayGoalReached: todayGoalReached,
       streakDays: streakDays,
       totalPoints: totalPoints,
       lastWorkoutDate: lastWorkoutDate,
-      calendarDays: const [], // Empty for backward compatibility
+      calendarDays: calendarDays,
       weekDayData: const [],
       threeDayData: const [],
       hasStreakLine: false,
     );
   }
 
+  /// Build widget data from the history aggregates.
+  ///
+  /// Both the post-workout refresh and the stats refresh use this, so the
+  /// same history always produces the same payload and the second of the
+  /// two updates writes nothing.
+  ///
+  /// Today's push-ups are capped at [dailyGoal] (the final series may
+  /// overshoot it), and the goal counts as reached at [dailyGoal]. The calendar covers the last 30 days.
+  Future<WidgetData> buildWidgetDataFromHistory(
+    HistoryIndex index, {
+    required int dailyGoal,
+    required int streakDays,
+    DateTime? now,
+  }) {
+    final today = now ?? DateTime.now();
+    final todayPushups = math.min(index.pushupsOn(today), dailyGoal);
+    return buildWidgetData(
+      todayPushups: todayPushups,
+      todayGoalReached: todayPushups >= dailyGoal,
+      totalPushups: index.totalPushups,
+      streakDays: streakDays,
+      totalPoints: index.totalPoints,
+      lastWorkoutDate: index.lastRecordDate,
+      calendarDays: [
+        for (int i = 29; i >= 0; i--)
+          _calendarDay(index, DateTime(today.year, today.month, today.day - i)),
+      ],
+    );
+  }
+
+  static CalendarDayData _calendarDay(HistoryIndex index, DateTime date) =>
+      CalendarDayData(date.day, index.hasRecord(date));
+
   /// Initialize widget service.
   ///
   /// Returns true if widgets are supported (Android), false otherwise.
-  /// Also schedules the midnight widget update for calendar refresh.
-  Future<bool> initialize() async {
+  /// Also schedules the midnight widget update for calendar refresh, unless
+  /// [scheduleMidnight] is false (startup defers it with
+  /// [scheduleMidnightUpdate] until after the first frame).
+  Future<bool> initialize({bool scheduleMidnight = true}) async {
     try {
       // Check if we're on Android
       _isAvailable = true; // home_widget handles platform checks
       // Schedule midnight update for widget calendar refresh
-      await scheduleMidnightUpdate();
+      if (scheduleMidnight) {
+        await scheduleMidnightUpdate();
+      }
       return _isAvailable;
     } catch (e) {
       // Widget service unavailable - gracefully degrade
@@ -170,27 +261,73 @@ class WidgetUpdateService {
 
   /// Update all widgets with latest data.
   ///
-  /// Returns true if at least one widget was updated successfully.
-  Future<bool> updateAllWidgets(WidgetData data) async {
+  /// Calls made within the coalesce window are merged: only the latest
+  /// [data] is applied, and every caller gets the result of that batch.
+  /// Returns true if the widgets show [data] afterwards (at least one
+  /// redraw succeeded, or nothing had changed).
+  Future<bool> updateAllWidgets(WidgetData data) {
     if (!_isAvailable) {
       developer.log('Widget service not available', name: 'WidgetUpdateService');
-      return false;
+      return Future.value(false);
     }
 
+    _pendingData = data;
+    final result = (_pendingResult ??= Completer<bool>()).future;
+    _coalesceTimer ??= Timer(_coalesceWindow, _applyPending);
+    return result;
+  }
+
+  /// Apply a pending coalesced update now instead of at the end of the window.
+  Future<void> flushPendingUpdates() async {
+    if (_coalesceTimer == null) {
+      await _updateQueue;
+      return;
+    }
+    _coalesceTimer!.cancel();
+    await _applyPending();
+  }
+
+  /// Take the pending update and apply it after any batch in progress.
+  Future<void> _applyPending() {
+    _coalesceTimer = null;
+    final data = _pendingData;
+    final completer = _pendingResult;
+    _pendingData = null;
+    _pendingResult = null;
+    if (data == null || completer == null) return _updateQueue;
+
+    _updateQueue = _updateQueue.then((_) async {
+      completer.complete(await _applyUpdate(data));
+    });
+    return _updateQueue;
+  }
+
+  /// Write changed values and redraw the widgets whose inputs changed.
+  Future<bool> _applyUpdate(WidgetData data) async {
     try {
       developer.log('Updating widgets: today=${data.todayPushups}, total=${data.totalPushups}, streak=${data.streakDays}', name: 'WidgetUpdateService');
 
       // Save widget data for all widgets to access
-      await _saveWidgetData(data);
-      developer.log('Widget data saved to SharedPreferences', name: 'WidgetUpdateService');
+      final saved = await _saveWidgetData(data);
 
-      // Update each enabled widget type
+      // Redraw only widgets whose inputs changed
+      final fingerprints = _widgetInputFingerprints(data);
       final results = await Future.wait([
-        updateQuickStartWidget(data),
-        updateSmallWidget(data),
+        _updateWidgetIfChanged(
+          _quickStartWidgetId,
+          fingerprints[_quickStartWidgetId]!,
+          saved,
+          () => updateQuickStartWidget(data),
+        ),
+        _updateWidgetIfChanged(
+          _smallWidgetId,
+          fingerprints[_smallWidgetId]!,
+          saved,
+          () => updateSmallWidget(data),
+        ),
       ], eagerError: false);
 
-      developer.log('Widget update results: $results', name: 'WidgetUpdateService');
+      developer.log('Widget update results: $results (writes issued=$_writesIssued, skipped=$_writesSkipped)', name: 'WidgetUpdateService');
 
       // Return true if at least one succeeded
       return results.any((success) => success);
@@ -201,6 +338,55 @@ class WidgetUpdateService {
     }
   }
 
+  /// Redraw [widgetId] unless it already shows inputs with [fingerprint].
+  ///
+  /// The fingerprint is only recorded when the data was fully saved and the
+  /// redraw succeeded, so failures are retried by the next update.
+  Future<bool> _updateWidgetIfChanged(
+    String widgetId,
+    String fingerprint,
+    bool dataSaved,
+    Future<bool> Function() update,
+  ) async {
+    if (_widgetFingerprints[widgetId] == fingerprint) {
+      _widgetUpdatesSkipped++;
+      return true;
+    }
+
+    _widgetUpdatesIssued++;
+    final success = await update();
+    if (success && dataSaved) {
+      _widgetFingerprints[widgetId] = fingerprint;
+    } else {
+      _widgetFingerprints.remove(widgetId);
+    }
+    return success;
+  }
+
+  /// Fingerprint of the values each widget displays, by widget ID.
+  ///
+  /// Must follow what the Android providers read: the Quick Start widget
+  /// shows stats plus the week calendar, the Small widget stats plus the
+  /// 3-day view.
+  static Map<String, String> _widgetInputFingerprints(WidgetData data) {
+    return {
+      _quickStartWidgetId: jsonEncode([
+        data.todayPushups,
+        data.totalPushups,
+        data.goalPushups,
+        data.streakDays,
+        data.hasStreakLine,
+        data.weekDayData,
+      ]),
+      _smallWidgetId: jsonEncode([
+        data.todayPushups,
+        data.totalPushups,
+        data.goalPushups,
+        data.threeDayData,
+      ]),
+    };
+  }
+
   /// Update Quick Start Widget (large with START button and day indicators).
   ///
   /// Shows today's push-ups, total progress, streak days, and START button.
@@ -241,50 +427,44 @@ class WidgetUpdateService {
   ///
   /// This data is accessed by Android widget implementations.
   /// Using home_widget v0.9.0 API with id-based storage.
-  Future<void> _saveWidgetData(WidgetData data) async {
+  /// Values equal to the last one written are skipped.
+  /// Returns false if any write failed.
+  Future<bool> _saveWidgetData(WidgetData data) async {
     try {
       developer.log('Saving widget data...', name: 'WidgetUpdateService');
-      final jsonString = data.toJsonString();
-      developer.log('JSON data: $jsonString', name: 'WidgetUpdateService');
-
-      await HomeWidget.saveWidgetData<String>(
-        _dataIdJsonData,
-        jsonString,
-      );
-      developer.log('Saved JSON data with key: $_dataIdJsonData', name: 'WidgetUpdateService');
-
-      await HomeWidget.saveWidgetData<String>(
-        _dataIdTodayPushups,
-        data.todayPushups.toString(),
-      );
-      await HomeWidget.saveWidgetData<String>(
-        _dataIdTotalPushups,
-        data.totalPushups.toString(),
-      );
-      await HomeWidget.saveWidgetData<String>(
-        _dataIdGoalPushups,
-        data.goalPushups.toString(),
-      );
-      await HomeWidget.saveWidgetData<String>(
-        _dataIdTodayGoalReached,
-        data.todayGoalReached.toString(),
-      );
-      await HomeWidget.saveWidgetData<String>(
-        _dataIdStreakDays,
-        data.streakDays.toString(),
-      );
-      await HomeWidget.saveWidgetData<String>(
-        _dataIdLastWorkoutDate,
-        data.lastWorkoutDate != null
-            ? '${data.lastWorkoutDate!.year}-${data.lastWorkoutDate!.month.toString().padLeft(2, '0')}-${data.lastWorkoutDate!.day.toString().padLeft(2, '0')}'
-            : '',
-      );
+      for (final entry in _widgetValues(data).entries) {
+        if (_writtenValues[entry.key] == entry.value) {
+          _writesSkipped++;
+          continue;
+        }
+
+        _writesIssued++;
+        await HomeWidget.saveWidgetData<String>(entry.key, entry.value);
+        _writtenValues[entry.key] = entry.value;
+      }
       developer.log('All widget data saved successfully', name: 'WidgetUpdateService');
+      return true;
     } catch (e) {
       developer.log('Error saving widget data: $e', name: 'WidgetUpdateService', error: e);
+      return false;
     }
   }
 
+  /// Values stored for the widgets, by data ID (JSON payload first).
+  static Map<String, String> _widgetValues(WidgetData data) {
+    return {
+      _dataIdJsonData: data.toJsonString(),
+      _dataIdTodayPushups: data.todayPushups.toString(),
+      _dataIdTotalPushups: data.totalPushups.toString(),
+      _dataIdGoalPushups: data.goalPushups.toString(),
+      _dataIdTodayGoalReached: data.todayGoalReached.toString(),
+      _dataIdStreakDays: data.streakDays.toString(),
+      _dataIdLastWorkoutDate: data.lastWorkoutDate != null
+          ? '${data.lastWorkoutDate!.year}-${data.lastWorkoutDate!.month.toString().padLeft(2, '0')}-${data.lastWorkoutDate!.day.toString().padLeft(2, '0')}'
+          : '',
+    };
+  }
+
   /// Get current widget data from storage.
   Future<WidgetData?> getWidgetData() async {
     if (!_isAvailable) return null;
@@ -307,6 +487,10 @@ class WidgetUpdateService {
   Future<void> clearWidgetData() async {
     if (!_isAvailable) return;
 
+    // Next update writes and redraws everything
+    _writtenValues.clear();
+    _widgetFingerprints.clear();
+
     try {
       await HomeWidget.saveWidgetData<String>(_dataIdTodayPushups, '0');
       await HomeWidget.saveWidgetData<String>(_dataIdTotalPushups, '0');
@@ -1,4 +1,5 @@
 import 'package:flutter/material.dart';
+import 'package:push_up_5050/models/month_calendar.dart';
 import 'package:push_up_5050/widgets/design_system/frost_card.dart';
 
 /// Monthly Calendar Widget - displays monthly progress calendar.
@@ -13,39 +14,56 @@ import 'package:push_up_5050/widgets/design_system/frost_card.dart';
 /// - Missed days: dark background with X
 /// - Blocked days: gray background (days before first workout)
 /// - Future days: dimmed
+///
+/// Everything is read from an immutable [MonthCalendarModel]; the grid and
+/// its connector painter are only rebuilt and repainted for a new model.
 class MonthlyCalendar extends StatelessWidget {
-  final DateTime? month;
-  final Set<int>? completedDays;
-  final Set<int>? missedDays;
-  final Set<int>? blockedDays;
+  /// Month to display, with its day states.
+  final MonthCalendarModel model;
+
+  /// Called by the header arrows; arrows are hidden when null.
+  final VoidCallback? onPreviousMonth;
+  final VoidCallback? onNextMonth;
 
   const MonthlyCalendar({
     super.key,
-    this.month,
-    this.completedDays,
-    this.missedDays,
-    this.blockedDays,
+    required this.model,
+    this.onPreviousMonth,
+    this.onNextMonth,
   });
 
   @override
   Widget build(BuildContext context) {
-    final displayMonth = month ?? DateTime.now();
-    final today = DateTime.now();
-
     return FrostCard(
       height: 280,
       child: Column(
         crossAxisAlignment: CrossAxisAlignment.start,
         children: [
           // Month/Year header
-          Text(
-            _formatMonthYear(displayMonth),
-            style: const TextStyle(
-              fontSize: 16,
-              fontWeight: FontWeight.w900,
-              color: Colors.white,
-              letterSpacing: 1.0,
-            ),
+          Row(
+            children: [
+              Expanded(
+                child: Text(
+                  _formatMonthYear(model.year, model.month),
+                  style: const TextStyle(
+                    fontSize: 16,
+                    fontWeight: FontWeight.w900,
+                    color: Colors.white,
+                    letterSpacing: 1.0,
+                  ),
+                ),
+              ),
+              if (onPreviousMonth != null || onNextMonth != null) ...[
+                _MonthArrow(
+                  icon: Icons.chevron_left_rounded,
+                  onTap: onPreviousMonth,
+                ),
+                _MonthArrow(
+                  icon: Icons.chevron_right_rounded,
+                  onTap: onNextMonth,
+                ),
+              ],
+            ],
           ),
           const SizedBox(height: 12),
 
@@ -53,9 +71,11 @@ class MonthlyCalendar extends StatelessWidget {
           _buildWeekdayLabels(),
           const SizedBox(height: 8),
 
-          // Calendar grid
+          // Calendar grid, rebuilt only for a new month model
           Expanded(
-            child: _buildCalendarGrid(displayMonth, today),
+            child: RepaintBoundary(
+              child: _MonthGrid.of(model),
+            ),
           ),
         ],
       ),
@@ -85,201 +105,109 @@ class MonthlyCalendar extends StatelessWidget {
     );
   }
 
-  Widget _buildCalendarGrid(DateTime month, DateTime today) {
-    final firstDayOfMonth = DateTime(month.year, month.month, 1);
-    final lastDayOfMonth = DateTime(month.year, month.month + 1, 0);
-    final startingWeekday = _getStartingWeekday(firstDayOfMonth);
-
-    // Build grid data structure
-    final gridData = _buildGridData(month, today, firstDayOfMonth, lastDayOfMonth, startingWeekday);
-
-    return Stack(
-      children: [
-        // Connector lines layer (behind cells)
-        _MonthlyConnectorLines(
-          gridData: gridData,
-          completedDays: completedDays ?? {},
-        ),
-        // Day cells layer
-        _buildDayCells(gridData, today, month),
-      ],
-    );
-  }
-
-  List<List<_DayCellData?>> _buildGridData(
-    DateTime month,
-    DateTime today,
-    DateTime firstDayOfMonth,
-    DateTime lastDayOfMonth,
-    int startingWeekday,
-  ) {
-    final gridData = <List<_DayCellData?>>[];
-    int dayCounter = 1;
-
-    for (int row = 0; row < 6; row++) {
-      final rowData = <_DayCellData?>[];
-      for (int col = 0; col < 7; col++) {
-        if (row == 0 && col < startingWeekday) {
-          rowData.add(null);
-        } else if (dayCounter > lastDayOfMonth.day) {
-          rowData.add(null);
-        } else {
-          final isToday = dayCounter == today.day &&
-              month.year == today.year &&
-              month.month == today.month;
-
-          final isCompleted = completedDays?.contains(dayCounter) ?? false;
-          final isMissed = missedDays?.contains(dayCounter) ?? false;
-          final isBlocked = blockedDays?.contains(dayCounter) ?? false;
-          final isFuture = dayCounter > today.day &&
-              month.year == today.year &&
-              month.month == today.month;
-
-          rowData.add(_DayCellData(
-            day: dayCounter,
-            row: row,
-            col: col,
-            isCompleted: isCompleted,
-            isMissed: isMissed,
-            isToday: isToday,
-            isFuture: isFuture,
-            isBlocked: isBlocked,
-          ));
-          dayCounter++;
-        }
-      }
-      gridData.add(rowData);
-      if (dayCounter > lastDayOfMonth.day) break;
-    }
-
-    return gridData;
-  }
-
-  Widget _buildDayCells(List<List<_DayCellData?>> gridData, DateTime today, DateTime month) {
-    return Column(
-      mainAxisAlignment: MainAxisAlignment.spaceEvenly,
-      children: gridData.asMap().entries.map((rowEntry) {
-        final row = rowEntry.key;
-        final rowData = rowEntry.value;
-
-        return Row(
-          mainAxisAlignment: MainAxisAlignment.spaceAround,
-          children: rowData.asMap().entries.map((colEntry) {
-            final col = colEntry.key;
-            final cellData = colEntry.value;
-
-            if (cellData == null) {
-              return const SizedBox(width: 32, height: 32);
-            }
-
-            // Determine connections for this cell
-            final isConnectedLeft = _isConnectedTo(cellData, gridData, -1, 0);
-            final isConnectedRight = _isConnectedTo(cellData, gridData, 1, 0);
-            final isConnectedUp = _isConnectedTo(cellData, gridData, 0, -1);
-            final isConnectedDown = _isConnectedTo(cellData, gridData, 0, 1);
-
-            return _CalendarDayCell(
-              day: cellData.day,
-              isCompleted: cellData.isCompleted,
-              isMissed: cellData.isMissed,
-              isToday: cellData.isToday,
-              isFuture: cellData.isFuture,
-              isBlocked: cellData.isBlocked,
-              isConnectedLeft: isConnectedLeft,
-              isConnectedRight: isConnectedRight,
-              isConnectedUp: isConnectedUp,
-              isConnectedDown: isConnectedDown,
-            );
-          }).toList(),
-        );
-      }).toList(),
-    );
-  }
-
-  /// Check if current cell is connected to adjacent cell
-  bool _isConnectedTo(_DayCellData current, List<List<_DayCellData?>> grid, int colOffset, int rowOffset) {
-    if (!current.isCompleted) return false;
-
-    final targetRow = current.row + rowOffset;
-    final targetCol = current.col + colOffset;
-
-    if (targetRow < 0 || targetRow >= grid.length) return false;
-    if (targetCol < 0 || targetCol >= 7) return false;
-
-    final targetCell = grid[targetRow][targetCol];
-    return targetCell != null && targetCell.isCompleted;
-  }
-
-  int _getStartingWeekday(DateTime firstDay) {
-    return (firstDay.weekday - 1) % 7;
-  }
-
-  String _formatMonthYear(DateTime date) {
+  String _formatMonthYear(int year, int month) {
     const months = [
       'GENNAIO', 'FEBBRAIO', 'MARZO', 'APRILE', 'MAGGIO', 'GIUGNO',
       'LUGLIO', 'AGOSTO', 'SETTEMBRE', 'OTTOBRE', 'NOVEMBRE', 'DICEMBRE'
     ];
-    return '${months[date.month - 1]} ${date.year}';
+    return '${months[month - 1]} $year';
   }
 }
 
-/// Data class for calendar day cell
-class _DayCellData {
-  final int day;
-  final int row;
-  final int col;
-  final bool isCompleted;
-  final bool isMissed;
-  final bool isToday;
-  final bool isFuture;
-  final bool isBlocked;
+/// Header arrow for paging between months.
+class _MonthArrow extends StatelessWidget {
+  final IconData icon;
+  final VoidCallback? onTap;
 
-  _DayCellData({
-    required this.day,
-    required this.row,
-    required this.col,
-    required this.isCompleted,
-    required this.isMissed,
-    required this.isToday,
-    required this.isFuture,
-    required this.isBlocked,
-  });
+  const _MonthArrow({required this.icon, this.onTap});
+
+  @override
+  Widget build(BuildContext context) {
+    return GestureDetector(
+      onTap: onTap,
+      behavior: HitTestBehavior.opaque,
+      child: Padding(
+        padding: const EdgeInsets.symmetric(horizontal: 4),
+        child: Icon(
+          icon,
+          size: 18,
+          color: Colors.white.withOpacity(onTap == null ? 0.20 : 0.70),
+        ),
+      ),
+    );
+  }
 }
 
-/// Widget that draws connector lines between consecutive completed days
-class _MonthlyConnectorLines extends StatelessWidget {
-  final List<List<_DayCellData?>> gridData;
-  final Set<int> completedDays;
+/// Day grid of one month.
+///
+/// [_MonthGrid.of] hands out one widget instance per model, so rebuilding
+/// the calendar with the same model skips the whole grid subtree.
+class _MonthGrid extends StatelessWidget {
+  static final Expando<_MonthGrid> _instances = Expando('MonthGrid');
 
-  const _MonthlyConnectorLines({
-    required this.gridData,
-    required this.completedDays,
-  });
+  final MonthCalendarModel model;
+
+  const _MonthGrid._(this.model);
+
+  factory _MonthGrid.of(MonthCalendarModel model) =>
+      _instances[model] ??= _MonthGrid._(model);
 
   @override
   Widget build(BuildContext context) {
-    return CustomPaint(
-      painter: _MonthlyConnectorPainter(
-        gridData: gridData,
-        completedDays: completedDays,
-      ),
-      size: const Size.fromHeight(280),
+    return Stack(
+      children: [
+        // Connector lines layer (behind cells)
+        CustomPaint(
+          painter: _MonthlyConnectorPainter(model: model),
+          size: const Size.fromHeight(280),
+        ),
+        // Day cells layer
+        Column(
+          mainAxisAlignment: MainAxisAlignment.spaceEvenly,
+          children: [
+            for (var row = 0; row < model.rowCount; row++)
+              Row(
+                mainAxisAlignment: MainAxisAlignment.spaceAround,
+                children: [
+                  for (var col = 0; col < 7; col++) _buildCell(model.dayAt(row, col)),
+                ],
+              ),
+          ],
+        ),
+      ],
+    );
+  }
+
+  Widget _buildCell(int day) {
+    if (day == 0) {
+      return const SizedBox(width: 32, height: 32);
+    }
+
+    return _CalendarDayCell(
+      day: day,
+      isCompleted: model.isCompleted(day),
+      isMissed: model.isMissed(day),
+      isToday: model.today == day,
+      isFuture: model.isFuture(day),
+      isBlocked: model.isBlocked(day),
+      isConnectedLeft: model.connectsLeft(day),
+      isConnectedRight: model.connectsRight(day),
+      isConnectedUp: model.connectsUp(day),
+      isConnectedDown: model.connectsDown(day),
     );
   }
 }
 
 /// Custom painter for drawing connector lines between completed days
 class _MonthlyConnectorPainter extends CustomPainter {
-  final List<List<_DayCellData?>> gridData;
-  final Set<int> completedDays;
+  final MonthCalendarModel model;
 
-  _MonthlyConnectorPainter({
-    required this.gridData,
-    required this.completedDays,
-  });
+  _MonthlyConnectorPainter({required this.model});
 
   @override
   void paint(Canvas canvas, Size size) {
+    if (model.connectRightMask == 0 && model.connectDownMask == 0) return;
+
     final linePaint = Paint()
       ..color = const Color(0xFFFF7A18)
       ..strokeWidth = 4
@@ -300,49 +228,27 @@ class _MonthlyConnectorPainter extends CustomPainter {
     final startX = (size.width - totalWidth) / 2 + cellSize / 2;
     final startY = 30.0; // Approximate top offset after header
 
-    // Draw lines between adjacent completed cells
-    for (int row = 0; row < gridData.length; row++) {
-      for (int col = 0; col < 7; col++) {
-        final cell = gridData[row][col];
-        if (cell == null || !cell.isCompleted) continue;
-
-        final center = Offset(
-          startX + col * (cellSize + spacing),
-          startY + row * (cellSize + rowSpacing),
+    Offset centerOf(int day) => Offset(
+          startX + model.columnOf(day) * (cellSize + spacing),
+          startY + model.rowOf(day) * (cellSize + rowSpacing),
         );
 
-        // Check right neighbor
-        if (col + 1 < 7) {
-          final rightCell = gridData[row][col + 1];
-          if (rightCell != null && rightCell.isCompleted) {
-            final rightCenter = Offset(
-              startX + (col + 1) * (cellSize + spacing),
-              startY + row * (cellSize + rowSpacing),
-            );
-            canvas.drawLine(center, rightCenter, glowPaint);
-            canvas.drawLine(center, rightCenter, linePaint);
-          }
-        }
-
-        // Check bottom neighbor
-        if (row + 1 < gridData.length) {
-          final bottomCell = gridData[row + 1][col];
-          if (bottomCell != null && bottomCell.isCompleted) {
-            final bottomCenter = Offset(
-              startX + col * (cellSize + spacing),
-              startY + (row + 1) * (cellSize + rowSpacing),
-            );
-            canvas.drawLine(center, bottomCenter, glowPaint);
-            canvas.drawLine(center, bottomCenter, linePaint);
-          }
-        }
+    // Draw lines between adjacent completed cells
+    for (var day = 1; day <= model.daysInMonth; day++) {
+      if (model.connectsRight(day)) {
+        canvas.drawLine(centerOf(day), centerOf(day + 1), glowPaint);
+        canvas.drawLine(centerOf(day), centerOf(day + 1), linePaint);
+      }
+      if (model.connectsDown(day)) {
+        canvas.drawLine(centerOf(day), centerOf(day + 7), glowPaint);
+        canvas.drawLine(centerOf(day), centerOf(day + 7), linePaint);
       }
     }
   }
 
   @override
   bool shouldRepaint(covariant _MonthlyConnectorPainter oldDelegate) {
-    return oldDelegate.completedDays != completedDays;
+    return !identical(oldDelegate.model, model);
   }
 }
 
@@ -0,0 +1,109 @@
+@Tags(['benchmark'])
+library;
+
+import 'package:flutter/foundation.dart';
+import 'package:flutter_test/flutter_test.dart';
+import 'package:push_up_5050/models/achievement.dart';
+import 'package:push_up_5050/services/achievement_engine.dart';
+
+/// Reps per simulated session; crosses every single-day threshold.
+const _sessionReps = 600;
+
+/// Sessions timed per strategy, after as many warm-up sessions.
+const _sessions = 40;
+
+/// Totals before the session, so the all-time and monthly stats move too.
+const _todayBefore = 0;
+const _allTimeBefore = 40;
+const _monthBefore = 400;
+
+/// Median evaluation cost per rep of a session, in nanoseconds.
+///
+/// [prepare] gets a fresh catalog and does any setup, untimed; the session
+/// it returns evaluates every rep and returns the number of unlocks.
+({double nanosPerRep, int unlocks}) _measurePerRep(
+  int Function() Function(List<Achievement> catalog) prepare,
+) {
+  var unlocks = 0;
+  for (var i = 0; i < _sessions; i++) {
+    unlocks = prepare(Achievement.getAllAchievements())();
+  }
+
+  final samples = <int>[];
+  final stopwatch = Stopwatch();
+  for (var i = 0; i < _sessions; i++) {
+    final session = prepare(Achievement.getAllAchievements());
+    stopwatch
+      ..reset()
+      ..start();
+    session();
+    stopwatch.stop();
+    samples.add(stopwatch.elapsedMicroseconds);
+  }
+
+  samples.sort();
+  return (
+    nanosPerRep: samples[samples.length ~/ 2] * 1000 / _sessionReps,
+    unlocks: unlocks,
+  );
+}
+
+/// Every rep checks every locked condition against a stats map.
+int Function() _legacySession(List<Achievement> catalog) => () {
+      var unlocks = 0;
+      for (var rep = 1; rep <= _sessionReps; rep++) {
+        final stats = {
+          'totalPushups': _todayBefore + rep,
+          'totalPushupsAllTime': _allTimeBefore + rep,
+          'currentStreak': 3,
+          'maxRepsInOneSeries': 0,
+          'maxPushupsInOneDay': _todayBefore + rep,
+          'daysCompleted': 12,
+          'monthlyPushups': _monthBefore + rep,
+          'maxConsecutiveSeries': 0,
+          'totalPoints': 0,
+        };
+        for (final achievement in catalog) {
+          if (achievement.checkUnlock(stats)) unlocks++;
+        }
+      }
+      return unlocks;
+    };
+
+/// Every rep is a push-up totals event against the threshold index, built
+/// once per session before timing starts.
+int Function() _engineSession(List<Achievement> catalog) {
+  final engine = AchievementEngine(catalog);
+  return () {
+    var unlocks = 0;
+    for (var rep = 1; rep <= _sessionReps; rep++) {
+      unlocks += engine
+          .apply(AchievementEvent([
+            StatChange(AchievementStat.totalPushups, _todayBefore + rep),
+            StatChange(AchievementStat.maxPushupsInOneDay, _todayBefore + rep),
+            StatChange(AchievementStat.totalPushupsAllTime, _allTimeBefore + rep),
+            StatChange(AchievementStat.monthlyPushups, _monthBefore + rep),
+          ]))
+          .length;
+    }
+    return unlocks;
+  };
+}
+
+void main() {
+  test('per-rep achievement evaluation over the full catalog', () {
+    final legacy = _measurePerRep(_legacySession);
+    final engine = _measurePerRep(_engineSession);
+
+    debugPrint('Achievement evaluation per rep '
+        '(${Achievement.getAllAchievements().length} achievements, '
+        '$_sessionReps reps):');
+    debugPrint('  legacy conditions: ${legacy.nanosPerRep.toStringAsFixed(0)}ns');
+    debugPrint('  threshold index:   ${engine.nanosPerRep.toStringAsFixed(0)}ns');
+
+    // Both unlock the same achievements over the session
+    expect(engine.unlocks, legacy.unlocks);
+    expect(engine.unlocks, greaterThan(0));
+    expect(engine.nanosPerRep, lessThan(legacy.nanosPerRep));
+  });
+}
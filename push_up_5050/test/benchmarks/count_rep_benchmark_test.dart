@@ -0,0 +1,49 @@
+@Tags(['benchmark'])
+library;
+
+import 'package:flutter/foundation.dart';
+import 'package:flutter_test/flutter_test.dart';
+import 'package:push_up_5050/providers/active_workout_provider.dart';
+import 'package:push_up_5050/repositories/storage_service.dart';
+import 'package:push_up_5050/services/widget_update_service.dart';
+import 'package:shared_preferences/shared_preferences.dart';
+
+void main() {
+  TestWidgetsFlutterBinding.ensureInitialized();
+
+  test('countRep latency stays well under a millisecond', () async {
+    SharedPreferences.setMockInitialValues({});
+    final storage = StorageService.forTesting(await SharedPreferences.getInstance());
+    final provider = ActiveWorkoutProvider(
+      storage: storage,
+      widgetUpdateService: WidgetUpdateService(),
+    );
+    await provider.startWorkout(startingSeries: 1, restTime: 10);
+
+    // Warm up before measuring
+    for (int i = 0; i < 500; i++) {
+      provider.countRep();
+    }
+
+    final stopwatch = Stopwatch();
+    final latencies = <int>[];
+    for (int i = 0; i < 5000; i++) {
+      stopwatch
+        ..reset()
+        ..start();
+      provider.countRep();
+      stopwatch.stop();
+      latencies.add(stopwatch.elapsedMicroseconds);
+    }
+    await provider.flushSession();
+
+    latencies.sort();
+    final p50 = latencies[latencies.length ~/ 2];
+    final p99 = latencies[(latencies.length * 99) ~/ 100];
+    debugPrint('countRep latency: p50=${p50}us p99=${p99}us '
+        '(${latencies.length} reps)');
+
+    expect(provider.session?.totalReps, 5500);
+    expect(p99, lessThan(1000));
+  });
+}
@@ -0,0 +1,230 @@
+@Tags(['benchmark'])
+library;
+
+import 'dart:convert';
+import 'dart:io';
+
+import 'package:flutter/foundation.dart';
+import 'package:flutter_test/flutter_test.dart';
+import 'package:push_up_5050/providers/active_workout_provider.dart';
+import 'package:push_up_5050/providers/goals_provider.dart';
+import 'package:push_up_5050/providers/user_stats_provider.dart';
+import 'package:push_up_5050/repositories/storage_service.dart';
+import 'package:push_up_5050/services/widget_calendar_service.dart';
+import 'package:push_up_5050/services/widget_update_service.dart';
+import 'package:shared_preferences/shared_preferences.dart';
+
+import 'history_dataset.dart';
+
+/// History sizes to benchmark, in years.
+const _sizes = [1, 5, 12];
+
+/// Committed baseline; regenerate with UPDATE_BENCHMARK_BASELINE=1 on the
+/// reference machine and commit the result. Paths missing from it are
+/// recorded into it on the next run instead of being compared.
+const _baselinePath = 'test/benchmarks/history_benchmark_baseline.json';
+
+/// Results of the last run (not committed).
+const _resultsPath = 'build/benchmarks/history_benchmark_results.json';
+
+/// Allowed slowdown over the baseline before the run fails.
+const _defaultThresholdPercent = 50;
+
+/// Slowdowns below this are treated as noise regardless of percentage.
+const _minRegressionMicros = 200;
+
+/// Time [body] over [iterations] runs after a warm-up.
+///
+/// Reports the median wall time and the resident set growth per run, which
+/// is the closest allocation measure available under `flutter test`.
+Future<Map<String, num>> _measure(
+  Future<void> Function() body, {
+  int iterations = 15,
+  Future<void> Function()? before,
+}) async {
+  for (var i = 0; i < 3; i++) {
+    if (before != null) await before();
+    await body();
+  }
+
+  final samples = <int>[];
+  final stopwatch = Stopwatch();
+  final rssBefore = ProcessInfo.currentRss;
+  for (var i = 0; i < iterations; i++) {
+    if (before != null) await before();
+    stopwatch
+      ..reset()
+      ..start();
+    await body();
+    stopwatch.stop();
+    samples.add(stopwatch.elapsedMicroseconds);
+  }
+  final rssDelta = ProcessInfo.currentRss - rssBefore;
+
+  samples.sort();
+  return {
+    'medianMicros': samples[samples.length ~/ 2],
+    'maxMicros': samples.last,
+    'rssDeltaBytesPerRun': rssDelta ~/ iterations,
+  };
+}
+
+void main() {
+  TestWidgetsFlutterBinding.ensureInitialized();
+
+  final results = <String, Map<String, Map<String, num>>>{};
+
+  test('dataset generator is deterministic and realistic', () {
+    final end = DateTime(2026, 3, 15);
+    final a = HistoryDataset.generate(years: 5, endDate: end);
+    final b = HistoryDataset.generate(years: 5, endDate: end);
+
+    expect(jsonEncode(a.toPrefs()), jsonEncode(b.toPrefs()));
+
+    // Gaps, streaks and bonus days are all present
+    final dates = a.records.values.map((r) => r.date).toList();
+    var longestGap = 0;
+    var longestStreak = 1;
+    var streak = 1;
+    for (var i = 1; i < dates.length; i++) {
+      final gap = (dates[i].difference(dates[i - 1]).inHours / 24).round();
+      longestGap = gap > longestGap ? gap : longestGap;
+      streak = gap == 1 ? streak + 1 : 1;
+      longestStreak = streak > longestStreak ? streak : longestStreak;
+    }
+    expect(longestGap, greaterThan(3));
+    expect(longestStreak, greaterThan(30));
+    expect(a.records.values.where((r) => r.pointsEarned > r.totalPushups * 2), isNotEmpty);
+    expect(a.achievements, isNotEmpty);
+    expect(a.completionTimes.length, 90);
+  });
+
+  for (final years in _sizes) {
+    test('benchmark history paths with $years years of records', () async {
+      final today = DateTime.now();
+      final dataset = HistoryDataset.generate(years: years, endDate: today);
+      SharedPreferences.setMockInitialValues(dataset.toPrefs());
+      final storage = StorageService.forTesting(await SharedPreferences.getInstance());
+
+      final widgetUpdateService = WidgetUpdateService(
+        calendarService: WidgetCalendarService(storage: storage),
+      );
+      final statsProvider = UserStatsProvider(
+        storage: storage,
+        widgetUpdateService: widgetUpdateService,
+      );
+      final goalsProvider = GoalsProvider(storage: storage);
+      final workoutProvider = ActiveWorkoutProvider(
+        storage: storage,
+        widgetUpdateService: widgetUpdateService,
+      );
+
+      // First access migrates the legacy records into the history store
+      final migration = Stopwatch()..start();
+      await storage.loadHistoryIndex();
+      migration.stop();
+
+      final paths = <String, Map<String, num>>{
+        'migration': {'medianMicros': migration.elapsedMicroseconds},
+        'getUserStats': await _measure(storage.getUserStats),
+        'calculateCurrentStreak': await _measure(storage.calculateCurrentStreak),
+        'calculateWeeklyStreak': await _measure(storage.calculateWeeklyStreak),
+        'loadStats': await _measure(statsProvider.loadStats),
+        'monthAndCalendarGetters': await _measure(() async {
+          statsProvider.monthlyCompletedDays;
+          statsProvider.monthlyMissedDays;
+          statsProvider.monthlyBlockedDays;
+          statsProvider.weekSeries;
+        }),
+        'refreshGoals': await _measure(goalsProvider.refreshGoals),
+        'endWorkout': await _measure(
+          workoutProvider.endWorkout,
+          before: () async {
+            await workoutProvider.startWorkout(startingSeries: 1, restTime: 10);
+            for (var i = 0; i < 3; i++) {
+              workoutProvider.countRep();
+            }
+          },
+        ),
+        'buildWidgetData': await _measure(() => widgetUpdateService.buildWidgetData(
+              todayPushups: 10,
+              totalPushups: 1000,
+              streakDays: 3,
+            )),
+      };
+      results['${years}y'] = paths;
+
+      // Sanity check the dataset actually reached the code under test
+      expect(statsProvider.totalPushupsAllTime, greaterThan(0));
+      expect(dataset.records.length, greaterThan(years * 100));
+
+      debugPrint('History benchmark ${years}y (${dataset.records.length} records):');
+      for (final entry in paths.entries) {
+        debugPrint('  ${entry.key}: ${entry.value}');
+      }
+    }, timeout: const Timeout(Duration(minutes: 5)));
+  }
+
+  test('no history path regressed beyond the baseline threshold', () async {
+    final resultsFile = File(_resultsPath);
+    await resultsFile.parent.create(recursive: true);
+    await resultsFile.writeAsString(
+      const JsonEncoder.withIndent('  ').convert({'results': results}),
+    );
+
+    final baselineFile = File(_baselinePath);
+    if (Platform.environment['UPDATE_BENCHMARK_BASELINE'] == '1') {
+      await baselineFile.writeAsString(const JsonEncoder.withIndent('  ').convert({
+        'thresholdPercent': _defaultThresholdPercent,
+        'results': results,
+      }));
+      debugPrint('History benchmark baseline written to $_baselinePath');
+      return;
+    }
+    expect(baselineFile.existsSync(), isTrue,
+        reason: '$_baselinePath is missing; record it with '
+            'UPDATE_BENCHMARK_BASELINE=1');
+
+    final baseline =
+        jsonDecode(await baselineFile.readAsString()) as Map<String, dynamic>;
+    final thresholdPercent =
+        baseline['thresholdPercent'] as int? ?? _defaultThresholdPercent;
+    final baselineResults = baseline['results'] as Map<String, dynamic>;
+
+    final regressions = <String>[];
+    final recorded = <String>[];
+    for (final size in results.entries) {
+      final baselinePaths = (baselineResults[size.key] ??= <String, dynamic>{})
+          as Map<String, dynamic>;
+
+      for (final path in size.value.entries) {
+        final reference =
+            (baselinePaths[path.key] as Map<String, dynamic>?)?['medianMicros'] as num?;
+        if (reference == null) {
+          // Nothing to compare against yet: record this run as the baseline
+          baselinePaths[path.key] = path.value;
+          recorded.add('${size.key} ${path.key}');
+          continue;
+        }
+
+        final current = path.value['medianMicros']!;
+        final limit = reference * (100 + thresholdPercent) / 100;
+        if (current > limit && current - reference > _minRegressionMicros) {
+          regressions.add('${size.key} ${path.key}: ${current}us '
+              '(baseline ${reference}us, limit +$thresholdPercent%)');
+        }
+      }
+    }
+
+    if (recorded.isNotEmpty) {
+      await baselineFile.writeAsString(const JsonEncoder.withIndent('  ').convert({
+        'thresholdPercent': thresholdPercent,
+        'results': baselineResults,
+      }));
+      debugPrint('History benchmark: no baseline for ${recorded.join(', ')}; '
+          'recorded this run in $_baselinePath, commit it');
+    }
+
+    expect(regressions, isEmpty, reason: regressions.join('\n'));
+  });
+}
@@ -0,0 +1,146 @@
+import 'dart:convert';
+import 'dart:math' as math;
+
+import 'package:push_up_5050/core/utils/calculator.dart';
+import 'package:push_up_5050/models/achievement.dart';
+import 'package:push_up_5050/models/daily_record.dart';
+import 'package:push_up_5050/models/notification_time_slot.dart';
+
+/// Deterministic synthetic workout history for scaling tests.
+///
+/// Simulates a user alternating between streaks (training almost every day)
+/// and gaps (vacations, lapses), with weekly challenge bonus days, achievements
+/// unlocked along the way and workout completion times clustered around a
+/// preferred hour. The same [seed] always produces the same dataset.
+class HistoryDataset {
+  /// Last day of the history (usually today).
+  final DateTime endDate;
+
+  /// Number of years covered.
+  final int years;
+
+  /// Daily records keyed by YYYY-MM-DD.
+  final Map<String, DailyRecord> records;
+
+  /// Achievement JSON keyed by ID, as stored by StorageService.
+  final Map<String, dynamic> achievements;
+
+  /// Most recent workout completion times (at most 90, like StorageService).
+  final List<NotificationTimeSlot> completionTimes;
+
+  HistoryDataset._(
+    this.endDate,
+    this.years,
+    this.records,
+    this.achievements,
+    this.completionTimes,
+  );
+
+  /// Generate [years] of history ending at [endDate].
+  factory HistoryDataset.generate({
+    required int years,
+    required DateTime endDate,
+    int seed = 5050,
+    int dailyGoal = 50,
+  }) {
+    final random = math.Random(seed);
+    final end = DateTime(endDate.year, endDate.month, endDate.day);
+    final start = DateTime(end.year - years, end.month, end.day);
+
+    final records = <String, DailyRecord>{};
+    final completionTimes = <NotificationTimeSlot>[];
+    final preferredHour = 7 + random.nextInt(12);
+
+    var inStreak = true;
+    var phaseDaysLeft = 5 + random.nextInt(40);
+    var streak = 0;
+    var weekTotal = 0;
+
+    for (var day = start; !day.isAfter(end); day = DateTime(day.year, day.month, day.day + 1)) {
+      if (day.weekday == DateTime.monday) weekTotal = 0;
+
+      if (phaseDaysLeft-- <= 0) {
+        inStreak = !inStreak;
+        phaseDaysLeft = inStreak ? 5 + random.nextInt(60) : 1 + random.nextInt(10);
+      }
+
+      // Occasional skipped day inside a streak, rare workouts inside a gap
+      final active = inStreak ? random.nextDouble() < 0.95 : random.nextDouble() < 0.1;
+      if (!active) {
+        streak = 0;
+        continue;
+      }
+      streak++;
+
+      final series = 3 + random.nextInt(12);
+      final pushups = series * (series + 1) ~/ 2;
+      weekTotal += pushups;
+
+      // Weekly challenge bonus on Sundays of strong weeks
+      final bonusDay = day.weekday == DateTime.sunday && weekTotal >= dailyGoal * 7;
+      final multiplier = Calculator.getDayStreakMultiplier(streak);
+      final basePoints = (pushups * multiplier).round();
+
+      records[_dateKey(day)] = DailyRecord(
+        date: day,
+        totalPushups: pushups,
+        seriesCompleted: series,
+        pointsEarned: bonusDay ? basePoints + 100 : basePoints,
+        multiplier: multiplier,
+        goalReached: pushups >= dailyGoal,
+      );
+
+      final minuteOfDay = (preferredHour * 60 + random.nextInt(120) - 60).clamp(0, 24 * 60 - 1);
+      completionTimes.add(NotificationTimeSlot.fromTimestamp(
+        DateTime(day.year, day.month, day.day, minuteOfDay ~/ 60, minuteOfDay % 60),
+      ));
+    }
+
+    // Unlock achievements deterministically, earliest ones first
+    final achievements = <String, dynamic>{};
+    final all = Achievement.getAllAchievements();
+    final unlockedCount = math.min(all.length, 3 + years * 2);
+    final recordDates = records.values.map((r) => r.date).toList();
+    for (var i = 0; i < unlockedCount && recordDates.isNotEmpty; i++) {
+      final achievement = all[i]
+        ..isUnlocked = true
+        ..unlockedAt = recordDates[(recordDates.length * i) ~/ unlockedCount];
+      achievements[achievement.id] = achievement.toJson();
+    }
+
+    return HistoryDataset._(
+      end,
+      years,
+      records,
+      achievements,
+      completionTimes.length > 90
+          ? completionTimes.sublist(completionTimes.length - 90)
+          : completionTimes,
+    );
+  }
+
+  /// First day with a record.
+  DateTime? get firstRecordDate =>
+      records.isEmpty ? null : records.values.first.date;
+
+  /// Initial values for `SharedPreferences.setMockInitialValues`.
+  ///
+  /// Records are stored under the legacy daily records key, so the first
+  /// StorageService access also exercises the migration to the history store.
+  Map<String, Object> toPrefs({int dailyGoal = 50}) {
+    return {
+      'daily_records': jsonEncode(
+        records.map((key, record) => MapEntry(key, record.toJson())),
+      ),
+      'achievements': jsonEncode(achievements),
+      'workout_completion_times':
+          jsonEncode(completionTimes.map((slot) => slot.toJson()).toList()),
+      'daily_goal': dailyGoal,
+      'onboarding_completed': true,
+      if (firstRecordDate != null) 'program_start_date': _dateKey(firstRecordDate!),
+    };
+  }
+
+  static String _dateKey(DateTime date) =>
+      '${date.year}-${date.month.toString().padLeft(2, '0')}-${date.day.toString().padLeft(2, '0')}';
+}
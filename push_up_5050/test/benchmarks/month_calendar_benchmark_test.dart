@@ -0,0 +1,37 @@
+@Tags(['benchmark'])
+library;
+
+import 'package:flutter/foundation.dart';
+import 'package:flutter_test/flutter_test.dart';
+import 'package:push_up_5050/models/daily_record.dart';
+import 'package:push_up_5050/models/month_calendar.dart';
+import 'package:push_up_5050/repositories/history_index.dart';
+
+void main() {
+  test('paging through 12 years of calendar months', () {
+    final today = DateTime(2026, 3, 20, 15, 30);
+    final history = HistoryIndex.empty();
+    for (var day = DateTime(2014, 1, 1);
+        day.isBefore(DateTime(2026, 3, 20));
+        day = DateTime(day.year, day.month, day.day + 1)) {
+      if (day.day % 5 != 0) history.put(DailyRecord(date: day, totalPushups: 30));
+    }
+
+    final cache = MonthCalendarCache();
+    final stopwatch = Stopwatch()..start();
+    // Scroll back 12 years and forward again, rebuilding every frame
+    for (var pass = 0; pass < 2; pass++) {
+      for (var i = 0; i < 12 * 12; i++) {
+        final month = DateTime(2026, 3 - (pass == 0 ? i : 143 - i));
+        for (var frame = 0; frame < 10; frame++) {
+          cache.get(history, month, today: today);
+        }
+      }
+    }
+    stopwatch.stop();
+
+    debugPrint('Month calendar paging: ${stopwatch.elapsedMilliseconds}ms '
+        '(${cache.misses} builds, ${cache.hits} hits)');
+    expect(stopwatch.elapsedMilliseconds, lessThan(1000));
+  });
+}
@@ -0,0 +1,221 @@
+import 'package:flutter_test/flutter_test.dart';
+import 'package:push_up_5050/models/daily_record.dart';
+import 'package:push_up_5050/models/month_calendar.dart';
+import 'package:push_up_5050/repositories/history_index.dart';
+
+HistoryIndex _history(Map<DateTime, int> pushups) {
+  final index = HistoryIndex.empty();
+  for (final entry in pushups.entries) {
+    index.put(DailyRecord(date: entry.key, totalPushups: entry.value));
+  }
+  return index;
+}
+
+void main() {
+  // March 2026 starts on a Sunday, so it spans six weeks
+  final march = DateTime(2026, 3);
+  final today = DateTime(2026, 3, 20, 15, 30);
+
+  late HistoryIndex history;
+
+  setUp(() {
+    history = _history({
+      DateTime(2026, 3, 3): 10,
+      DateTime(2026, 3, 4): 20,
+      DateTime(2026, 3, 5): 0,
+      DateTime(2026, 3, 10): 15,
+      DateTime(2026, 3, 17): 5,
+    });
+  });
+
+  group('MonthCalendarModel', () {
+    test('should classify days like the statistics calendar', () {
+      final model = MonthCalendarModel.build(
+        history,
+        march,
+        today: today,
+        lastRecordDate: history.lastRecordOnOrBefore(today),
+      );
+
+      expect(model.daysInMonth, 31);
+      expect(model.firstColumn, 6);
+      expect(model.rowCount, 6);
+      expect(model.today, 20);
+      expect(model.completedDays, {3, 4, 10, 17});
+      expect(model.blockedDays, {1, 2});
+      // Only days after the last workout and before today are missed
+      expect(model.missedDays, {18, 19});
+      expect(model.isFuture(21), isTrue);
+      expect(model.isFuture(20), isFalse);
+      expect(model.pushupsOn(4), 20);
+      expect(model.pushupsOn(5), 0);
+    });
+
+    test('should connect consecutive completed days', () {
+      final model = MonthCalendarModel.build(history, march, today: today);
+
+      expect(model.connectsRight(3), isTrue);
+      expect(model.connectsLeft(4), isTrue);
+      expect(model.connectsDown(3), isTrue);
+      expect(model.connectsDown(10), isTrue);
+      expect(model.connectsUp(17), isTrue);
+      expect(model.connectsRight(4), isFalse);
+    });
+
+    test('should not connect across the end of a row', () {
+      // 2026-03-08 is a Sunday (last column), 9 starts the next row
+      final model = MonthCalendarModel.build(
+        _history({DateTime(2026, 3, 8): 10, DateTime(2026, 3, 9): 10}),
+        march,
+        today: today,
+      );
+
+      expect(model.columnOf(8), 6);
+      expect(model.connectsRight(8), isFalse);
+      expect(model.dayAt(0, 6), 1);
+      expect(model.dayAt(0, 0), 0);
+    });
+
+    test('should count every gap after the first record in past months', () {
+      final february = MonthCalendarModel.build(
+        _history({
+          DateTime(2026, 2, 10): 10,
+          DateTime(2026, 2, 11): 10,
+          DateTime(2026, 2, 14): 10,
+          DateTime(2026, 2, 20): 10,
+          ...{for (var day = 1; day <= 20; day++) DateTime(2026, 3, day): 10},
+        }),
+        DateTime(2026, 2),
+        today: today,
+        lastRecordDate: DateTime(2026, 3, 20),
+      );
+
+      expect(february.blockedDays, {for (var day = 1; day < 10; day++) day});
+      // Gaps between workouts and after the last one of the month
+      expect(february.missedDays, {
+        12, 13, 15, 16, 17, 18, 19,
+        for (var day = 21; day <= 28; day++) day,
+      });
+    });
+
+    test('should be empty for a month without records', () {
+      final model = MonthCalendarModel.build(history, DateTime(2026, 1), today: today);
+
+      expect(model.completedDays, isEmpty);
+      expect(model.missedDays, isEmpty);
+      expect(model.blockedDays, isEmpty);
+      expect(model.today, 0);
+    });
+  });
+
+  group('MonthCalendarCache', () {
+    test('should return the same model until the month changes', () {
+      final cache = MonthCalendarCache();
+      final first = cache.get(history, march, today: today);
+
+      expect(cache.get(history, march, today: today), same(first));
+      expect(cache.hits, 1);
+
+      // A record in another month leaves March untouched
+      history.put(DailyRecord(date: DateTime(2026, 1, 5), totalPushups: 10));
+      expect(cache.get(history, march, today: today), same(first));
+
+      // A record in March rebuilds it
+      history.put(DailyRecord(date: DateTime(2026, 3, 19), totalPushups: 10));
+      final updated = cache.get(history, march, today: today);
+      expect(updated, isNot(same(first)));
+      expect(updated.missedDays, isEmpty);
+    });
+
+    test('should rebuild when the last workout moves into the month', () {
+      final cache = MonthCalendarCache();
+      final april = cache.get(history, DateTime(2026, 4), today: DateTime(2026, 4, 3));
+
+      history.put(DailyRecord(date: DateTime(2026, 4, 1), totalPushups: 10));
+      expect(cache.get(history, DateTime(2026, 4), today: DateTime(2026, 4, 3)),
+          isNot(same(april)));
+    });
+
+    test('should keep past months across days', () {
+      final cache = MonthCalendarCache();
+      final february = cache.get(history, DateTime(2026, 2), today: today);
+
+      expect(
+        cache.get(history, DateTime(2026, 2), today: today.add(const Duration(days: 1))),
+        same(february),
+      );
+      // The current month depends on today
+      final current = cache.get(history, march, today: today);
+      expect(
+        cache.get(history, march, today: today.add(const Duration(days: 1))),
+        isNot(same(current)),
+      );
+    });
+
+    test('should show gaps when paging back to a past month', () {
+      final cache = MonthCalendarCache();
+      history.put(DailyRecord(date: DateTime(2026, 2, 2), totalPushups: 10));
+      history.put(DailyRecord(date: DateTime(2026, 2, 5), totalPushups: 10));
+
+      cache.get(history, march, today: today);
+      final february = cache.get(history, DateTime(2026, 2), today: today);
+
+      expect(february.missedDays, {3, 4, for (var day = 6; day <= 28; day++) day});
+      expect(february.blockedDays, {1});
+    });
+
+    test('should rebuild for a different history instance', () {
+      final cache = MonthCalendarCache();
+      final first = cache.get(history, march, today: today);
+
+      final reloaded = HistoryIndex.fromJson(history.toJson())!;
+      expect(cache.get(reloaded, march, today: today), isNot(same(first)));
+    });
+
+    test('should evict the least recently used month', () {
+      final cache = MonthCalendarCache(capacity: 2);
+      final january = cache.get(history, DateTime(2026, 1), today: today);
+      cache.get(history, DateTime(2026, 2), today: today);
+      cache.get(history, DateTime(2026, 1), today: today);
+      cache.get(history, march, today: today);
+
+      expect(cache.length, 2);
+      expect(cache.get(history, DateTime(2026, 1), today: today), same(january));
+      expect(cache.misses, 3);
+
+      cache.get(history, DateTime(2026, 2), today: today);
+      expect(cache.misses, 4);
+    });
+
+    test('should only build months outside the paging window', () {
+      final big = HistoryIndex.empty();
+      for (var day = DateTime(2014, 1, 1);
+          day.isBefore(DateTime(2026, 3, 20));
+          day = DateTime(day.year, day.month, day.day + 1)) {
+        if (day.day % 5 != 0) big.put(DailyRecord(date: day, totalPushups: 30));
+      }
+      final cache = MonthCalendarCache();
+
+      // Back and forth within the last year, rebuilding every frame
+      for (final i in [...List.generate(12, (i) => i), ...List.generate(12, (i) => 11 - i)]) {
+        for (var frame = 0; frame < 10; frame++) {
+          cache.get(big, DateTime(2026, 3 - i), today: today);
+        }
+      }
+      expect(cache.misses, 12);
+
+      // Back 12 years and forward again: only the last 12 months on the
+      // way back are still cached on the way forward
+      cache.misses = 0;
+      for (var pass = 0; pass < 2; pass++) {
+        for (var i = 0; i < 12 * 12; i++) {
+          final month = DateTime(2026, 3 - (pass == 0 ? i : 143 - i));
+          for (var frame = 0; frame < 10; frame++) {
+            cache.get(big, month, today: today);
+          }
+        }
+      }
+      expect(cache.misses, 132 + 132);
+    });
+  });
+}
@@ -58,6 +58,14 @@ class FakeStorageServiceForAchievements implements StorageService {
     _saveCount++;
   }
 
+  @override
+  Future<void> saveAchievements(Iterable<Achievement> achievements) async {
+    for (final achievement in achievements) {
+      _achievements[achievement.id] = achievement.toJson();
+    }
+    _saveCount++;
+  }
+
   @override
   Future<void> saveActiveSession(WorkoutSession session) async {}
 
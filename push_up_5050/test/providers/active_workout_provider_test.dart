@@ -3,7 +3,9 @@ import 'package:push_up_5050/models/achievement.dart';
 import 'package:push_up_5050/models/daily_record.dart';
 import 'package:push_up_5050/models/workout_session.dart';
 import 'package:push_up_5050/providers/active_workout_provider.dart';
+import 'package:push_up_5050/repositories/history_index.dart';
 import 'package:push_up_5050/repositories/storage_service.dart';
+import 'package:push_up_5050/services/widget_update_service.dart';
 
 /// Fake StorageService for testing ActiveWorkoutProvider.
 class FakeStorageServiceForWorkout implements StorageService {
@@ -15,6 +17,9 @@ class FakeStorageServiceForWorkout implements StorageService {
   DailyRecord? _existingDailyRecord; // Record to return from getDailyRecord
   final List<DailyRecord> _savedDailyRecords = [];
 
+  /// When true, saveActiveSession throws.
+  bool failSessionSaves = false;
+
   void setActiveSession(WorkoutSession? session) {
     _activeSession = session;
   }
@@ -54,6 +59,16 @@ class FakeStorageServiceForWorkout implements StorageService {
   @override
   Future<DailyRecord?> getDailyRecord(DateTime date) async => _existingDailyRecord;
 
+  @override
+  Future<HistoryIndex> loadHistoryIndex() async {
+    final index = HistoryIndex.empty();
+    if (_existingDailyRecord != null) index.put(_existingDailyRecord!);
+    return index;
+  }
+
+  @override
+  int getDailyGoal() => 50;
+
   @override
   Future<Map<String, dynamic>> getUserStats() async => {};
 
@@ -75,8 +90,9 @@ class FakeStorageServiceForWorkout implements StorageService {
 
   @override
   Future<void> saveActiveSession(WorkoutSession session) async {
-    _activeSession = session;
     _saveSessionCount++;
+    if (failSessionSaves) throw StateError('storage unavailable');
+    _activeSession = session;
   }
 
   @override
@@ -117,6 +133,13 @@ class FakeStorageServiceForWorkout implements StorageService {
     _workoutPreferences = null;
     _programStartDate = null;
   }
+
+  @override
+  Future<void> saveWorkoutCompletionTime(DateTime timestamp) async {}
+
+  /// Members the provider does not use.
+  @override
+  dynamic noSuchMethod(Invocation invocation) => super.noSuchMethod(invocation);
 }
 
 void main() {
@@ -126,7 +149,10 @@ void main() {
 
     setUp(() {
       fakeStorage = FakeStorageServiceForWorkout();
-      provider = ActiveWorkoutProvider(storage: fakeStorage);
+      provider = ActiveWorkoutProvider(
+        storage: fakeStorage,
+        widgetUpdateService: WidgetUpdateService(),
+      );
     });
 
     test('initially has no active session', () {
@@ -174,20 +200,97 @@ void main() {
 
       expect(provider.session?.repsInCurrentSeries, 1);
       expect(provider.session?.totalReps, 1);
-      expect(fakeStorage.saveSessionCount, 1); // Auto-save after count
+      expect(fakeStorage.saveSessionCount, 0); // Write-behind, not yet saved
+
+      await provider.flushSession();
+
+      expect(fakeStorage.saveSessionCount, 1);
+    });
+
+    test('countRep coalesces many reps into one checkpoint', () async {
+      await provider.startWorkout(startingSeries: 50, restTime: 10);
+      fakeStorage.resetCounters();
+
+      for (int i = 0; i < 30; i++) {
+        provider.countRep();
+      }
+      await provider.flushSession();
+
+      expect(fakeStorage.saveSessionCount, 1);
+      expect(fakeStorage.getActiveSessionSaved()?.totalReps, 30);
+    });
+
+    test('countRep checkpoints within the interval without a flush', () async {
+      provider = ActiveWorkoutProvider(
+        storage: fakeStorage,
+        widgetUpdateService: WidgetUpdateService(),
+        checkpointInterval: const Duration(milliseconds: 20),
+      );
+      await provider.startWorkout(startingSeries: 5, restTime: 10);
+      fakeStorage.resetCounters();
+
+      provider.countRep();
+      provider.countRep();
+      await Future<void>.delayed(const Duration(milliseconds: 60));
+
+      expect(fakeStorage.saveSessionCount, 1);
+      expect(fakeStorage.getActiveSessionSaved()?.totalReps, 2);
+    });
+
+    test('dispose stops the checkpoint timer', () async {
+      provider = ActiveWorkoutProvider(
+        storage: fakeStorage,
+        widgetUpdateService: WidgetUpdateService(),
+        checkpointInterval: const Duration(milliseconds: 20),
+      );
+      await provider.startWorkout(startingSeries: 5, restTime: 10);
+      fakeStorage.resetCounters();
+
+      provider.countRep();
+      provider.dispose();
+      await Future<void>.delayed(const Duration(milliseconds: 60));
+
+      expect(fakeStorage.saveSessionCount, 0);
+    });
+
+    test('countRep detects the goal from the start-of-session snapshot', () async {
+      fakeStorage.setExistingDailyRecord(
+        DailyRecord(date: DateTime.now(), totalPushups: 48),
+      );
+      await provider.startWorkout(startingSeries: 5, restTime: 10, goalPushups: 50);
+
+      provider.countRep();
+      expect(provider.isGoalReached, isFalse);
+
+      provider.countRep();
+      expect(provider.isGoalReached, isTrue);
     });
 
     test('startRecovery sets recovery state and timer', () async {
       await provider.startWorkout(startingSeries: 1, restTime: 10);
       fakeStorage.resetCounters();
 
-      provider.startRecovery();
+      await provider.startRecovery();
 
       expect(provider.isRecovery, isTrue);
       expect(provider.recoverySecondsRemaining, 10);
       expect(fakeStorage.saveSessionCount, 1); // Save on state change
     });
 
+    test('startRecovery survives a failed checkpoint', () async {
+      await provider.startWorkout(startingSeries: 1, restTime: 10);
+      fakeStorage.setActiveSession(null);
+      fakeStorage.failSessionSaves = true;
+
+      await provider.startRecovery();
+      expect(provider.isRecovery, isTrue);
+
+      // The series is retried by the next checkpoint
+      fakeStorage.failSessionSaves = false;
+      await provider.flushSession();
+      expect(fakeStorage.getActiveSessionSaved(), isNotNull);
+    });
+
     test('endWorkout clears session and saves to storage', () async {
       await provider.startWorkout(startingSeries: 1, restTime: 10);
       fakeStorage.resetCounters();
@@ -0,0 +1,62 @@
+import 'package:flutter_test/flutter_test.dart';
+import 'package:push_up_5050/models/daily_record.dart';
+import 'package:push_up_5050/providers/user_stats_provider.dart';
+import 'package:push_up_5050/repositories/history_store.dart';
+import 'package:push_up_5050/repositories/storage_service.dart';
+import 'package:push_up_5050/services/widget_calendar_service.dart';
+import 'package:push_up_5050/services/widget_update_service.dart';
+import 'package:shared_preferences/shared_preferences.dart';
+
+/// In-memory backend recording which files are read.
+class _RecordingBackend extends MemoryHistoryStoreBackend {
+  final List<String> reads = [];
+
+  @override
+  Future<String?> read(String name) {
+    reads.add(name);
+    return super.read(name);
+  }
+}
+
+void main() {
+  group('UserStatsProvider with StorageService', () {
+    test('loadStats reads only the recent months of a long history', () async {
+      SharedPreferences.setMockInitialValues({});
+      final prefs = await SharedPreferences.getInstance();
+      final backend = _RecordingBackend();
+
+      final now = DateTime.now();
+      final today = DateTime(now.year, now.month, now.day);
+      final old = DateTime(today.year - 2, today.month, 10);
+      final writer = StorageService.forTesting(
+        prefs,
+        historyStore: HistoryStore(backend),
+      );
+      await writer.saveDailyRecord(DailyRecord(date: old, totalPushups: 80));
+      await writer.saveDailyRecord(DailyRecord(
+        date: today.subtract(const Duration(days: 1)),
+        totalPushups: 30,
+      ));
+      await writer.saveProgramStartDate(today.subtract(const Duration(days: 5)));
+
+      // Fresh store, nothing cached; widgets include the calendar data
+      backend.reads.clear();
+      final storage = StorageService.forTesting(prefs, historyStore: HistoryStore(backend));
+      final provider = UserStatsProvider(
+        storage: storage,
+        widgetUpdateService: WidgetUpdateService(
+          calendarService: WidgetCalendarService(storage: storage),
+        ),
+      );
+      await provider.loadStats();
+
+      final oldMonth = 'records-${old.year}-${old.month.toString().padLeft(2, '0')}';
+      expect(backend.reads.where((name) => name.startsWith(oldMonth)), isEmpty);
+
+      expect(provider.totalPushupsAllTime, 110);
+      expect(provider.last30DaysRecords, hasLength(30));
+      expect(provider.last30DaysRecords[28]?.totalPushups, 30);
+      expect(provider.last30DaysRecords.last, isNull);
+    });
+  });
+}
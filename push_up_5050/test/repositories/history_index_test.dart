@@ -0,0 +1,200 @@
+import 'package:flutter_test/flutter_test.dart';
+import 'package:push_up_5050/models/daily_record.dart';
+import 'package:push_up_5050/repositories/history_index.dart';
+
+void main() {
+  group('HistoryIndex - Totals', () {
+    test('should start empty', () {
+      final index = HistoryIndex.empty();
+
+      expect(index.isEmpty, true);
+      expect(index.totalPushups, 0);
+      expect(index.totalPoints, 0);
+      expect(index.firstRecordDate, isNull);
+      expect(index.lastRecordDate, isNull);
+    });
+
+    test('should accumulate totals on put', () {
+      final index = HistoryIndex.empty();
+
+      index.put(DailyRecord(date: DateTime(2025, 1, 14), totalPushups: 60, pointsEarned: 100));
+      index.put(DailyRecord(date: DateTime(2025, 1, 16), totalPushups: 30, pointsEarned: 40));
+
+      expect(index.totalPushups, 90);
+      expect(index.totalPoints, 140);
+      expect(index.goalReachedDays, 1);
+      expect(index.recordCount, 2);
+      expect(index.maxPushupsInOneDay, 60);
+      expect(index.firstRecordDate, DateTime(2025, 1, 14));
+      expect(index.lastRecordDate, DateTime(2025, 1, 16));
+    });
+
+    test('should replace an existing day instead of adding to it', () {
+      final index = HistoryIndex.empty();
+
+      index.put(DailyRecord(date: DateTime(2025, 1, 14), totalPushups: 30, pointsEarned: 10));
+      index.put(DailyRecord(date: DateTime(2025, 1, 14), totalPushups: 60, pointsEarned: 210));
+
+      expect(index.totalPushups, 60);
+      expect(index.totalPoints, 210);
+      expect(index.goalReachedDays, 1);
+      expect(index.recordCount, 1);
+    });
+
+    test('should extend backwards for records older than the origin', () {
+      final index = HistoryIndex.empty();
+
+      index.put(DailyRecord(date: DateTime(2025, 3, 1), totalPushups: 10));
+      index.put(DailyRecord(date: DateTime(2024, 12, 30), totalPushups: 20));
+
+      expect(index.firstRecordDate, DateTime(2024, 12, 30));
+      expect(index.pushupsOn(DateTime(2024, 12, 30)), 20);
+      expect(index.pushupsOn(DateTime(2025, 3, 1)), 10);
+      expect(index.sumPushups(DateTime(2024, 1, 1), DateTime(2025, 12, 31)), 30);
+    });
+  });
+
+  group('HistoryIndex - Ranges', () {
+    late HistoryIndex index;
+
+    setUp(() {
+      index = HistoryIndex.empty();
+      for (int day = 1; day <= 31; day++) {
+        index.put(DailyRecord(date: DateTime(2025, 1, day), totalPushups: day));
+      }
+      index.put(DailyRecord(date: DateTime(2025, 2, 1), totalPushups: 100));
+    });
+
+    test('should sum inclusive ranges', () {
+      expect(index.sumPushups(DateTime(2025, 1, 1), DateTime(2025, 1, 3)), 6);
+      expect(index.sumPushups(DateTime(2025, 1, 31), DateTime(2025, 2, 1)), 131);
+    });
+
+    test('should clamp ranges outside the indexed days', () {
+      expect(index.sumPushups(DateTime(2024, 1, 1), DateTime(2025, 1, 2)), 3);
+      expect(index.sumPushups(DateTime(2026, 1, 1), DateTime(2026, 2, 1)), 0);
+    });
+
+    test('should sum a calendar month', () {
+      expect(index.sumPushupsInMonth(DateTime(2025, 1, 20)), 496);
+      expect(index.sumPushupsInMonth(DateTime(2025, 2, 10)), 100);
+    });
+
+    test('should refresh range sums after an update', () {
+      expect(index.sumPushupsInMonth(DateTime(2025, 1, 1)), 496);
+
+      index.put(DailyRecord(date: DateTime(2025, 1, 10), totalPushups: 0));
+
+      expect(index.sumPushupsInMonth(DateTime(2025, 1, 1)), 486);
+      expect(index.activeDays(DateTime(2025, 1, 1), DateTime(2025, 1, 31)), 30);
+      expect(index.recordDays(DateTime(2025, 1, 1), DateTime(2025, 1, 31)), 31);
+    });
+  });
+
+  group('HistoryIndex - Streaks', () {
+    final today = DateTime(2025, 6, 18); // Wednesday
+
+    test('should count consecutive active days ending today', () {
+      final index = HistoryIndex.empty();
+      for (int i = 0; i < 5; i++) {
+        index.put(DailyRecord(date: today.subtract(Duration(days: i)), totalPushups: 10));
+      }
+
+      expect(index.currentStreak(today), 5);
+    });
+
+    test('should skip today when not completed yet', () {
+      final index = HistoryIndex.empty();
+      index.put(DailyRecord(date: DateTime(2025, 6, 17), totalPushups: 10));
+      index.put(DailyRecord(date: DateTime(2025, 6, 16), totalPushups: 10));
+
+      expect(index.currentStreak(today), 2);
+    });
+
+    test('should break on a day with zero push-ups', () {
+      final index = HistoryIndex.empty();
+      index.put(DailyRecord(date: DateTime(2025, 6, 18), totalPushups: 10));
+      index.put(DailyRecord(date: DateTime(2025, 6, 17), totalPushups: 0));
+      index.put(DailyRecord(date: DateTime(2025, 6, 16), totalPushups: 10));
+
+      expect(index.currentStreak(today), 1);
+    });
+
+    test('should cap the streak at the look-back window', () {
+      final index = HistoryIndex.empty();
+      for (int i = 0; i < 100; i++) {
+        index.put(DailyRecord(date: today.subtract(Duration(days: i)), totalPushups: 10));
+      }
+
+      expect(index.currentStreak(today), 30);
+      expect(index.currentStreak(today, lookBackDays: 365), 100);
+    });
+
+    test('should count consecutive active weeks', () {
+      final index = HistoryIndex.empty();
+      index.put(DailyRecord(date: DateTime(2025, 6, 16), totalPushups: 10)); // this week
+      index.put(DailyRecord(date: DateTime(2025, 6, 15), totalPushups: 10)); // last week
+      index.put(DailyRecord(date: DateTime(2025, 6, 2), totalPushups: 10)); // 2 weeks ago
+      index.put(DailyRecord(date: DateTime(2025, 5, 20), totalPushups: 10)); // gap before
+
+      expect(index.weeklyStreak(today), 3);
+    });
+
+    test('should not break weekly streak when current week has no records', () {
+      final index = HistoryIndex.empty();
+      index.put(DailyRecord(date: DateTime(2025, 6, 10), totalPushups: 10));
+
+      expect(index.weeklyStreak(today), 1);
+    });
+  });
+
+  group('HistoryIndex - Serialization', () {
+    test('should round-trip through JSON', () {
+      final index = HistoryIndex.empty()..sourceRevision = 42;
+      index.put(DailyRecord(date: DateTime(2025, 1, 14), totalPushups: 60, pointsEarned: 5));
+      index.put(DailyRecord(date: DateTime(2025, 1, 20), totalPushups: 20));
+
+      final restored = HistoryIndex.fromJson(index.toJson())!;
+
+      expect(restored.totalPushups, 80);
+      expect(restored.totalPoints, 5);
+      expect(restored.goalReachedDays, 1);
+      expect(restored.sourceRevision, 42);
+      expect(restored.hasRecord(DateTime(2025, 1, 20)), true);
+      expect(restored.hasRecord(DateTime(2025, 1, 19)), false);
+      expect(restored.sumPushups(DateTime(2025, 1, 1), DateTime(2025, 1, 31)), 80);
+    });
+
+    test('should apply a month onto an older copy', () {
+      final index = HistoryIndex.empty();
+      index.put(DailyRecord(date: DateTime(2025, 1, 14), totalPushups: 60, pointsEarned: 5));
+      final older = HistoryIndex.fromJson(index.toJson())!;
+
+      index.put(DailyRecord(date: DateTime(2025, 2, 3), totalPushups: 20));
+      index.put(DailyRecord(date: DateTime(2025, 2, 4), totalPushups: 10, pointsEarned: 7));
+      older.applyMonthJson(DateTime(2025, 2), index.monthToJson(DateTime(2025, 2)));
+
+      expect(older.totalPushups, 90);
+      expect(older.totalPoints, 12);
+      expect(older.recordCount, 3);
+      expect(older.lastRecordDate, DateTime(2025, 2, 4));
+      expect(older.sumPushups(DateTime(2025, 2, 1), DateTime(2025, 2, 28)), 30);
+    });
+
+    test('should reject other format versions', () {
+      final json = HistoryIndex.empty().toJson()..['version'] = -1;
+
+      expect(HistoryIndex.fromJson(json), isNull);
+    });
+
+    test('should build from raw records and skip corrupted entries', () {
+      final index = HistoryIndex.fromRecords({
+        '2025-01-14': DailyRecord(date: DateTime(2025, 1, 14), totalPushups: 50).toJson(),
+        '2025-01-15': {'date': 'broken'},
+      });
+
+      expect(index.recordCount, 1);
+      expect(index.totalPushups, 50);
+    });
+  });
+}
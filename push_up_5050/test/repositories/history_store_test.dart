@@ -0,0 +1,213 @@
+import 'dart:io';
+
+import 'package:flutter_test/flutter_test.dart';
+import 'package:push_up_5050/repositories/history_store.dart';
+
+/// Thrown by [TornWriteBackend] to simulate the process dying.
+class SimulatedCrash implements Exception {}
+
+/// Backend that "crashes" on the N-th mutating operation.
+///
+/// A crashing write leaves only the first [tearAt] characters of the new
+/// contents behind, like a power loss in the middle of a write. A crashing
+/// rename does not happen at all.
+class TornWriteBackend extends MemoryHistoryStoreBackend {
+  int? crashAtOperation;
+  int tearAt = 0;
+  int _operations = 0;
+
+  void _tick() {
+    if (crashAtOperation != null && _operations++ == crashAtOperation) {
+      throw SimulatedCrash();
+    }
+  }
+
+  @override
+  Future<void> write(String name, String contents) async {
+    try {
+      _tick();
+    } on SimulatedCrash {
+      files[name] = contents.substring(0, tearAt.clamp(0, contents.length));
+      rethrow;
+    }
+    await super.write(name, contents);
+  }
+
+  @override
+  Future<void> rename(String from, String to) async {
+    _tick();
+    await super.rename(from, to);
+  }
+}
+
+Map<String, dynamic> _record(int pushups) => {'totalPushups': pushups};
+
+void main() {
+  group('HistoryStore - Records', () {
+    late MemoryHistoryStoreBackend backend;
+    late HistoryStore store;
+
+    setUp(() {
+      backend = MemoryHistoryStoreBackend();
+      store = HistoryStore(backend);
+    });
+
+    test('should write one segment per month', () async {
+      await store.writeDay(DateTime(2025, 1, 31), _record(10));
+      await store.writeDay(DateTime(2025, 2, 1), _record(20));
+
+      expect(backend.files.containsKey('records-2025-01.json'), true);
+      expect(backend.files.containsKey('records-2025-02.json'), true);
+    });
+
+    test('should read back a day after reopening', () async {
+      await store.writeDay(DateTime(2025, 1, 14), _record(42));
+
+      final reopened = HistoryStore(backend);
+
+      expect(await reopened.readDay(DateTime(2025, 1, 14)), _record(42));
+      expect(await reopened.readDay(DateTime(2025, 1, 15)), isNull);
+    });
+
+    test('should read ranges across month boundaries', () async {
+      await store.writeAll({
+        '2025-01-30': _record(1),
+        '2025-01-31': _record(2),
+        '2025-02-01': _record(3),
+        '2025-02-02': _record(4),
+      });
+
+      final range = await HistoryStore(backend)
+          .readRange(DateTime(2025, 1, 31), DateTime(2025, 2, 1));
+
+      expect(range.keys.toSet(), {'2025-01-31', '2025-02-01'});
+    });
+
+    test('should read all records', () async {
+      await store.writeDay(DateTime(2024, 12, 31), _record(1));
+      await store.writeDay(DateTime(2025, 1, 1), _record(2));
+
+      final all = await HistoryStore(backend).readAll();
+
+      expect(all.length, 2);
+    });
+
+    test('should not lose days on concurrent writes to one month', () async {
+      await Future.wait([
+        for (int day = 1; day <= 20; day++)
+          store.writeDay(DateTime(2025, 3, day), _record(day)),
+      ]);
+
+      final all = await HistoryStore(backend).readAll();
+
+      expect(all.length, 20);
+    });
+
+    test('should clear everything', () async {
+      await store.writeDay(DateTime(2025, 1, 14), _record(1));
+      await store.writeDocument('index', '{}');
+
+      await store.clear();
+
+      expect(backend.files, isEmpty);
+      expect(await store.readAll(), isEmpty);
+    });
+  });
+
+  group('HistoryStore - Crash Safety', () {
+    final day = DateTime(2025, 5, 10);
+
+    test('should survive a crash at every step of a commit', () async {
+      // A commit is: write temp, rename committed to backup, rename temp
+      for (int crashAt = 0; crashAt < 3; crashAt++) {
+        for (final tearAt in [0, 5, 20, 1000000]) {
+          final backend = TornWriteBackend();
+          await HistoryStore(backend).writeDay(day, _record(1));
+
+          backend.crashAtOperation = crashAt;
+          backend.tearAt = tearAt;
+          await expectLater(
+            HistoryStore(backend).writeDay(day, _record(2)),
+            throwsA(isA<SimulatedCrash>()),
+          );
+
+          // Restart: either the old or the new value, never garbage
+          backend.crashAtOperation = null;
+          final recovered = await HistoryStore(backend).readDay(day);
+          expect(
+            recovered,
+            anyOf(equals(_record(1)), equals(_record(2))),
+            reason: 'crashAt=$crashAt tearAt=$tearAt',
+          );
+
+          // And the store keeps working afterwards
+          await HistoryStore(backend).writeDay(day, _record(3));
+          expect(await HistoryStore(backend).readDay(day), _record(3));
+        }
+      }
+    });
+
+    test('should fall back to the backup when the segment is corrupted', () async {
+      final backend = MemoryHistoryStoreBackend();
+      await HistoryStore(backend).writeDay(day, _record(1));
+      await HistoryStore(backend).writeDay(day, _record(2));
+
+      final name = 'records-2025-05.json';
+      final contents = backend.files[name]!;
+      backend.files[name] = contents.replaceFirst('2', '7', contents.indexOf('\n'));
+
+      expect(await HistoryStore(backend).readDay(day), _record(1));
+    });
+
+    test('should return nothing when every generation is corrupted', () async {
+      final backend = MemoryHistoryStoreBackend();
+      backend.files['records-2025-05.json'] = 'garbage';
+      backend.files['records-2025-05.json.bak'] = 'PU5050 1 3 0\nabc';
+
+      expect(await HistoryStore(backend).readDay(day), isNull);
+    });
+
+    test('should detect torn frames through the checksum', () {
+      final a = HistoryStore.checksum('{"a":1}');
+      final b = HistoryStore.checksum('{"a":2}');
+
+      expect(a, isNot(b));
+    });
+  });
+
+  group('FileHistoryStoreBackend', () {
+    late Directory directory;
+
+    setUp(() async {
+      directory = await Directory.systemTemp.createTemp('history_store_test');
+    });
+
+    tearDown(() async {
+      await directory.delete(recursive: true);
+    });
+
+    test('should persist segments on disk', () async {
+      final store = HistoryStore(FileHistoryStoreBackend(directory));
+      await store.writeDay(DateTime(2025, 1, 14), _record(42));
+
+      final reopened = HistoryStore(FileHistoryStoreBackend(directory));
+
+      expect(await reopened.readDay(DateTime(2025, 1, 14)), _record(42));
+      expect(File('${directory.path}/records-2025-01.json').existsSync(), true);
+    });
+
+    test('should recover from a truncated file on disk', () async {
+      final store = HistoryStore(FileHistoryStoreBackend(directory));
+      await store.writeDay(DateTime(2025, 1, 14), _record(1));
+      await store.writeDay(DateTime(2025, 1, 14), _record(2));
+
+      final file = File('${directory.path}/records-2025-01.json');
+      final bytes = await file.readAsBytes();
+      await file.writeAsBytes(bytes.sublist(0, bytes.length - 3));
+
+      final reopened = HistoryStore(FileHistoryStoreBackend(directory));
+
+      expect(await reopened.readDay(DateTime(2025, 1, 14)), _record(1));
+    });
+  });
+}
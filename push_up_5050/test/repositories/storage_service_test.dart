@@ -3,12 +3,16 @@ import 'package:shared_preferences/shared_preferences.dart';
 import 'package:push_up_5050/models/workout_session.dart';
 import 'package:push_up_5050/models/daily_record.dart';
 import 'package:push_up_5050/models/achievement.dart';
+import 'package:push_up_5050/repositories/history_store.dart';
 import 'package:push_up_5050/repositories/storage_service.dart';
 
 // Simple mock SharedPreferences for testing
 class FakePrefs implements SharedPreferences {
   final Map<String, dynamic> _data = {};
 
+  /// Keys passed to [setString], in call order.
+  final List<String> stringWrites = [];
+
   @override
   Future<bool> clear() async {
     _data.clear();
@@ -71,6 +75,7 @@ class FakePrefs implements SharedPreferences {
 
   @override
   Future<bool> setString(String key, String value) async {
+    stringWrites.add(key);
     _data[key] = value;
     return true;
   }
@@ -103,10 +108,15 @@ class FakePrefs implements SharedPreferences {
 void main() {
   late StorageService storageService;
   late FakePrefs fakePrefs;
+  late MemoryHistoryStoreBackend historyBackend;
 
   setUp(() {
     fakePrefs = FakePrefs();
-    storageService = StorageService.forTesting(fakePrefs);
+    historyBackend = MemoryHistoryStoreBackend();
+    storageService = StorageService.forTesting(
+      fakePrefs,
+      historyStore: HistoryStore(historyBackend),
+    );
   });
 
   group('StorageService - Active Session', () {
@@ -184,7 +194,10 @@ void main() {
 
       await storageService.saveDailyRecord(record);
 
-      expect(fakePrefs.containsKey('daily_records'), true);
+      final saved = await storageService.getDailyRecord(DateTime(2025, 1, 14));
+      expect(saved, isNotNull);
+      expect(saved!.totalPushups, 100);
+      expect(historyBackend.files.containsKey('records-2025-01.json'), true);
     });
 
     test('should load all daily records correctly', () async {
@@ -468,6 +481,32 @@ void main() {
       expect(achievements['first_pushup']?['isUnlocked'], true);
     });
 
+    test('should keep every achievement saved concurrently', () async {
+      final achievements = [
+        for (final a in Achievement.getAllAchievements()) a..unlock(),
+      ];
+
+      await Future.wait([
+        for (final a in achievements) storageService.saveAchievement(a),
+      ]);
+
+      final saved = await storageService.loadAchievements();
+      expect(saved.keys.toSet(), achievements.map((a) => a.id).toSet());
+    });
+
+    test('should save several achievements with one write', () async {
+      final all = Achievement.getAllAchievements();
+      await storageService.saveAchievements([all[0]..unlock(), all[1]..unlock()]);
+      expect(fakePrefs.stringWrites.where((key) => key == 'achievements'), hasLength(1));
+
+      await storageService.saveAchievements([all[2]..unlock()]);
+      expect(fakePrefs.stringWrites.where((key) => key == 'achievements'), hasLength(2));
+
+      final saved = await storageService.loadAchievements();
+      expect(saved.keys, containsAll([all[0].id, all[1].id, all[2].id]));
+      expect(saved[all[1].id]['isUnlocked'], isTrue);
+    });
+
     test('should return empty map when no achievements exist', () async {
       final achievements = await storageService.loadAchievements();
 
@@ -577,6 +616,219 @@ void main() {
     });
   });
 
+  group('StorageService - History Index', () {
+    test('should rebuild index from legacy records', () async {
+      final json = '''
+      {
+        "2025-01-14": {
+          "date": "2025-01-14",
+          "totalPushups": 100,
+          "seriesCompleted": 10,
+          "totalKcal": 45.0,
+          "goalReached": true,
+          "pointsEarned": 300
+        }
+      }
+      ''';
+
+      await fakePrefs.setString('daily_records', json);
+
+      final index = await storageService.loadHistoryIndex();
+
+      expect(index.totalPushups, 100);
+      expect(index.totalPoints, 300);
+      expect(historyBackend.files.containsKey('index.json'), true);
+    });
+
+    test('should keep index in sync when saving records', () async {
+      await storageService.saveDailyRecord(DailyRecord(
+        date: DateTime(2025, 1, 14),
+        totalPushups: 40,
+        pointsEarned: 10,
+      ));
+      await storageService.saveDailyRecord(DailyRecord(
+        date: DateTime(2025, 1, 14),
+        totalPushups: 70,
+        pointsEarned: 210,
+      ));
+
+      final index = await storageService.loadHistoryIndex();
+      final rebuilt = await storageService.rebuildHistoryIndex();
+
+      expect(index.totalPushups, 70);
+      expect(index.totalPoints, 210);
+      expect(rebuilt.totalPushups, index.totalPushups);
+      expect(rebuilt.totalPoints, index.totalPoints);
+    });
+
+    test('should load persisted index in a new service instance', () async {
+      await storageService.saveDailyRecord(DailyRecord(
+        date: DateTime(2025, 1, 14),
+        totalPushups: 55,
+      ));
+
+      final reopened = StorageService.forTesting(
+        fakePrefs,
+        historyStore: HistoryStore(historyBackend),
+      );
+      final index = await reopened.loadHistoryIndex();
+
+      expect(index.totalPushups, 55);
+      expect(index.goalReachedDays, 1);
+    });
+
+    test('should pick up an overwrite from another instance', () async {
+      await storageService.saveDailyRecord(DailyRecord(
+        date: DateTime(2025, 1, 14),
+        totalPushups: 40,
+      ));
+      expect((await storageService.loadHistoryIndex()).totalPushups, 40);
+
+      // Same record count, different totals
+      final other = StorageService.forTesting(
+        fakePrefs,
+        historyStore: HistoryStore(historyBackend),
+      );
+      await other.saveDailyRecord(DailyRecord(
+        date: DateTime(2025, 1, 14),
+        totalPushups: 90,
+      ));
+
+      final index = await storageService.loadHistoryIndex();
+      expect(index.recordCount, 1);
+      expect(index.totalPushups, 90);
+    });
+
+    test('should persist only the changed month of the index', () async {
+      for (var month = 1; month <= 24; month++) {
+        await storageService.saveDailyRecord(DailyRecord(
+          date: DateTime(2024, month, 10),
+          totalPushups: 10,
+        ));
+      }
+      final snapshot = historyBackend.files['index.json'];
+
+      for (var day = 1; day <= 3; day++) {
+        await storageService.saveDailyRecord(DailyRecord(
+          date: DateTime(2025, 12, day),
+          totalPushups: 20,
+        ));
+      }
+
+      // Saves within one month only rewrite the small tail document
+      expect(historyBackend.files['index.json'], same(snapshot));
+
+      final reopened = StorageService.forTesting(
+        fakePrefs,
+        historyStore: HistoryStore(historyBackend),
+      );
+      final index = await reopened.loadHistoryIndex();
+      expect(index.totalPushups, 24 * 10 + 3 * 20);
+      expect(index.recordCount, 27);
+      expect(index.pushupsOn(DateTime(2025, 12, 2)), 20);
+    });
+
+    test('should rebuild index when legacy records are migrated', () async {
+      await storageService.saveDailyRecord(DailyRecord(
+        date: DateTime(2025, 1, 14),
+        totalPushups: 55,
+      ));
+
+      await fakePrefs.setString('daily_records', '''
+      {
+        "2025-01-15": {
+          "date": "2025-01-15",
+          "totalPushups": 20,
+          "seriesCompleted": 2,
+          "totalKcal": 9.0,
+          "goalReached": false
+        }
+      }
+      ''');
+
+      final index = await storageService.loadHistoryIndex();
+      expect(index.totalPushups, 75);
+      expect(index.recordCount, 2);
+    });
+
+    test('should rebuild index when persisted index is corrupted', () async {
+      await storageService.saveDailyRecord(DailyRecord(
+        date: DateTime(2025, 1, 14),
+        totalPushups: 55,
+      ));
+      historyBackend.files['index.json'] = 'invalid{json';
+      historyBackend.files.remove('index.json.bak');
+
+      final reopened = StorageService.forTesting(
+        fakePrefs,
+        historyStore: HistoryStore(historyBackend),
+      );
+      final index = await reopened.loadHistoryIndex();
+
+      expect(index.totalPushups, 55);
+    });
+  });
+
+  group('StorageService - Legacy Migration', () {
+    test('should move legacy records into month segments', () async {
+      await fakePrefs.setString('daily_records', '''
+      {
+        "2025-01-31": {
+          "date": "2025-01-31",
+          "totalPushups": 50,
+          "seriesCompleted": 5,
+          "totalKcal": 22.5,
+          "goalReached": true
+        },
+        "2025-02-01": {
+          "date": "2025-02-01",
+          "totalPushups": 60,
+          "seriesCompleted": 6,
+          "totalKcal": 27.0,
+          "goalReached": true
+        }
+      }
+      ''');
+
+      final records = await storageService.loadDailyRecords();
+
+      expect(records.length, 2);
+      expect(fakePrefs.containsKey('daily_records'), false);
+      expect(historyBackend.files.containsKey('records-2025-01.json'), true);
+      expect(historyBackend.files.containsKey('records-2025-02.json'), true);
+    });
+
+    test('should preserve an unreadable legacy blob', () async {
+      await fakePrefs.setString('daily_records', 'invalid{json');
+
+      await storageService.loadDailyRecords();
+
+      expect(fakePrefs.containsKey('daily_records'), false);
+      expect(historyBackend.files.containsKey('legacy_daily_records.json'), true);
+    });
+
+    test('should read only records within a range', () async {
+      await storageService.saveDailyRecord(
+          DailyRecord(date: DateTime(2025, 1, 10), totalPushups: 10));
+      await storageService.saveDailyRecord(
+          DailyRecord(date: DateTime(2025, 3, 10), totalPushups: 30));
+      await storageService.saveDailyRecord(
+          DailyRecord(date: DateTime(2025, 4, 1), totalPushups: 40));
+
+      final reopened = StorageService.forTesting(
+        fakePrefs,
+        historyStore: HistoryStore(historyBackend),
+      );
+
+      final range = await reopened.loadDailyRecordsInRange(
+        DateTime(2025, 3, 1),
+        DateTime(2025, 3, 31),
+      );
+
+      expect(range.keys, ['2025-03-10']);
+    });
+  });
+
   group('StorageService - Clear Data', () {
     test('should clear all data correctly', () async {
       await fakePrefs.setString('active_session', 'some json');
@@ -587,6 +839,7 @@ void main() {
 
       expect(fakePrefs.containsKey('active_session'), false);
       expect(fakePrefs.containsKey('daily_records'), false);
+      expect(historyBackend.files, isEmpty);
       expect(fakePrefs.containsKey('achievements'), false);
     });
   });
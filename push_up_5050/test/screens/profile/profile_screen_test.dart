@@ -79,6 +79,13 @@ class FakeStorageService implements StorageService {
     _achievements[achievement.id] = achievement.toJson();
   }
 
+  @override
+  Future<void> saveAchievements(Iterable<Achievement> achievements) async {
+    for (final achievement in achievements) {
+      _achievements[achievement.id] = achievement.toJson();
+    }
+  }
+
   @override
   Future<void> saveActiveSession(dynamic session) async {}
 
@@ -0,0 +1,218 @@
+import 'dart:math';
+
+import 'package:flutter_test/flutter_test.dart';
+import 'package:push_up_5050/models/achievement.dart';
+import 'package:push_up_5050/providers/achievements_provider.dart';
+import 'package:push_up_5050/repositories/storage_service.dart';
+import 'package:push_up_5050/services/achievement_engine.dart';
+import 'package:shared_preferences/shared_preferences.dart';
+
+/// IDs the full catalog unlocks for [stats], evaluated the legacy way.
+Set<String> _legacyUnlocks(Map<String, dynamic> stats) {
+  return {
+    for (final a in Achievement.getAllAchievements())
+      if (a.condition!(stats)) a.id,
+  };
+}
+
+/// Day, best-day, all-time and month totals all at [pushups].
+AchievementEvent _pushups(int pushups) => AchievementEvent([
+      for (final stat in [
+        AchievementStat.totalPushups,
+        AchievementStat.maxPushupsInOneDay,
+        AchievementStat.totalPushupsAllTime,
+        AchievementStat.monthlyPushups,
+      ])
+        StatChange(stat, pushups),
+    ]);
+
+/// Current streak at [days].
+AchievementEvent _streak(int days) =>
+    AchievementEvent([StatChange(AchievementStat.currentStreak, days)]);
+
+void main() {
+  group('AchievementEngine', () {
+    late List<Achievement> catalog;
+    late AchievementEngine engine;
+
+    setUp(() {
+      catalog = Achievement.getAllAchievements();
+      engine = AchievementEngine(catalog);
+    });
+
+    test('should unlock each threshold once, in order', () {
+      final unlocked = <String>[];
+      for (var rep = 1; rep <= 320; rep++) {
+        unlocked.addAll(engine.apply(_pushups(rep)).map((a) => a.id));
+      }
+
+      expect(unlocked, [
+        'first_pushup',
+        'centenary',
+        'hundred_in_one_day',
+        'two_hundred_in_one_day',
+        'three_hundred_in_one_day',
+      ]);
+      expect(engine.apply(_pushups(499)), isEmpty);
+      expect(engine.apply(_pushups(500)).map((a) => a.id), ['marathon']);
+    });
+
+    test('should report every unlock of one event in catalog order', () {
+      final unlocked = engine.apply(AchievementEvent([
+        const StatChange(AchievementStat.totalPoints, 10000),
+        const StatChange(AchievementStat.currentStreak, 20),
+      ]));
+
+      expect(unlocked.map((a) => a.id), [
+        'perfect_week',
+        'fifteen_day_streak',
+        'thousand_points',
+        'five_thousand_points',
+        'ten_thousand_points',
+      ]);
+      expect(engine.apply(_streak(30)), isEmpty);
+    });
+
+    test('should skip achievements unlocked elsewhere', () {
+      catalog.firstWhere((a) => a.id == 'hundred_in_one_day').unlock();
+
+      expect(
+        engine.apply(_pushups(150)).map((a) => a.id),
+        ['first_pushup', 'centenary'],
+      );
+      expect(engine.apply(_pushups(200)).map((a) => a.id), ['two_hundred_in_one_day']);
+    });
+
+    test('should match the legacy conditions', () {
+      final random = Random(7);
+      for (var i = 0; i < 50; i++) {
+        final stats = {
+          for (final stat in AchievementStat.values) stat.key: random.nextInt(12000),
+        };
+        final fresh = AchievementEngine(Achievement.getAllAchievements());
+
+        expect(fresh.applyStats(stats).map((a) => a.id).toSet(), _legacyUnlocks(stats));
+      }
+    });
+
+    test('should evaluate custom conditions only for stats maps', () {
+      final custom = Achievement(
+        id: 'custom',
+        name: 'Custom',
+        description: 'Custom',
+        points: 1,
+        icon: '?',
+        condition: (stats) => stats['totalPushups'] == 42,
+      );
+      final engine = AchievementEngine([custom]);
+
+      expect(engine.apply(_pushups(42)), isEmpty);
+      expect(engine.applyStats({'totalPushups': 42}), [custom]);
+    });
+
+    test('should ignore missing and unknown stats', () {
+      final event = AchievementEvent.fromStats({'totalPushups': 5, 'unknown': 1});
+
+      expect(event.changes.single.stat, AchievementStat.totalPushups);
+      expect(engine.applyStats({'totalPushups': 5}).map((a) => a.id), ['first_pushup']);
+    });
+  });
+
+  group('AchievementsProvider persistence', () {
+    late StorageService storage;
+
+    setUp(() async {
+      SharedPreferences.setMockInitialValues({});
+      storage = StorageService.forTesting(await SharedPreferences.getInstance());
+    });
+
+    Future<Set<String>> persistedUnlocks() async {
+      final reloaded = AchievementsProvider(storage: storage);
+      await reloaded.loadAchievements();
+      return reloaded.unlockedAchievements.map((a) => a.id).toSet();
+    }
+
+    test('should not lose unlocks from concurrent events', () async {
+      final provider = AchievementsProvider(storage: storage);
+      final reported = <String>{};
+
+      // Events from a workout, a streak refresh and a manual unlock, all
+      // in flight at the same time
+      await Future.wait([
+        for (var rep = 1; rep <= 310; rep++)
+          Future(() => reported.addAll(
+              provider.recordEvent(_pushups(rep)).map((a) => a.id))),
+        Future(() => reported.addAll(
+            provider.recordEvent(_streak(15)).map((a) => a.id))),
+        Future(() => reported.addAll(provider.checkUnlocks({
+              'totalPoints': 5000,
+              'maxConsecutiveSeries': 10,
+            }).map((a) => a.id))),
+        provider.unlockAchievement('lion_month').then((unlocked) {
+          if (unlocked) reported.add('lion_month');
+        }),
+      ]);
+      await provider.saved;
+
+      expect(reported, hasLength(12));
+      expect(await persistedUnlocks(), reported);
+    });
+
+    test('should persist random concurrent events like the legacy check', () async {
+      final random = Random(2026);
+      final provider = AchievementsProvider(storage: storage);
+      final best = {for (final stat in AchievementStat.values) stat.key: 0};
+
+      await Future.wait([
+        for (var i = 0; i < 200; i++)
+          Future.delayed(Duration(microseconds: random.nextInt(500)), () {
+            final stat = AchievementStat.values[random.nextInt(AchievementStat.values.length)];
+            final value = random.nextInt(i * 60 + 1);
+            best[stat.key] = max(best[stat.key]!, value);
+            provider.recordEvent(AchievementEvent([StatChange(stat, value)]));
+          }),
+      ]);
+      await provider.saved;
+
+      expect(await persistedUnlocks(), _legacyUnlocks(best));
+    });
+
+    test('should write once per event', () async {
+      var writes = 0;
+      final provider = AchievementsProvider(
+        storage: _CountingStorage(storage, () => writes++),
+      );
+
+      final unlocked = provider.recordEvent(AchievementEvent([
+        const StatChange(AchievementStat.totalPoints, 10000),
+        const StatChange(AchievementStat.currentStreak, 20),
+      ]));
+      provider.recordEvent(_streak(21));
+      await provider.saved;
+
+      expect(unlocked, hasLength(5));
+      expect(writes, 1);
+      expect(await persistedUnlocks(), unlocked.map((a) => a.id).toSet());
+    });
+  });
+}
+
+/// Storage forwarding achievement writes to a real [StorageService].
+class _CountingStorage implements StorageService {
+  final StorageService _inner;
+  final void Function() _onWrite;
+
+  _CountingStorage(this._inner, this._onWrite);
+
+  @override
+  Future<void> saveAchievements(Iterable<Achievement> achievements) {
+    _onWrite();
+    return _inner.saveAchievements(achievements);
+  }
+
+  @override
+  Future<Map<String, dynamic>> loadAchievements() => _inner.loadAchievements();
+
+  @override
+  dynamic noSuchMethod(Invocation invocation) => super.noSuchMethod(invocation);
+}
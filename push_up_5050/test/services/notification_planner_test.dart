@@ -0,0 +1,257 @@
+import 'package:flutter_local_notifications/flutter_local_notifications.dart';
+import 'package:flutter_test/flutter_test.dart';
+import 'package:push_up_5050/models/daily_record.dart';
+import 'package:push_up_5050/repositories/history_index.dart';
+import 'package:push_up_5050/services/notification_planner.dart';
+import 'package:push_up_5050/services/notification_service.dart';
+import 'package:timezone/timezone.dart' as tz;
+
+/// Fake plugin keeping pending requests in memory and counting calls.
+class FakeNotificationsPlugin implements FlutterLocalNotificationsPlugin {
+  final Map<int, PendingNotificationRequest> pending = {};
+  final Map<int, tz.TZDateTime> scheduledDates = {};
+  int pendingQueries = 0;
+  int scheduleCalls = 0;
+  int cancelCalls = 0;
+
+  int get channelCalls => pendingQueries + scheduleCalls + cancelCalls;
+
+  @override
+  dynamic noSuchMethod(Invocation invocation) {
+    final args = invocation.namedArguments;
+    switch (invocation.memberName) {
+      case #initialize:
+        return Future<bool?>.value(true);
+      case #pendingNotificationRequests:
+        pendingQueries++;
+        return Future.value(pending.values.toList());
+      case #zonedSchedule:
+        scheduleCalls++;
+        final id = args[#id] as int;
+        pending[id] = PendingNotificationRequest(
+          id,
+          args[#title] as String?,
+          args[#body] as String?,
+          args[#payload] as String?,
+        );
+        scheduledDates[id] = args[#scheduledDate] as tz.TZDateTime;
+        return Future<void>.value();
+      case #cancel:
+        cancelCalls++;
+        pending.remove(args[#id] as int);
+        return Future<void>.value();
+    }
+    return super.noSuchMethod(invocation);
+  }
+}
+
+final _texts = NotificationPlanTexts(
+  streakTitle: 'Streak at risk',
+  streakBodyDay3: 'Day 3',
+  streakBody: (days) => 'Missed $days days',
+  streakChannel: 'Streak',
+  streakChannelDescription: 'Streak channel',
+  progressTitle: 'Almost there',
+  progressBody: 'Progress',
+  progressChannel: 'Progress',
+  progressChannelDescription: 'Progress channel',
+  challengeTitle: 'Challenge',
+  challengeBody: 'New challenge',
+  challengeChannel: 'Challenge',
+  challengeChannelDescription: 'Challenge channel',
+);
+
+HistoryIndex _history(Map<DateTime, int> pushups) {
+  final index = HistoryIndex.empty();
+  for (final entry in pushups.entries) {
+    index.put(DailyRecord(date: entry.key, totalPushups: entry.value));
+  }
+  return index;
+}
+
+void main() {
+  // Wednesday; last workout on Sunday, so two days missed before today
+  final now = DateTime(2026, 3, 11, 7, 0);
+  final today = DateTime(2026, 3, 11);
+
+  List<PlannedNotification> plan(HistoryIndex history, {DateTime? at}) {
+    return NotificationPlanner(texts: _texts).plan(
+      now: at ?? now,
+      history: history,
+      dailyGoal: 50,
+      personalizedTime: (18, 0),
+      dailyReminderTime: (21, 0),
+    );
+  }
+
+  group('NotificationPlanner', () {
+    test('should warn on every day of the horizon while the streak is at risk', () {
+      final planned = plan(_history({DateTime(2026, 3, 8): 40}));
+      final streak = planned
+          .where((n) => n.type == 'streak_at_risk' && n.repeat == NotificationRepeat.none)
+          .toList();
+
+      expect(streak.length, NotificationPlanner.defaultHorizonDays);
+      expect(streak.first.scheduledAt, DateTime(2026, 3, 11, 18, 0));
+      expect(streak.first.body, 'Missed 2 days');
+      expect(streak[1].body, 'Day 3');
+      expect(streak.last.body, 'Missed 8 days');
+      expect(streak.map((n) => n.id).toSet().length, streak.length);
+    });
+
+    test('should keep warning daily after the horizon', () {
+      for (final history in [
+        _history({DateTime(2026, 3, 8): 40}),
+        _history({today: 60}),
+      ]) {
+        final fallback = plan(history).singleWhere((n) => n.id == NotificationIds.streakAtRisk);
+
+        expect(fallback.type, 'streak_at_risk');
+        expect(fallback.repeat, NotificationRepeat.dailyFromDate);
+        expect(fallback.scheduledAt, DateTime(2026, 3, 18, 18, 0));
+        expect(fallback.body, 'Day 3');
+      }
+
+      // Opening the app again moves it out, which reschedules it
+      final later = plan(_history({}), at: DateTime(2026, 3, 13, 7, 0))
+          .singleWhere((n) => n.id == NotificationIds.streakAtRisk);
+      final earlier = plan(_history({})).singleWhere((n) => n.id == NotificationIds.streakAtRisk);
+      expect(later.payload, isNot(earlier.payload));
+    });
+
+    test('should plan the reminder, weekly challenge and progress', () {
+      final planned = plan(_history({DateTime(2026, 3, 8): 40, today: 30}));
+      final byType = {for (final n in planned) n.type: n};
+
+      expect(byType['daily_reminder']!.id, NotificationIds.dailyReminder);
+      expect(byType['daily_reminder']!.repeat, NotificationRepeat.daily);
+      expect(byType['weekly_challenge']!.scheduledAt, DateTime(2026, 3, 15, 8, 0));
+      expect(byType['weekly_challenge']!.repeat, NotificationRepeat.weekly);
+      expect(byType['progress']!.scheduledAt, DateTime(2026, 3, 11, 18, 0));
+
+      // Worked out today: at risk again only after two more missed days
+      final streak = planned.where((n) => n.type == 'streak_at_risk');
+      expect(streak.first.scheduledAt, DateTime(2026, 3, 14, 18, 0));
+    });
+
+    test('should skip times that already passed', () {
+      final planned = plan(_history({}), at: DateTime(2026, 3, 11, 19, 0));
+
+      expect(planned.every((n) => n.scheduledAt.isAfter(DateTime(2026, 3, 11, 19))),
+          isTrue);
+      expect(planned.where((n) => n.type == 'progress'), isEmpty);
+    });
+
+    test('should not plan progress outside the progress zone', () {
+      expect(plan(_history({today: 10})).where((n) => n.type == 'progress'), isEmpty);
+      expect(plan(_history({today: 48})).where((n) => n.type == 'progress'), isEmpty);
+    });
+  });
+
+  group('NotificationPlanDiff', () {
+    test('should keep pending notifications that match the plan', () {
+      final planned = plan(_history({}));
+      final pending = [
+        for (final n in planned) PendingNotificationRequest(n.id, n.title, n.body, n.payload),
+      ];
+
+      final diff = NotificationPlanDiff.between(planned, pending);
+      expect(diff.isEmpty, isTrue);
+      expect(diff.unchanged, planned.length);
+    });
+
+    test('should cancel stale planned IDs and leave others alone', () {
+      final diff = NotificationPlanDiff.between([], const [
+        PendingNotificationRequest(NotificationIds.streakAtRisk, 't', 'b', 'streak_at_risk'),
+        PendingNotificationRequest(999, 'Test', 'b', null),
+      ]);
+
+      expect(diff.toCancel, [NotificationIds.streakAtRisk]);
+      expect(diff.toSchedule, isEmpty);
+    });
+  });
+
+  group('NotificationService.reconcile', () {
+    late FakeNotificationsPlugin plugin;
+    late NotificationService service;
+
+    setUp(() async {
+      plugin = FakeNotificationsPlugin();
+      service = NotificationService(plugin: plugin);
+      await service.initialize();
+    });
+
+    test('should schedule the whole plan once', () async {
+      final planned = plan(_history({DateTime(2026, 3, 8): 40}));
+
+      final diff = await service.reconcile(planned);
+
+      expect(diff!.toSchedule.length, planned.length);
+      expect(plugin.pendingQueries, 1);
+      expect(plugin.scheduleCalls, planned.length);
+      expect(plugin.cancelCalls, 0);
+      final first = planned.firstWhere((n) => n.type == 'streak_at_risk');
+      expect(plugin.scheduledDates[first.id]!.hour, 18);
+    });
+
+    test('should make no changes when nothing changed', () async {
+      final planned = plan(_history({DateTime(2026, 3, 8): 40}));
+      await service.reconcile(planned);
+      final callsAfterFirst = plugin.channelCalls;
+
+      for (var i = 0; i < 5; i++) {
+        await service.reconcile(plan(_history({DateTime(2026, 3, 8): 40})));
+      }
+
+      // One pending query per reconcile, nothing else
+      expect(plugin.channelCalls - callsAfterFirst, 5);
+    });
+
+    test('should apply only the difference after a workout', () async {
+      await service.reconcile(plan(_history({DateTime(2026, 3, 8): 40})));
+      plugin
+        ..scheduleCalls = 0
+        ..cancelCalls = 0;
+
+      final afterWorkout = plan(_history({DateTime(2026, 3, 8): 40, today: 30}));
+      await service.reconcile(afterWorkout);
+
+      // Warnings for the next three days are dropped; later ones get new
+      // bodies and progress is added. Reminder and challenge are untouched.
+      expect(plugin.cancelCalls, 3);
+      expect(plugin.scheduleCalls, 5);
+      expect(plugin.pending.length, afterWorkout.length);
+      expect(
+        plugin.pending.values.map((p) => p.payload).toSet(),
+        afterWorkout.map((n) => n.payload).toSet(),
+      );
+    });
+
+    test('should replace notifications scheduled before the planner', () async {
+      plugin.pending
+        ..[NotificationIds.streakAtRisk] = const PendingNotificationRequest(
+            NotificationIds.streakAtRisk, 'Old', 'Old', 'streak_at_risk')
+        ..[NotificationIds.weeklyChallenge] = const PendingNotificationRequest(
+            NotificationIds.weeklyChallenge, 'Challenge', 'New challenge', 'weekly_challenge')
+        ..[999] = const PendingNotificationRequest(999, 'Test', 'Test', null);
+
+      final planned = plan(_history({today: 60}));
+      await service.reconcile(planned);
+
+      // The legacy repeating warning becomes the planned fallback
+      expect(plugin.pending[NotificationIds.streakAtRisk]!.payload,
+          startsWith('streak_at_risk@'));
+      expect(plugin.pending[NotificationIds.weeklyChallenge]!.payload,
+          startsWith('weekly_challenge@'));
+      expect(plugin.pending.containsKey(999), isTrue);
+      expect(plugin.cancelCalls, 0);
+    });
+  });
+
+  test('typeOfPayload should read planned and legacy payloads', () {
+    expect(PlannedNotification.typeOfPayload('streak_at_risk@2026-03-11T18:00'),
+        'streak_at_risk');
+    expect(PlannedNotification.typeOfPayload('weekly_challenge'), 'weekly_challenge');
+    expect(PlannedNotification.typeOfPayload(null), isNull);
+  });
+}
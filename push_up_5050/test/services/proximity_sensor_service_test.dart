@@ -1,7 +1,10 @@
 import 'dart:async';
+import 'dart:io';
 import 'package:flutter/foundation.dart';
 import 'package:flutter_test/flutter_test.dart';
 import 'package:push_up_5050/services/proximity_sensor_service.dart';
+import 'package:push_up_5050/services/rep_detector.dart';
+import 'package:push_up_5050/services/sensor_trace.dart';
 
 void main() {
   // Initialize Flutter binding for tests that use platform channels
@@ -91,6 +94,29 @@ void main() {
       });
     });
 
+    group('Trace Recording', () {
+      test('should record labelled reps and save the trace', () async {
+        final directory = await Directory.systemTemp.createTemp('trace_test');
+        addTearDown(() => directory.delete(recursive: true));
+        final file = File('${directory.path}/session.trace');
+
+        expect(service.startTraceRecording(), kDebugMode);
+        expect(service.isRecordingTrace, kDebugMode);
+        service.markTraceRep();
+        service.markTraceRep();
+
+        final trace = await service.stopTraceRecording(saveTo: file);
+
+        expect(service.isRecordingTrace, false);
+        expect(trace?.expectedReps, hasLength(2));
+        expect((await SensorTrace.load(file)).expectedReps, trace!.expectedReps);
+      });
+
+      test('should return null when not recording', () async {
+        expect(await service.stopTraceRecording(), isNull);
+      });
+    });
+
     group('Dispose', () {
       test('should dispose without throwing', () {
         final testService = ProximitySensorService();
@@ -207,6 +233,30 @@ class FakeProximitySensorService implements ProximitySensorService {
   @override
   Stream<bool> get proximityEvents => _controller.stream;
 
+  @override
+  Stream<RepEvent> get repEvents => const Stream.empty();
+
+  @override
+  RepDetectorStats get detectionStats => const RepDetectorStats(
+        reps: 0,
+        glitches: 0,
+        debounced: 0,
+        debounceWindow: Duration(milliseconds: 300),
+        recentLatenciesMicros: [],
+      );
+
+  @override
+  bool get isRecordingTrace => false;
+
+  @override
+  bool startTraceRecording() => false;
+
+  @override
+  void markTraceRep() {}
+
+  @override
+  Future<SensorTrace?> stopTraceRecording({File? saveTo}) async => null;
+
   @override
   bool get isAvailable => _isAvailable;
 
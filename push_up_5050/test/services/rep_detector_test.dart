@@ -0,0 +1,253 @@
+import 'dart:async';
+import 'dart:io';
+
+import 'package:flutter/foundation.dart';
+import 'package:flutter_test/flutter_test.dart';
+import 'package:push_up_5050/services/rep_detector.dart';
+import 'package:push_up_5050/services/sensor_trace.dart';
+
+const _ms = 1000;
+
+/// Build samples from (milliseconds, near) pairs.
+List<ProximitySample> _samples(List<(int, bool)> events) =>
+    [for (final (time, near) in events) ProximitySample(time * _ms, near)];
+
+/// Clean reps: near for [downMs] every [periodMs], starting at 100ms.
+List<ProximitySample> _cleanReps(int count, {int periodMs = 800, int downMs = 250}) {
+  final events = <(int, bool)>[];
+  for (var i = 0; i < count; i++) {
+    final start = 100 + i * periodMs;
+    events
+      ..add((start, true))
+      ..add((start + downMs, false));
+  }
+  return _samples(events);
+}
+
+void main() {
+  group('SampleRingBuffer', () {
+    test('should keep only the most recent samples', () {
+      final buffer = SampleRingBuffer(3);
+      for (var i = 0; i < 5; i++) {
+        buffer.add(i * 10, i.isEven);
+      }
+
+      expect(buffer.length, 3);
+      expect(buffer.toList(), const [
+        ProximitySample(20, true),
+        ProximitySample(30, false),
+        ProximitySample(40, true),
+      ]);
+    });
+
+    test('should never let timestamps go backwards', () {
+      final buffer = SampleRingBuffer(4)
+        ..add(100, true)
+        ..add(90, false);
+
+      expect(buffer.lastTimestamp, 100);
+    });
+  });
+
+  group('RepDetector', () {
+    test('should count one rep per near phase with dwell latency', () {
+      final reps = RepDetector.replay(_cleanReps(5));
+
+      expect(reps.length, 5);
+      expect(reps.map((r) => r.latencyMicros).toSet(), {40 * _ms});
+      expect(reps.first.intervalMicros, isNull);
+      expect(reps.last.intervalMicros, 800 * _ms);
+    });
+
+    test('should ignore near pulses shorter than the near dwell', () {
+      final detector = RepDetector();
+      final reps = RepDetector.replay(
+        _samples([(100, true), (110, false), (500, true), (520, false)]),
+        into: detector,
+      );
+
+      expect(reps, isEmpty);
+      expect(detector.stats.glitches, 2);
+    });
+
+    test('should not double count a bounce while near', () {
+      final reps = RepDetector.replay(_samples([
+        (100, true),
+        (200, false),
+        (230, true), // back near before the far dwell elapsed
+        (400, false),
+      ]));
+
+      expect(reps.length, 1);
+    });
+
+    test('should reject a second near phase inside the debounce window', () {
+      final detector = RepDetector();
+      final reps = RepDetector.replay(
+        _samples([(100, true), (200, false), (300, true), (400, false)]),
+        into: detector,
+      );
+
+      expect(reps.length, 1);
+      expect(detector.stats.debounced, 1);
+      expect(detector.stats.rejectedTriggerRate, 0.5);
+    });
+
+    test('should shrink the debounce window for a fast cadence', () {
+      final detector = RepDetector();
+      final reps = RepDetector.replay(
+        _cleanReps(10, periodMs: 350, downMs: 150),
+        into: detector,
+      );
+
+      expect(reps.length, 10);
+      expect(detector.debounceWindow, const Duration(milliseconds: 150));
+    });
+
+    test('should widen the debounce window for a slow cadence', () {
+      final detector = RepDetector();
+      RepDetector.replay(_cleanReps(6, periodMs: 1000), into: detector);
+
+      expect(detector.debounceWindow, const Duration(milliseconds: 400));
+    });
+
+    test('should ignore rests between series when estimating cadence', () {
+      final detector = RepDetector();
+      final samples = [
+        ..._cleanReps(4, periodMs: 1000),
+        for (final sample in _cleanReps(1))
+          ProximitySample(sample.timestampMicros + 60000 * _ms, sample.near),
+      ];
+      final reps = RepDetector.replay(samples, into: detector);
+
+      expect(reps.length, 5);
+      expect(detector.debounceWindow, const Duration(milliseconds: 400));
+    });
+
+    test('should expose pending dwell deadlines for live drivers', () {
+      final detector = RepDetector();
+      expect(detector.nextDeadline, isNull);
+
+      detector.addSample(100 * _ms, true);
+      expect(detector.nextDeadline, 140 * _ms);
+      expect(detector.advanceTo(120 * _ms), isNull);
+
+      final rep = detector.advanceTo(150 * _ms);
+      expect(rep!.latencyMicros, 50 * _ms);
+      expect(detector.isNear, true);
+      expect(detector.nextDeadline, isNull);
+    });
+
+    test('should replay deterministically', () {
+      final samples = _cleanReps(20, periodMs: 500, downMs: 200);
+      final a = RepDetector.replay(samples);
+      final b = RepDetector.replay(samples);
+
+      expect(
+        a.map((r) => (r.onsetMicros, r.detectedMicros)).toList(),
+        b.map((r) => (r.onsetMicros, r.detectedMicros)).toList(),
+      );
+    });
+  });
+
+  group('SensorTrace', () {
+    test('should round-trip through the compact format', () {
+      final trace = SensorTrace(
+        samples: _cleanReps(3),
+        expectedReps: [100 * _ms, 900 * _ms, 1700 * _ms],
+      );
+
+      final encoded = trace.encode();
+      final decoded = SensorTrace.decode(encoded);
+
+      expect(encoded.split('\n').first, SensorTrace.header);
+      expect(decoded.samples, trace.samples);
+      expect(decoded.expectedReps, trace.expectedReps);
+    });
+
+    test('should reject malformed traces', () {
+      expect(() => SensorTrace.decode('hello'), throwsFormatException);
+      expect(() => SensorTrace.decode('${SensorTrace.header}\n+abc'),
+          throwsFormatException);
+      expect(() => SensorTrace.decode('${SensorTrace.header}\nx100'),
+          throwsFormatException);
+    });
+
+    test('should report false triggers and missed reps', () {
+      final report = SensorTrace(
+        samples: _cleanReps(3),
+        // Second rep not labelled, one labelled rep never happened
+        expectedReps: [100 * _ms, 1700 * _ms, 5000 * _ms],
+      ).evaluate();
+
+      expect(report.detected.length, 3);
+      expect(report.matched, 2);
+      expect(report.falseTriggers, 1);
+      expect(report.missed, 1);
+      expect(report.falseTriggerRate, closeTo(1 / 3, 1e-9));
+    });
+
+    test('should detect every rep of the recorded mixed cadence trace', () async {
+      final trace = await SensorTrace.load(
+        File('test/services/traces/pushups_mixed_cadence.trace'),
+      );
+      final report = trace.evaluate();
+      debugPrint(report.toString());
+
+      expect(trace.expectedReps.length, 24);
+      expect(report.matched, 24);
+      expect(report.falseTriggers, 0);
+      expect(report.stats.glitches, greaterThan(0));
+      expect(report.stats.debounced, 1);
+      expect(report.latencyPercentile(99)!, lessThanOrEqualTo(100 * _ms));
+
+      // The previous fixed 300ms debounce on raw near events counts the
+      // jitter pulses and the double dip as reps
+      var legacyCount = 0;
+      int? lastTrigger;
+      for (final sample in trace.samples.where((s) => s.near)) {
+        if (lastTrigger == null || sample.timestampMicros - lastTrigger >= 300 * _ms) {
+          lastTrigger = sample.timestampMicros;
+          legacyCount++;
+        }
+      }
+      expect(legacyCount, greaterThan(trace.expectedReps.length));
+    });
+
+    test('should record a live stream into a replayable trace', () async {
+      final events = StreamController<bool>();
+      final recorder = SensorTraceRecorder()..start(events.stream);
+
+      events.add(true);
+      recorder.markRep();
+      await Future<void>.delayed(const Duration(milliseconds: 60));
+      events.add(false);
+      await Future<void>.delayed(Duration.zero);
+      await recorder.stop();
+      await events.close();
+
+      final trace = SensorTrace.decode(recorder.trace.encode());
+      expect(trace.samples.map((s) => s.near), [true, false]);
+      expect(trace.expectedReps.length, 1);
+      expect(trace.evaluate().matched, 1);
+    });
+  });
+
+  group('ProximityRepCounter', () {
+    test('should confirm a rep after the dwell without another sample', () async {
+      final counter = ProximityRepCounter();
+      final reps = <RepEvent>[];
+      counter.reps.listen(reps.add);
+
+      counter.addSample(true);
+      expect(reps, isEmpty);
+
+      await Future<void>.delayed(const Duration(milliseconds: 80));
+      expect(reps.length, 1);
+      expect(reps.single.latencyMicros, greaterThanOrEqualTo(40 * _ms));
+      expect(counter.detector.stats.recentLatenciesMicros.length, 1);
+
+      counter.dispose();
+    });
+  });
+}
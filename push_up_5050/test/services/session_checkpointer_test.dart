@@ -0,0 +1,107 @@
+import 'package:flutter_test/flutter_test.dart';
+import 'package:push_up_5050/services/session_checkpointer.dart';
+
+void main() {
+  group('SessionCheckpointer', () {
+    late int saves;
+    late SessionCheckpointer checkpointer;
+
+    setUp(() {
+      saves = 0;
+      checkpointer = SessionCheckpointer(
+        save: () async => saves++,
+        interval: const Duration(milliseconds: 20),
+      );
+    });
+
+    test('should not save until the interval elapses', () async {
+      checkpointer.markDirty();
+
+      expect(saves, 0);
+      expect(checkpointer.isDirty, true);
+
+      await Future<void>.delayed(const Duration(milliseconds: 60));
+
+      expect(saves, 1);
+      expect(checkpointer.isDirty, false);
+    });
+
+    test('should coalesce changes into a single save', () async {
+      for (int i = 0; i < 100; i++) {
+        checkpointer.markDirty();
+      }
+
+      await Future<void>.delayed(const Duration(milliseconds: 60));
+
+      expect(saves, 1);
+      expect(checkpointer.saveCount, 1);
+    });
+
+    test('should save immediately on flush', () async {
+      checkpointer.markDirty();
+
+      await checkpointer.flush();
+
+      expect(saves, 1);
+
+      // The cancelled timer must not save again
+      await Future<void>.delayed(const Duration(milliseconds: 60));
+      expect(saves, 1);
+    });
+
+    test('should not save on flush when nothing changed', () async {
+      await checkpointer.flush();
+
+      expect(saves, 0);
+    });
+
+    test('should save changes made during an in-flight save', () async {
+      final values = <int>[];
+      var state = 0;
+      checkpointer = SessionCheckpointer(
+        save: () async {
+          final snapshot = state;
+          await Future<void>.delayed(const Duration(milliseconds: 5));
+          values.add(snapshot);
+        },
+      );
+
+      state = 1;
+      checkpointer.markDirty();
+      final first = checkpointer.flush();
+      state = 2;
+      checkpointer.markDirty();
+      await Future.wait([first, checkpointer.flush()]);
+
+      expect(values, [1, 2]);
+    });
+
+    test('should keep changes dirty when a save fails', () async {
+      var fail = true;
+      checkpointer = SessionCheckpointer(
+        save: () async {
+          if (fail) throw Exception('disk full');
+          saves++;
+        },
+      );
+
+      checkpointer.markDirty();
+      await expectLater(checkpointer.flush(), throwsException);
+      expect(checkpointer.isDirty, true);
+
+      fail = false;
+      await checkpointer.flush();
+      expect(saves, 1);
+    });
+
+    test('should drop pending changes on cancel', () async {
+      checkpointer.markDirty();
+      checkpointer.cancel();
+
+      await Future<void>.delayed(const Duration(milliseconds: 60));
+
+      expect(saves, 0);
+      expect(checkpointer.isDirty, false);
+    });
+  });
+}
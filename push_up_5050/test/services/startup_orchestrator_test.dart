@@ -0,0 +1,184 @@
+import 'package:flutter_test/flutter_test.dart';
+import 'package:push_up_5050/services/startup_orchestrator.dart';
+
+/// Fake service whose initialization takes [delay] and logs start/end.
+class FakeStartupService {
+  final String name;
+  final Duration delay;
+  final List<String> log;
+  final bool fail;
+  bool isInitialized = false;
+
+  FakeStartupService(this.name, this.log,
+      {this.delay = const Duration(milliseconds: 20), this.fail = false});
+
+  Future<bool> initialize() async {
+    log.add('$name:start');
+    await Future<void>.delayed(delay);
+    if (fail) throw StateError('$name failed');
+    isInitialized = true;
+    log.add('$name:end');
+    return true;
+  }
+}
+
+void main() {
+  group('StartupOrchestrator', () {
+    late List<String> log;
+    late StartupOrchestrator startup;
+
+    setUp(() {
+      log = [];
+      startup = StartupOrchestrator();
+    });
+
+    test('should run independent tasks concurrently', () async {
+      final storage = FakeStartupService('storage', log);
+      final settings = FakeStartupService('settings', log);
+      startup
+        ..add('storage', storage.initialize)
+        ..add('settings', settings.initialize);
+
+      await startup.runCritical();
+
+      // Both started before either finished
+      expect(log.take(2).toSet(), {'storage:start', 'settings:start'});
+      expect(storage.isInitialized && settings.isInitialized, true);
+    });
+
+    test('should start a task only after its dependencies', () async {
+      final notifications = FakeStartupService('notifications', log);
+      final permission = FakeStartupService('permission', log);
+      startup
+        ..add('permission', permission.initialize, dependsOn: ['notifications'])
+        ..add('notifications', notifications.initialize);
+
+      await startup.runCritical();
+
+      expect(log, [
+        'notifications:start',
+        'notifications:end',
+        'permission:start',
+        'permission:end',
+      ]);
+    });
+
+    test('should not run deferred tasks before runDeferred', () async {
+      final storage = FakeStartupService('storage', log);
+      final audio = FakeStartupService('audio', log);
+      startup
+        ..add('storage', storage.initialize)
+        ..add('audio', audio.initialize, stage: StartupStage.deferred);
+
+      await startup.runCritical();
+      expect(audio.isInitialized, false);
+
+      startup.markFirstFrame();
+      await startup.runDeferred();
+      expect(audio.isInitialized, true);
+    });
+
+    test('should let deferred tasks depend on critical ones', () async {
+      final widgets = FakeStartupService('widgets', log);
+      final registration = FakeStartupService('registration', log);
+      startup
+        ..add('widgets', widgets.initialize)
+        ..add('registration', registration.initialize,
+            dependsOn: ['widgets'], stage: StartupStage.deferred);
+
+      await startup.runCritical();
+      await startup.runDeferred();
+
+      expect(log.last, 'registration:end');
+    });
+
+    test('should complete whenDone once the task finished', () async {
+      final audio = FakeStartupService('audio', log);
+      startup.add('audio', audio.initialize, stage: StartupStage.deferred);
+      await startup.runCritical();
+
+      var done = false;
+      startup.whenDone('audio').then((_) => done = true);
+      await Future<void>.delayed(Duration.zero);
+      expect(done, false);
+
+      await startup.runDeferred();
+      await Future<void>.delayed(Duration.zero);
+      expect(done, true);
+    });
+
+    test('should record a per-phase timeline', () async {
+      startup
+        ..add('storage',
+            FakeStartupService('storage', log, delay: const Duration(milliseconds: 30)).initialize)
+        ..add('settings', FakeStartupService('settings', log).initialize)
+        ..add('audio', FakeStartupService('audio', log).initialize,
+            stage: StartupStage.deferred);
+
+      await startup.runCritical();
+      startup.markFirstFrame();
+      await startup.runDeferred();
+
+      final timeline = startup.timeline;
+      expect(timeline.phases.map((p) => p.name).toSet(),
+          {'storage', 'settings', 'audio'});
+      expect(timeline['storage']!.stage, StartupStage.critical);
+      expect(timeline['storage']!.duration,
+          greaterThanOrEqualTo(const Duration(milliseconds: 30)));
+      expect(timeline['audio']!.stage, StartupStage.deferred);
+
+      // Critical tasks overlap, so the stage is shorter than their sum
+      expect(
+        timeline.criticalDone!,
+        lessThan(timeline['storage']!.duration + timeline['settings']!.duration),
+      );
+      expect(timeline.firstFrame!, greaterThanOrEqualTo(timeline.criticalDone!));
+      expect(timeline['audio']!.start, greaterThanOrEqualTo(timeline.firstFrame!));
+      expect(timeline.deferredDone!, greaterThanOrEqualTo(timeline['audio']!.end));
+      expect(timeline.toString(), contains('storage (critical)'));
+    });
+
+    test('should rethrow critical failures', () async {
+      startup.add('storage', FakeStartupService('storage', log, fail: true).initialize);
+
+      await expectLater(startup.runCritical(), throwsStateError);
+      expect(startup.timeline['storage']!.error, isA<StateError>());
+    });
+
+    test('should swallow deferred failures and fail dependents', () async {
+      final permission = FakeStartupService('permission', log);
+      startup
+        ..add('notifications',
+            FakeStartupService('notifications', log, fail: true).initialize,
+            stage: StartupStage.deferred)
+        ..add('permission', permission.initialize,
+            dependsOn: ['notifications'], stage: StartupStage.deferred);
+
+      await startup.runCritical();
+      await startup.runDeferred();
+
+      expect(permission.isInitialized, false);
+      expect(startup.timeline['permission']!.error, isNotNull);
+    });
+
+    test('should reject invalid dependency graphs', () async {
+      Future<void> noop() async {}
+
+      final unknown = StartupOrchestrator()..add('a', noop, dependsOn: ['missing']);
+      await expectLater(unknown.runCritical(), throwsStateError);
+
+      final cycle = StartupOrchestrator()
+        ..add('a', noop, dependsOn: ['b'])
+        ..add('b', noop, dependsOn: ['a']);
+      await expectLater(cycle.runCritical(), throwsStateError);
+
+      final inverted = StartupOrchestrator()
+        ..add('a', noop, dependsOn: ['b'])
+        ..add('b', noop, stage: StartupStage.deferred);
+      await expectLater(inverted.runCritical(), throwsStateError);
+
+      expect(() => StartupOrchestrator()..add('a', noop)..add('a', noop),
+          throwsArgumentError);
+    });
+  });
+}
@@ -1,5 +1,6 @@
 import 'package:flutter_test/flutter_test.dart';
 import 'package:push_up_5050/services/widget_calendar_service.dart';
+import 'package:push_up_5050/repositories/history_index.dart';
 import 'package:push_up_5050/repositories/storage_service.dart';
 import 'package:push_up_5050/models/daily_record.dart';
 import 'package:push_up_5050/models/workout_session.dart';
@@ -19,6 +20,11 @@ class MockStorageService implements StorageService {
     return _dailyRecords;
   }
 
+  @override
+  Future<HistoryIndex> loadHistoryIndex() async {
+    return HistoryIndex.fromRecords(_dailyRecords);
+  }
+
   // Unused methods - required for interface compliance
   @override
   Future<void> saveActiveSession(WorkoutSession session) async {}
@@ -70,6 +76,9 @@ class MockStorageService implements StorageService {
 
   @override
   Future<DateTime?> getProgramStartDate() async => null;
+
+  @override
+  dynamic noSuchMethod(Invocation invocation) => super.noSuchMethod(invocation);
 }
 
 void main() {
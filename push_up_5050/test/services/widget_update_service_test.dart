@@ -8,6 +8,7 @@ import 'package:push_up_5050/repositories/storage_service.dart';
 import 'package:push_up_5050/models/daily_record.dart';
 import 'package:push_up_5050/models/workout_session.dart';
 import 'package:push_up_5050/models/achievement.dart';
+import 'package:push_up_5050/repositories/history_index.dart';
 
 class MockMethodChannel {
   String? lastMethodCalled;
@@ -474,6 +475,216 @@ void main() {
     });
   });
 
+  group('WidgetUpdateService Diff Pipeline', () {
+    const homeWidgetChannel = MethodChannel('home_widget');
+    late List<MethodCall> calls;
+    late WidgetUpdateService service;
+
+    List<String> savedIds() => calls
+        .where((c) => c.method == 'saveWidgetData')
+        .map((c) => (c.arguments as Map)['id'] as String)
+        .toList();
+
+    List<String> updatedWidgets() => calls
+        .where((c) => c.method == 'updateWidget')
+        .map((c) => (c.arguments as Map)['android'] as String)
+        .toList();
+
+    setUp(() async {
+      calls = [];
+      TestDefaultBinaryMessengerBinding.instance.defaultBinaryMessenger
+          .setMockMethodCallHandler(homeWidgetChannel, (call) async {
+        calls.add(call);
+        return true;
+      });
+      service = WidgetUpdateService(coalesceWindow: Duration.zero);
+      await service.initialize();
+    });
+
+    tearDown(() {
+      TestDefaultBinaryMessengerBinding.instance.defaultBinaryMessenger
+          .setMockMethodCallHandler(homeWidgetChannel, null);
+    });
+
+    test('writes every value and redraws both widgets the first time', () async {
+      final result = await service.updateAllWidgets(
+        WidgetData(todayPushups: 10, totalPushups: 100),
+      );
+
+      expect(result, isTrue);
+      expect(savedIds().length, 7);
+      expect(updatedWidgets().length, 2);
+      expect(service.writesIssued, 7);
+      expect(service.writesSkipped, 0);
+    });
+
+    test('skips writes and redraws when nothing changed', () async {
+      final data = WidgetData(todayPushups: 10, totalPushups: 100);
+      await service.updateAllWidgets(data);
+      calls.clear();
+
+      final result = await service.updateAllWidgets(data);
+
+      expect(result, isTrue);
+      expect(calls, isEmpty);
+      expect(service.writesSkipped, 7);
+      expect(service.widgetUpdatesSkipped, 2);
+    });
+
+    test('post-workout and stats payloads for the same history match', () async {
+      final now = DateTime(2026, 3, 20, 18);
+      final index = HistoryIndex.empty()
+        ..put(DailyRecord(date: DateTime(2026, 3, 18), totalPushups: 40))
+        // Over the goal: the final series overshoots
+        ..put(DailyRecord(date: DateTime(2026, 3, 20), totalPushups: 64, pointsEarned: 120));
+
+      Future<WidgetData> build() => service.buildWidgetDataFromHistory(
+            index,
+            dailyGoal: 50,
+            streakDays: 1,
+            now: now,
+          );
+
+      final afterWorkout = await build();
+      expect(afterWorkout.todayPushups, 50);
+      expect(afterWorkout.totalPushups, 104);
+      expect(afterWorkout.lastWorkoutDate, DateTime(2026, 3, 20));
+      expect(afterWorkout.calendarDays, hasLength(30));
+      expect(afterWorkout.calendarDays.last.day, 20);
+      expect(afterWorkout.calendarDays.last.completed, isTrue);
+      expect(afterWorkout.calendarDays[27].completed, isTrue);
+      expect(afterWorkout.calendarDays[28].completed, isFalse);
+
+      await service.updateAllWidgets(afterWorkout);
+      calls.clear();
+
+      // The stats refresh that follows writes nothing
+      await service.updateAllWidgets(await build());
+      expect(calls, isEmpty);
+    });
+
+    test('reaches the goal at the daily goal, not at 50', () async {
+      final now = DateTime(2026, 3, 20, 18);
+      final index = HistoryIndex.empty()
+        ..put(DailyRecord(date: DateTime(2026, 3, 20), totalPushups: 30));
+
+      final reached = await service.buildWidgetDataFromHistory(
+        index,
+        dailyGoal: 30,
+        streakDays: 1,
+        now: now,
+      );
+      final notReached = await service.buildWidgetDataFromHistory(
+        index,
+        dailyGoal: 40,
+        streakDays: 1,
+        now: now,
+      );
+
+      expect(reached.todayGoalReached, isTrue);
+      expect(notReached.todayGoalReached, isFalse);
+    });
+
+    test('writes only the values that changed', () async {
+      await service.updateAllWidgets(
+        WidgetData(todayPushups: 10, totalPushups: 100, streakDays: 1),
+      );
+      calls.clear();
+
+      await service.updateAllWidgets(
+        WidgetData(todayPushups: 10, totalPushups: 100, streakDays: 2),
+      );
+
+      expect(savedIds(), ['pushup_json_data', 'pushup_streak_days']);
+    });
+
+    test('redraws only widgets whose inputs changed', () async {
+      await service.updateAllWidgets(
+        WidgetData(todayPushups: 10, totalPushups: 100, streakDays: 1),
+      );
+      calls.clear();
+
+      // Streak is only shown by the Quick Start widget
+      await service.updateAllWidgets(
+        WidgetData(todayPushups: 10, totalPushups: 100, streakDays: 2),
+      );
+      expect(updatedWidgets(), ['PushupWidgetQuickStartProvider']);
+      calls.clear();
+
+      // Points are stored in the payload but shown by neither widget
+      await service.updateAllWidgets(
+        WidgetData(todayPushups: 10, totalPushups: 100, streakDays: 2, totalPoints: 5),
+      );
+      expect(savedIds(), ['pushup_json_data']);
+      expect(updatedWidgets(), isEmpty);
+    });
+
+    test('coalesces a burst into a single batch with the latest data', () async {
+      final results = await Future.wait([
+        for (int i = 1; i <= 10; i++)
+          service.updateAllWidgets(WidgetData(todayPushups: i, totalPushups: 100)),
+      ]);
+
+      expect(results, everyElement(isTrue));
+      expect(savedIds().length, 7);
+      expect(updatedWidgets().length, 2);
+
+      final json = calls.firstWhere(
+        (c) => (c.arguments as Map)['id'] == 'pushup_json_data',
+      );
+      expect(
+        WidgetData.fromJsonString((json.arguments as Map)['data'] as String)
+            .todayPushups,
+        10,
+      );
+    });
+
+    test('applies a pending update on flush', () async {
+      service = WidgetUpdateService(coalesceWindow: const Duration(hours: 1));
+      await service.initialize();
+
+      service.updateAllWidgets(WidgetData(todayPushups: 1, totalPushups: 1)).ignore();
+      expect(calls, isEmpty);
+
+      await service.flushPendingUpdates();
+
+      expect(savedIds().length, 7);
+    });
+
+    test('retries values whose write failed', () async {
+      var failJson = true;
+      TestDefaultBinaryMessengerBinding.instance.defaultBinaryMessenger
+          .setMockMethodCallHandler(homeWidgetChannel, (call) async {
+        calls.add(call);
+        if (failJson && (call.arguments as Map)['id'] == 'pushup_json_data') {
+          throw PlatformException(code: 'io');
+        }
+        return true;
+      });
+      final data = WidgetData(todayPushups: 10, totalPushups: 100);
+
+      await service.updateAllWidgets(data);
+      failJson = false;
+      calls.clear();
+      await service.updateAllWidgets(data);
+
+      expect(savedIds(), contains('pushup_json_data'));
+      expect(updatedWidgets().length, 2);
+    });
+
+    test('writes everything again after clearing', () async {
+      final data = WidgetData(todayPushups: 10, totalPushups: 100);
+      await service.updateAllWidgets(data);
+      await service.clearWidgetData();
+      calls.clear();
+
+      await service.updateAllWidgets(data);
+
+      expect(savedIds().length, 7);
+      expect(updatedWidgets().length, 2);
+    });
+  });
+
   group('WidgetUpdateService Midnight Update', () {
     test('scheduleMidnightUpdate calls platform channel', () async {
       // Since we can't directly mock MethodChannel in test without platform code,
@@ -548,6 +759,11 @@ class MockStorageService implements StorageService {
     return _dailyRecords;
   }
 
+  @override
+  Future<HistoryIndex> loadHistoryIndex() async {
+    return HistoryIndex.fromRecords(_dailyRecords);
+  }
+
   // Unused methods - required for interface compliance
   @override
   Future<void> saveActiveSession(WorkoutSession session) async {}
@@ -602,6 +818,10 @@ class MockStorageService implements StorageService {
 
   @override
   Future<DateTime?> getProgramStartDate() async => null;
+
+  /// Members the calendar service does not use.
+  @override
+  dynamic noSuchMethod(Invocation invocation) => super.noSuchMethod(invocation);
 }
 
 String _formatDate(DateTime date) {
@@ -0,0 +1,69 @@
+import 'package:flutter/material.dart';
+import 'package:flutter_test/flutter_test.dart';
+import 'package:push_up_5050/models/daily_record.dart';
+import 'package:push_up_5050/models/month_calendar.dart';
+import 'package:push_up_5050/repositories/history_index.dart';
+import 'package:push_up_5050/widgets/statistics/monthly_calendar.dart';
+
+void main() {
+  // February 2027 starts on a Monday and spans exactly four weeks
+  final today = DateTime(2027, 2, 20);
+
+  MonthCalendarModel buildModel() {
+    final history = HistoryIndex.empty()
+      ..put(DailyRecord(date: DateTime(2027, 2, 3), totalPushups: 10))
+      ..put(DailyRecord(date: DateTime(2027, 2, 4), totalPushups: 20));
+    return MonthCalendarModel.build(history, DateTime(2027, 2), today: today);
+  }
+
+  Widget wrap(Widget child) {
+    return MaterialApp(
+      home: Scaffold(
+        backgroundColor: Colors.black,
+        body: Padding(padding: const EdgeInsets.all(16), child: child),
+      ),
+    );
+  }
+
+  group('MonthlyCalendar Widget', () {
+    testWidgets('renders the month of the model', (tester) async {
+      await tester.pumpWidget(wrap(MonthlyCalendar(model: buildModel())));
+
+      expect(find.text('FEBBRAIO 2027'), findsOneWidget);
+      expect(find.text('1'), findsOneWidget);
+      expect(find.text('28'), findsOneWidget);
+      expect(find.text('29'), findsNothing);
+      // No paging callbacks, no arrows
+      expect(find.byIcon(Icons.chevron_left_rounded), findsNothing);
+    });
+
+    testWidgets('header arrows page between months', (tester) async {
+      var previous = 0;
+      var next = 0;
+      await tester.pumpWidget(wrap(MonthlyCalendar(
+        model: buildModel(),
+        onPreviousMonth: () => previous++,
+        onNextMonth: () => next++,
+      )));
+
+      await tester.tap(find.byIcon(Icons.chevron_left_rounded));
+      await tester.tap(find.byIcon(Icons.chevron_right_rounded));
+      await tester.tap(find.byIcon(Icons.chevron_right_rounded));
+
+      expect(previous, 1);
+      expect(next, 2);
+    });
+
+    testWidgets('reuses the grid for the same model', (tester) async {
+      final model = buildModel();
+      await tester.pumpWidget(wrap(MonthlyCalendar(model: model)));
+      final before = tester.widget<Text>(find.text('20'));
+
+      await tester.pumpWidget(wrap(MonthlyCalendar(model: model)));
+      expect(tester.widget<Text>(find.text('20')), same(before));
+
+      await tester.pumpWidget(wrap(MonthlyCalendar(model: buildModel())));
+      expect(tester.widget<Text>(find.text('20')), isNot(same(before)));
+    });
+  });
+}